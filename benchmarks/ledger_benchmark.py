@@ -0,0 +1,265 @@
+"""Per-transaction cost of the account ledger: Decimal vs fixed point.
+
+    $ python -m benchmarks.ledger_benchmark [transactions]
+
+"before" is the Decimal ledger Portfolio used to be, fed ORM rows, with the
+per-transaction float snapshots the replay took from it; "after" is the
+fixed-point Portfolio and services.replay_engine.build_ledger fed
+LedgerTransaction rows. The "load + ledger pass" row includes reading the
+transactions back from an in-memory SQLite database.
+"""
+
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.transactions import Transaction, TransactionType
+from services.portfolio_service import Portfolio
+from services.replay_engine import build_ledger
+from services.transaction_service import ledger_transactions, to_ledger_transaction
+
+
+class DecimalPortfolio:
+    """Portfolio's ledger before the fixed-point change, verbatim."""
+
+    def __init__(self):
+        self.cash = 0
+        self.capital_gain = 0
+        self.invest = 0
+        self.interest = 0
+        self.dividend = 0
+        self.tax_fee = 0
+
+        self.holdings = defaultdict(
+            lambda: {
+                "quantity": 0,
+                "avg_cost": 0,
+                "dividend_total": 0,
+                "dividends": [],
+                "realized_gain": 0,
+            }
+        )
+
+    def apply(self, tx):
+        """Apply one transaction to the ledger."""
+        if tx.type in [TransactionType.DEPOSIT, TransactionType.FX_DEPOSIT]:
+            self.deposit(tx.amount)
+        elif tx.type in [TransactionType.WITHDRAWAL, TransactionType.FX_WITHDRAWAL]:
+            self.withdraw(tx.amount)
+        elif tx.type == TransactionType.BUY:
+            self.buy(tx.amount, tx.symbol, tx.quantity, tx.price)
+        elif tx.type == TransactionType.SELL:
+            self.sell(tx.amount, tx.symbol, tx.quantity, tx.price)
+        elif tx.type == TransactionType.TAX_FEE:
+            self.process_tax_fee(tx.amount)
+        elif tx.type == TransactionType.INTEREST:
+            self.process_interest(tx.amount)
+        elif tx.type == TransactionType.DIVIDEND:
+            self.process_dividend(tx.amount, tx.symbol, tx.date)
+        elif tx.type == TransactionType.VESTING:
+            self.process_vesting(tx.amount, tx.symbol, tx.quantity, tx.price)
+
+    def deposit(self, amount):
+        self.cash += amount
+
+    def withdraw(self, amount):
+        self.cash -= amount
+
+    def buy(self, amount, symbol, quantity, price):
+        cost = quantity * price
+        self.cash -= amount
+
+        h = self.holdings[symbol]
+        total_cost = h["avg_cost"] * h["quantity"] + cost
+        h["quantity"] += quantity
+        h["avg_cost"] = total_cost / h["quantity"]
+
+        self.invest += cost
+
+    def sell(self, amount, symbol, quantity, price):
+        h = self.holdings[symbol]
+        if quantity > h["quantity"]:
+            raise ValueError("Not enough holdings to sell")
+
+        revenue = quantity * price
+        cost_basis = h["avg_cost"] * quantity
+        self.cash += revenue
+        h["quantity"] -= quantity
+
+        realized = revenue - cost_basis
+
+        self.capital_gain += realized
+        h["realized_gain"] += realized
+        self.invest -= cost_basis
+
+    def process_tax_fee(self, amount):
+        self.cash -= amount
+        self.tax_fee += amount
+
+    def process_interest(self, amount):
+        self.cash += amount
+        self.interest += amount
+
+    def process_dividend(self, amount, symbol, date):
+        self.cash += amount
+        self.dividend += amount
+
+        h = self.holdings[symbol]
+        h["dividend_total"] += amount
+        h["dividends"].append((date, amount))
+
+    def process_vesting(self, amount, symbol, quantity, price):
+        cost = quantity * price
+
+        h = self.holdings[symbol]
+        total_cost = h["avg_cost"] * h["quantity"] + cost
+        h["quantity"] += quantity
+        h["avg_cost"] = total_cost / h["quantity"]
+
+        self.invest += amount
+
+
+def decimal_ledger(transactions):
+    """The replay's ledger pass before: float() snapshots after every fill."""
+    portfolio = DecimalPortfolio()
+    symbols = list(dict.fromkeys(tx.symbol for tx in transactions))
+    column = {symbol: j for j, symbol in enumerate(symbols)}
+    days = list(dict.fromkeys(tx.date for tx in transactions))
+    row_of = {day: i for i, day in enumerate(days)}
+    deltas = np.zeros((len(days), len(symbols)))
+    avg_costs = np.zeros((len(days), len(symbols)))
+    scalars = np.zeros((5, len(days)))
+    for tx in transactions:
+        row = row_of[tx.date]
+        portfolio.apply(tx)
+        sign = 1.0 if tx.type == TransactionType.BUY else -1.0
+        deltas[row, column[tx.symbol]] += sign * float(tx.quantity)
+        scalars[:, row] = [
+            float(portfolio.cash),
+            float(portfolio.invest),
+            float(portfolio.capital_gain),
+            float(portfolio.interest),
+            float(portfolio.dividend),
+        ]
+        avg_costs[row, column[tx.symbol]] = float(
+            portfolio.holdings[tx.symbol]["avg_cost"]
+        )
+    return np.cumsum(deltas, axis=0), avg_costs, scalars
+
+
+def transactions(n, symbols=50, seed=7):
+    rng = random.Random(seed)
+    held = defaultdict(int)
+    day = date(2015, 1, 2)
+    result = []
+    for i in range(n):
+        symbol = f"S{rng.randrange(symbols):02d}"
+        qty = rng.randint(1, 40)
+        if held[symbol] >= qty and rng.random() < 0.4:
+            tx_type = TransactionType.SELL
+            held[symbol] -= qty
+        else:
+            tx_type = TransactionType.BUY
+            held[symbol] += qty
+        price = Decimal(rng.randint(1000, 50000)).scaleb(-2)
+        result.append(
+            SimpleNamespace(
+                id=i,
+                date=day + timedelta(days=i // 3),
+                type=tx_type,
+                symbol=symbol,
+                # DB 의 Numeric 컬럼이 돌려주는 형태 그대로
+                quantity=Decimal(qty).quantize(Decimal("0.0001")),
+                price=price,
+                amount=(qty * price).quantize(Decimal("0.01")),
+            )
+        )
+    return result
+
+
+def seeded_session(txs):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Transaction.__table__])
+    db = sessionmaker(bind=engine)()
+    db.add_all(
+        Transaction(
+            id=tx.id + 1,
+            account_id=1,
+            date=tx.date,
+            type=tx.type,
+            symbol=tx.symbol,
+            amount=tx.amount,
+            quantity=tx.quantity,
+            price=tx.price,
+        )
+        for tx in txs
+    )
+    db.commit()
+    return db
+
+
+def orm_transactions(db):
+    db.expunge_all()
+    return (
+        db.query(Transaction)
+        .filter(Transaction.account_id == 1)
+        .order_by(Transaction.date.asc(), Transaction.id.asc())
+        .all()
+    )
+
+
+def per_transaction_us(run, txs, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(txs)
+        best = min(best, time.perf_counter() - started)
+    return best / len(txs) * 1e6
+
+
+def ledger_only(factory):
+    def run(txs):
+        portfolio = factory()
+        for tx in txs:
+            portfolio.apply(tx)
+
+    return run
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    txs = transactions(n)
+    ledger_txs = [to_ledger_transaction(tx) for tx in txs]
+    db = seeded_session(txs)
+    rows = [
+        (
+            "ledger (apply)",
+            per_transaction_us(ledger_only(DecimalPortfolio), txs),
+            per_transaction_us(ledger_only(lambda: Portfolio(None)), ledger_txs),
+        ),
+        (
+            "replay ledger pass",
+            per_transaction_us(decimal_ledger, txs),
+            per_transaction_us(lambda t: build_ledger(None, t), ledger_txs),
+        ),
+        (
+            "load + ledger pass",
+            per_transaction_us(lambda t: decimal_ledger(orm_transactions(db)), txs),
+            per_transaction_us(
+                lambda t: build_ledger(None, ledger_transactions(db, 1)), txs
+            ),
+        ),
+    ]
+    print(f"{n} transactions, 50 symbols (us per transaction)")
+    print(f"  {'':20} {'before':>8} {'after':>8}")
+    for name, before, after in rows:
+        print(f"  {name:20} {before:8.2f} {after:8.2f}  {before / after:4.1f}x")
@@ -0,0 +1,88 @@
+"""Wall-clock time of a full account replay from warmed price indexes.
+
+    $ python -m benchmarks.replay_benchmark [transactions]
+
+Replays a 10-year, 50-symbol account (2000 buys by default) whose closes
+are already in market_data_service.price_cache, so the number covers the
+ledger pass, the close matrix and the valuation arrays but no database
+or provider reads.
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.transactions import TransactionType
+from services import market_data_service, price_overrides
+from services.price_index import PriceIndex
+from services.replay_engine import replay_account
+from services.trading_calendar import TradingCalendar
+from services.transaction_service import to_ledger_transaction
+
+WEEKDAYS = TradingCalendar("weekdays", [])
+START = date(2015, 1, 1)
+END = date(2024, 12, 31)
+
+
+def warm_prices(symbols):
+    days = np.arange(
+        np.datetime64(START),
+        np.datetime64(END) + np.timedelta64(1, "D"),
+        dtype="datetime64[D]",
+    )
+    for i, symbol in enumerate(symbols):
+        closes = 100.0 + np.arange(len(days)) * 0.01 * (i + 1)
+        market_data_service.price_cache.put(
+            symbol, (i + 1, PriceIndex.from_sorted(days, closes))
+        )
+
+
+def transactions(n, symbols):
+    def tx(id, d, type, amount, symbol=None, quantity=None, price=None):
+        return to_ledger_transaction(
+            SimpleNamespace(
+                id=id,
+                date=d,
+                type=type,
+                amount=Decimal(amount),
+                symbol=symbol,
+                quantity=Decimal(quantity) if quantity is not None else None,
+                price=Decimal(price) if price is not None else None,
+            )
+        )
+
+    txs = [tx(0, START, TransactionType.DEPOSIT, "10000000")]
+    for k in range(n):
+        d = START + timedelta(days=k * 365 * 10 // n)
+        txs.append(
+            tx(k + 1, d, TransactionType.BUY, "100", symbols[k % 50], "1", "100")
+        )
+    return txs
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    market_data_service.load_symbol_closes = lambda symbol: None
+    price_overrides._overrides = {}
+    price_overrides._loaded = True
+    symbols = [f"S{i:02d}" for i in range(50)]
+    warm_prices(symbols)
+    txs = transactions(n, symbols)
+
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        replay = replay_account(db, txs, END, WEEKDAYS)
+        best = min(best, time.perf_counter() - started)
+    print(f"{n} transactions, 50 symbols, {len(replay.timestamps)} sessions")
+    print(f"  replay_account  {best * 1000:8.1f} ms (best of 5)")
@@ -69,6 +69,37 @@ def temp_templates_dir():
         yield templates_dir
 
 
+@pytest.fixture
+def db_session():
+    """Provide a session on an empty in-memory SQLite database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    import models.account, models.account_checkpoint, models.account_daily_value
+    import models.fetch_miss, models.fx_rate, models.price
+    import models.price_override, models.synclog, models.tickers
+    import models.transactions, models.yield_curve
+    from models.base import Base
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    # create_all is patched out for the app, so create tables one by one
+    for table in Base.metadata.sorted_tables:
+        table.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        # the background price writer may still be using this engine
+        from services.market_data_service import price_writer
+        price_writer.flush()
+        session.close()
+        engine.dispose()
+
+
 @pytest.fixture(autouse=True)
 def setup_test_environment():
     """Set up test environment before each test."""
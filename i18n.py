@@ -138,6 +138,9 @@ TRANSLATIONS = {
         
         # Transactions
         'select_account': '왼쪽에서 계좌를 선택해주세요.',
+        'fx_unavailable': '환율 정보를 가져오지 못해 계좌 통화로 표시합니다.',
+        'fx_stale': '갱신 지연',
+        'fx_default': '기본값, 환율 조회 실패',
         
         # Account Settings
         'add_account': '계좌 추가',
@@ -249,6 +252,9 @@ TRANSLATIONS = {
         
         # Transactions
         'select_account': 'Please select an account from the left.',
+        'fx_unavailable': 'Exchange rates are unavailable; amounts are shown in the account currency.',
+        'fx_stale': 'stale',
+        'fx_default': 'default, rate lookup failed',
         
         # Account Settings
         'add_account': 'Add Account',
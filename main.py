@@ -3,9 +3,12 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse, RedirectResponse
 from models.base import Base
-from db import engine
+from db import SessionLocal, engine
 from routers import account_dashboard, account_setting, dashboard, transactions
 from i18n_helpers import get_templates_with_i18n
+from services.instrument_registry import load_registry
+from services.market_data_service import price_writer
+from services.sync_scheduler import SYNC_ENABLED, scheduler
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -17,6 +20,32 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
 
+# 종목 분류/검색 가능 여부를 메모리에 올려둔다
+@app.on_event("startup")
+def load_instruments():
+    db = SessionLocal()
+    try:
+        load_registry(db)
+    except Exception as e:
+        print(f"[WARN] instrument registry not loaded: {e}")
+    finally:
+        db.close()
+
+
+# 장 마감 후 보유 종목 시세를 백그라운드에서 동기화
+@app.on_event("startup")
+def start_price_sync():
+    if SYNC_ENABLED:
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+def stop_price_sync():
+    scheduler.stop()
+    # 아직 쓰지 못한 시세가 있으면 종료 전에 기록
+    price_writer.flush()
+
+
 
 # 기본 홈
 @app.get("/", response_class=HTMLResponse)
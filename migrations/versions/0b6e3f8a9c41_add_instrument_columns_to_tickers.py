@@ -0,0 +1,87 @@
+"""add instrument columns to tickers
+
+Revision ID: 0b6e3f8a9c41
+Revises: f2d7a9c3b418
+Create Date: 2026-10-17 16:41:08.220935
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6e3f8a9c41"
+down_revision: Union[str, Sequence[str], None] = "f2d7a9c3b418"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 기존 get_current_symbol_type / not_searchable_symbol 에 하드코딩되어 있던 목록
+BOND_SYMBOLS = [
+    "US912810SN90",
+    "US912810SQ22",
+    "US91282CAJ09",
+    "US91282CAT80",
+    "US91282CBQ33",
+    "157450",
+    "BIL",
+]
+NOT_SEARCHABLE_SYMBOLS = [
+    "US912810SN90",
+    "US912810SQ22",
+    "US91282CAJ09",
+    "US91282CAT80",
+    "US91282CBQ33",
+    "US91282CHD65",
+    "0P0000RRID",
+    "92206T105",
+    "K55101DN7441",
+    "SPAXX",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tickers",
+        sa.Column(
+            "asset_type",
+            sa.Enum("CASH", "SAVING", "BOND", "STOCK", name="assettype"),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "tickers",
+        sa.Column("searchable", sa.Boolean(), nullable=False, server_default="1"),
+    )
+    op.add_column(
+        "tickers", sa.Column("provider_hint", sa.String(length=20), nullable=True)
+    )
+
+    tickers = sa.table(
+        "tickers",
+        sa.column("symbol", sa.String),
+        sa.column("asset_type", sa.String),
+        sa.column("searchable", sa.Boolean),
+    )
+    conn = op.get_bind()
+    for symbol in sorted(set(BOND_SYMBOLS) | set(NOT_SEARCHABLE_SYMBOLS)):
+        values = {
+            "asset_type": "BOND" if symbol in BOND_SYMBOLS else "STOCK",
+            "searchable": symbol not in NOT_SEARCHABLE_SYMBOLS,
+        }
+        updated = conn.execute(
+            tickers.update().where(tickers.c.symbol == symbol).values(**values)
+        )
+        if updated.rowcount == 0:
+            conn.execute(tickers.insert().values(symbol=symbol, **values))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("tickers") as batch_op:
+        batch_op.drop_column("provider_hint")
+        batch_op.drop_column("searchable")
+        batch_op.drop_column("asset_type")
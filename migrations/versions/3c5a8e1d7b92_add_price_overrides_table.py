@@ -0,0 +1,66 @@
+"""add price_overrides table
+
+Revision ID: 3c5a8e1d7b92
+Revises: 0b6e3f8a9c41
+Create Date: 2026-10-17 17:26:51.930417
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5a8e1d7b92"
+down_revision: Union[str, Sequence[str], None] = "0b6e3f8a9c41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# get_current_symbol_price 에 하드코딩되어 있던 현재가. 과거 리플레이는 바뀌지 않도록
+# 이 마이그레이션 시점부터만 적용한다.
+SEED_FROM = date(2026, 10, 17)
+SEED_OVERRIDES = [
+    ("Conviva", 1.23, None),
+    ("US912810SN90", 4781.06 / 10, "미국 국채 50년 5월 15일 만기"),
+    ("US912810SQ22", 10459.28 / 17, "미국 국채 40년 8월 15일 만기"),
+    ("US91282CAJ09", 9993.71 / 10, "미국 국채 25년 8월 31일 만기"),
+    ("US91282CAT80", 9924.85 / 10, "미국 국채 25년 10월 31일 만기"),
+    ("US91282CBQ33", 9832.47 / 10, "미국 국채 26년 2월 28일 만기"),
+    ("VFFSX", 316.72, None),
+    ("VIIIX", 526.17, None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    price_overrides = op.create_table(
+        "price_overrides",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("effective_from", sa.Date(), nullable=True),
+        sa.Column("effective_to", sa.Date(), nullable=True),
+        sa.Column("price", sa.Numeric(precision=18, scale=6), nullable=False),
+        sa.Column("note", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_price_overrides_symbol_from",
+        "price_overrides",
+        ["symbol", "effective_from"],
+    )
+    op.bulk_insert(
+        price_overrides,
+        [
+            {"symbol": s, "effective_from": SEED_FROM, "price": p, "note": n}
+            for s, p, n in SEED_OVERRIDES
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_price_overrides_symbol_from", table_name="price_overrides")
+    op.drop_table("price_overrides")
@@ -0,0 +1,64 @@
+"""restore bond price overrides until a yield curve is loaded
+
+Revision ID: 4f2c8b7e1a63
+Revises: d3f8a6c2e071
+Create Date: 2026-10-17 22:41:08.512904
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2c8b7e1a63"
+down_revision: Union[str, Sequence[str], None] = "d3f8a6c2e071"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 7e4b2d9f0a16 의 이전 버전이 곡선 없이 지운 국채 고정가 (3c5a8e1d7b92 와 같은 값)
+SEED_FROM = date(2026, 10, 17)
+BOND_OVERRIDES = [
+    ("US912810SN90", 4781.06 / 10, "미국 국채 50년 5월 15일 만기"),
+    ("US912810SQ22", 10459.28 / 17, "미국 국채 40년 8월 15일 만기"),
+    ("US91282CAJ09", 9993.71 / 10, "미국 국채 25년 8월 31일 만기"),
+    ("US91282CAT80", 9924.85 / 10, "미국 국채 25년 10월 31일 만기"),
+    ("US91282CBQ33", 9832.47 / 10, "미국 국채 26년 2월 28일 만기"),
+]
+
+price_overrides = sa.table(
+    "price_overrides",
+    sa.column("symbol", sa.String),
+    sa.column("effective_from", sa.Date),
+    sa.column("price", sa.Numeric),
+    sa.column("note", sa.String),
+)
+yield_curve_points = sa.table("yield_curve_points", sa.column("id", sa.Integer))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    # 곡선이 이미 있으면 bond_model 이 가격을 내므로 되살리지 않는다
+    if conn.execute(sa.select(yield_curve_points.c.id).limit(1)).first():
+        return
+    for symbol, price, note in BOND_OVERRIDES:
+        existing = conn.execute(
+            sa.select(price_overrides.c.symbol).where(
+                price_overrides.c.symbol == symbol
+            )
+        ).first()
+        if existing is None:
+            conn.execute(
+                price_overrides.insert().values(
+                    symbol=symbol, effective_from=SEED_FROM, price=price, note=note
+                )
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 되살린 고정가는 3c5a8e1d7b92 가 넣은 것과 구분되지 않으므로 그대로 둔다
+    pass
@@ -0,0 +1,45 @@
+"""add fetch_misses table
+
+Revision ID: 5b2e9c71d4a3
+Revises: 3983d1d39224
+Create Date: 2026-10-17 10:12:31.402117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b2e9c71d4a3"
+down_revision: Union[str, Sequence[str], None] = "3983d1d39224"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "fetch_misses",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("provider", sa.String(length=20), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("attempted_at", sa.DateTime(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_fetch_misses_provider_symbol",
+        "fetch_misses",
+        ["provider", "symbol"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fetch_misses_provider_symbol", table_name="fetch_misses")
+    op.drop_table("fetch_misses")
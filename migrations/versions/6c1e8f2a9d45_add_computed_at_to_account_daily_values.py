@@ -0,0 +1,32 @@
+"""add computed_at to account_daily_values
+
+Revision ID: 6c1e8f2a9d45
+Revises: 9a7d1c4e5b28
+Create Date: 2026-10-18 10:04:31.226907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6c1e8f2a9d45"
+down_revision: Union[str, Sequence[str], None] = "9a7d1c4e5b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 행은 NULL 로 두어 계좌마다 마지막 행을 한 번 다시 계산하게 한다
+    op.add_column(
+        "account_daily_values", sa.Column("computed_at", sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("account_daily_values") as batch_op:
+        batch_op.drop_column("computed_at")
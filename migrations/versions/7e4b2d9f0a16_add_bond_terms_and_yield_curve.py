@@ -0,0 +1,102 @@
+"""add bond terms and yield_curve_points
+
+Revision ID: 7e4b2d9f0a16
+Revises: 3c5a8e1d7b92
+Create Date: 2026-10-17 18:12:37.604119
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7e4b2d9f0a16"
+down_revision: Union[str, Sequence[str], None] = "3c5a8e1d7b92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 보유 중인 미 국채: (CUSIP 기반 심볼, 연 이표율, 만기)
+TREASURIES = [
+    ("US912810SN90", 0.0125, date(2050, 5, 15)),
+    ("US912810SQ22", 0.01125, date(2040, 8, 15)),
+    ("US91282CAJ09", 0.0025, date(2025, 8, 31)),
+    ("US91282CAT80", 0.0025, date(2025, 10, 31)),
+    ("US91282CBQ33", 0.005, date(2026, 2, 28)),
+    ("US91282CHD65", 0.0425, date(2025, 5, 31)),
+]
+# 3c5a8e1d7b92 에서 넣은 고정 현재가는 남겨 둔다. 수익률 곡선이 아직 비어 있어
+# bond_model 이 가격을 낼 수 없기 때문이다. 곡선을 적재하면 reprice_model_bonds 가
+# 곡선이 덮는 구간의 고정가를 정리한다
+
+tickers = sa.table(
+    "tickers",
+    sa.column("symbol", sa.String),
+    sa.column("asset_type", sa.String),
+    sa.column("searchable", sa.Boolean),
+    sa.column("provider_hint", sa.String),
+    sa.column("coupon_rate", sa.Numeric),
+    sa.column("maturity_date", sa.Date),
+    sa.column("face_value", sa.Numeric),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tickers",
+        sa.Column("coupon_rate", sa.Numeric(precision=8, scale=6), nullable=True),
+    )
+    op.add_column("tickers", sa.Column("maturity_date", sa.Date(), nullable=True))
+    op.add_column(
+        "tickers",
+        sa.Column("face_value", sa.Numeric(precision=12, scale=2), nullable=True),
+    )
+    op.create_table(
+        "yield_curve_points",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("tenor_months", sa.Integer(), nullable=False),
+        sa.Column("yield_pct", sa.Numeric(precision=8, scale=4), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_yield_curve_points_date_tenor",
+        "yield_curve_points",
+        ["date", "tenor_months"],
+        unique=True,
+    )
+
+    conn = op.get_bind()
+    for symbol, coupon_rate, maturity in TREASURIES:
+        values = {
+            "asset_type": "BOND",
+            "searchable": True,
+            "provider_hint": "bond_model",
+            "coupon_rate": coupon_rate,
+            "maturity_date": maturity,
+            "face_value": 1000,
+        }
+        updated = conn.execute(
+            tickers.update().where(tickers.c.symbol == symbol).values(**values)
+        )
+        if updated.rowcount == 0:
+            conn.execute(tickers.insert().values(symbol=symbol, **values))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    conn.execute(
+        tickers.update()
+        .where(tickers.c.symbol.in_([s for s, _, _ in TREASURIES]))
+        .values(searchable=False, provider_hint=None)
+    )
+    op.drop_index("ix_yield_curve_points_date_tenor", table_name="yield_curve_points")
+    op.drop_table("yield_curve_points")
+    with op.batch_alter_table("tickers") as batch_op:
+        batch_op.drop_column("face_value")
+        batch_op.drop_column("maturity_date")
+        batch_op.drop_column("coupon_rate")
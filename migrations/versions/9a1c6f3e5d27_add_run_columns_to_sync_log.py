@@ -0,0 +1,50 @@
+"""add run columns to sync_log
+
+Revision ID: 9a1c6f3e5d27
+Revises: 7e4b2d9f0a16
+Create Date: 2026-10-17 19:03:55.118402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9a1c6f3e5d27"
+down_revision: Union[str, Sequence[str], None] = "7e4b2d9f0a16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "sync_log", sa.Column("exchange", sa.String(length=10), nullable=True)
+    )
+    op.add_column("sync_log", sa.Column("finished_at", sa.DateTime(), nullable=True))
+    op.add_column("sync_log", sa.Column("duration_seconds", sa.Float(), nullable=True))
+    op.add_column("sync_log", sa.Column("status", sa.String(length=20), nullable=True))
+    op.add_column("sync_log", sa.Column("symbols_total", sa.Integer(), nullable=True))
+    op.add_column("sync_log", sa.Column("symbols_failed", sa.Integer(), nullable=True))
+    op.add_column("sync_log", sa.Column("error", sa.String(), nullable=True))
+    op.create_index(
+        "ix_sync_log_exchange_timestamp", "sync_log", ["exchange", "timestamp"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sync_log_exchange_timestamp", table_name="sync_log")
+    with op.batch_alter_table("sync_log") as batch_op:
+        for column in [
+            "error",
+            "symbols_failed",
+            "symbols_total",
+            "status",
+            "duration_seconds",
+            "finished_at",
+            "exchange",
+        ]:
+            batch_op.drop_column(column)
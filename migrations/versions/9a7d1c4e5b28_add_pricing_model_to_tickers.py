@@ -0,0 +1,51 @@
+"""add pricing_model to tickers
+
+Revision ID: 9a7d1c4e5b28
+Revises: 4f2c8b7e1a63
+Create Date: 2026-10-17 23:12:46.037518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9a7d1c4e5b28"
+down_revision: Union[str, Sequence[str], None] = "4f2c8b7e1a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+tickers = sa.table(
+    "tickers",
+    sa.column("provider_hint", sa.String),
+    sa.column("pricing_model", sa.String),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tickers", sa.Column("pricing_model", sa.String(length=20), nullable=True)
+    )
+    # provider_hint 는 다음 조회를 어느 provider 부터 할지만 기억한다.
+    # 가격 모델 표시는 record_success 가 덮어쓰지 않도록 따로 옮긴다
+    conn = op.get_bind()
+    conn.execute(
+        tickers.update()
+        .where(tickers.c.provider_hint == "bond_model")
+        .values(pricing_model="bond_model", provider_hint=None)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    conn.execute(
+        tickers.update()
+        .where(tickers.c.pricing_model == "bond_model")
+        .values(provider_hint="bond_model")
+    )
+    with op.batch_alter_table("tickers") as batch_op:
+        batch_op.drop_column("pricing_model")
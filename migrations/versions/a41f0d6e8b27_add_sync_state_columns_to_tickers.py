@@ -0,0 +1,29 @@
+"""add sync state columns to tickers
+
+Revision ID: a41f0d6e8b27
+Revises: 5b2e9c71d4a3
+Create Date: 2026-10-17 11:03:54.118240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a41f0d6e8b27"
+down_revision: Union[str, Sequence[str], None] = "5b2e9c71d4a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tickers", sa.Column("last_synced_at", sa.DateTime(), nullable=True))
+    op.add_column("tickers", sa.Column("last_bar_date", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("tickers", "last_bar_date")
+    op.drop_column("tickers", "last_synced_at")
@@ -0,0 +1,53 @@
+"""add account_checkpoints table
+
+Revision ID: b5d1e7a3c914
+Revises: 9a1c6f3e5d27
+Create Date: 2026-10-17 20:12:41.530917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d1e7a3c914"
+down_revision: Union[str, Sequence[str], None] = "9a1c6f3e5d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    amount = sa.Numeric(precision=20, scale=8)
+    op.create_table(
+        "account_checkpoints",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("digest", sa.String(length=64), nullable=False),
+        sa.Column("cash", amount, nullable=False),
+        sa.Column("invest", amount, nullable=False),
+        sa.Column("capital_gain", amount, nullable=False),
+        sa.Column("interest", amount, nullable=False),
+        sa.Column("dividend", amount, nullable=False),
+        sa.Column("tax_fee", amount, nullable=False),
+        sa.Column("holdings", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_account_checkpoints_account_date",
+        "account_checkpoints",
+        ["account_id", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_account_checkpoints_account_date", table_name="account_checkpoints"
+    )
+    op.drop_table("account_checkpoints")
@@ -0,0 +1,43 @@
+"""unique (ticker_id, date) index on prices
+
+Revision ID: c7d93a5e1f62
+Revises: a41f0d6e8b27
+Create Date: 2026-10-17 11:47:09.553981
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d93a5e1f62"
+down_revision: Union[str, Sequence[str], None] = "a41f0d6e8b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 겹치는 다운로드로 생긴 중복 봉은 가장 나중에 들어온 행만 남긴다
+    op.execute(
+        """
+        DELETE FROM prices
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM prices GROUP BY ticker_id, date
+        )
+        """
+    )
+    op.create_index(
+        "ix_prices_ticker_id_date",
+        "prices",
+        ["ticker_id", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_prices_ticker_id_date", table_name="prices")
@@ -0,0 +1,52 @@
+"""add account_daily_values table
+
+Revision ID: d3f8a6c2e071
+Revises: b5d1e7a3c914
+Create Date: 2026-10-17 21:05:17.284630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f8a6c2e071"
+down_revision: Union[str, Sequence[str], None] = "b5d1e7a3c914"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "account_daily_values",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("cash", sa.Float(), nullable=False),
+        sa.Column("invest", sa.Float(), nullable=False),
+        sa.Column("valuation", sa.Float(), nullable=False),
+        sa.Column("returns", sa.Float(), nullable=False),
+        sa.Column("capital_gain", sa.Float(), nullable=False),
+        sa.Column("interest_income", sa.Float(), nullable=False),
+        sa.Column("dividend_income", sa.Float(), nullable=False),
+        sa.Column("total_income", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_account_daily_values_account_date",
+        "account_daily_values",
+        ["account_id", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_account_daily_values_account_date", table_name="account_daily_values"
+    )
+    op.drop_table("account_daily_values")
@@ -0,0 +1,40 @@
+"""add fx_rates table
+
+Revision ID: e8a1b4c6d205
+Revises: c7d93a5e1f62
+Create Date: 2026-10-17 13:20:41.871306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a1b4c6d205"
+down_revision: Union[str, Sequence[str], None] = "c7d93a5e1f62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "fx_rates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("base", sa.String(length=10), nullable=False),
+        sa.Column("quote", sa.String(length=10), nullable=False),
+        sa.Column("rate", sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column("as_of", sa.String(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_fx_rates_fetched_at", "fx_rates", ["fetched_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fx_rates_fetched_at", table_name="fx_rates")
+    op.drop_table("fx_rates")
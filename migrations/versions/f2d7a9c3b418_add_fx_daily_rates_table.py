@@ -0,0 +1,44 @@
+"""add fx_daily_rates table
+
+Revision ID: f2d7a9c3b418
+Revises: e8a1b4c6d205
+Create Date: 2026-10-17 15:02:13.504218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2d7a9c3b418"
+down_revision: Union[str, Sequence[str], None] = "e8a1b4c6d205"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "fx_daily_rates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("base", sa.String(length=10), nullable=False),
+        sa.Column("quote", sa.String(length=10), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("close", sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_fx_daily_rates_pair_date",
+        "fx_daily_rates",
+        ["base", "quote", "date"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fx_daily_rates_pair_date", table_name="fx_daily_rates")
+    op.drop_table("fx_daily_rates")
@@ -0,0 +1,23 @@
+# models/account_checkpoint.py
+from sqlalchemy import Column, Integer, Numeric, String, Date, ForeignKey, Index
+from models.base import Base
+
+
+class AccountCheckpoint(Base):
+    __tablename__ = "account_checkpoints"
+    __table_args__ = (
+        Index("ix_account_checkpoints_account_date", "account_id", "date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    date = Column(Date, nullable=False)  # 이 날의 마지막 거래까지 반영한 상태
+    digest = Column(String(64), nullable=False)  # 이 날까지의 거래 집합 해시
+    cash = Column(Numeric(precision=20, scale=8), nullable=False)
+    invest = Column(Numeric(precision=20, scale=8), nullable=False)
+    capital_gain = Column(Numeric(precision=20, scale=8), nullable=False)
+    interest = Column(Numeric(precision=20, scale=8), nullable=False)
+    dividend = Column(Numeric(precision=20, scale=8), nullable=False)
+    tax_fee = Column(Numeric(precision=20, scale=8), nullable=False)
+    # {symbol: [quantity, cost, dividend_total, realized_gain]} (원장의 고정소수점 정수)
+    holdings = Column(String, nullable=False)
@@ -0,0 +1,27 @@
+# models/account_daily_value.py
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index
+from models.base import Base
+
+
+class AccountDailyValue(Base):
+    __tablename__ = "account_daily_values"
+    __table_args__ = (
+        Index(
+            "ix_account_daily_values_account_date", "account_id", "date", unique=True
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    date = Column(Date, nullable=False)  # 계좌 국가 거래소의 거래일
+    # 금액은 모두 계좌 통화 기준
+    cash = Column(Float, nullable=False)
+    invest = Column(Float, nullable=False)
+    valuation = Column(Float, nullable=False)
+    returns = Column(Float, nullable=False)  # %
+    capital_gain = Column(Float, nullable=False)
+    interest_income = Column(Float, nullable=False)
+    dividend_income = Column(Float, nullable=False)
+    total_income = Column(Float, nullable=False)
+    # 행을 계산한 시각 (UTC). 그 날 장 마감 전이면 다음 조회 때 다시 계산한다
+    computed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,17 @@
+# models/fetch_miss.py
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from models.base import Base
+import datetime
+
+
+class FetchMiss(Base):
+    __tablename__ = "fetch_misses"
+    __table_args__ = (Index("ix_fetch_misses_provider_symbol", "provider", "symbol"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    provider = Column(String(20), nullable=False)  # 예: "fdr", "yfinance"
+    symbol = Column(String(20), nullable=False)
+    start_date = Column(Date, nullable=True)  # 현재가 조회는 기간 없이 저장
+    end_date = Column(Date, nullable=True)
+    attempted_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    reason = Column(String, nullable=True)
@@ -0,0 +1,30 @@
+# models/fx_rate.py
+from sqlalchemy import Column, Integer, Numeric, String, Date, DateTime, Index
+from models.base import Base
+import datetime
+
+
+class FxRate(Base):
+    __tablename__ = "fx_rates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    base = Column(String(10), nullable=False)  # 예: "USD"
+    quote = Column(String(10), nullable=False)  # 예: "KRW"
+    rate = Column(Numeric(precision=12, scale=4), nullable=False)
+    as_of = Column(String, nullable=True)  # 환율 API가 알려준 기준 시각
+    fetched_at = Column(
+        DateTime, default=datetime.datetime.utcnow, index=True, nullable=False
+    )
+
+
+class FxDailyRate(Base):
+    __tablename__ = "fx_daily_rates"
+    __table_args__ = (
+        Index("ix_fx_daily_rates_pair_date", "base", "quote", "date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    base = Column(String(10), nullable=False)
+    quote = Column(String(10), nullable=False)
+    date = Column(Date, nullable=False)
+    close = Column(Numeric(precision=12, scale=4), nullable=False)  # 일별 종가 환율
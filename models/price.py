@@ -1,5 +1,5 @@
 # models/price.py
-from sqlalchemy import Column, Integer, Numeric, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import Base
 import datetime
@@ -7,6 +7,9 @@ import datetime
 
 class Price(Base):
     __tablename__ = "prices"
+    __table_args__ = (
+        Index("ix_prices_ticker_id_date", "ticker_id", "date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     ticker_id = Column(Integer, ForeignKey("tickers.id"), nullable=False)
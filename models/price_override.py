@@ -0,0 +1,17 @@
+# models/price_override.py
+from sqlalchemy import Column, Integer, Numeric, String, Date, Index
+from models.base import Base
+
+
+class PriceOverride(Base):
+    __tablename__ = "price_overrides"
+    __table_args__ = (
+        Index("ix_price_overrides_symbol_from", "symbol", "effective_from"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(20), nullable=False)
+    effective_from = Column(Date, nullable=True)  # 비어 있으면 처음부터
+    effective_to = Column(Date, nullable=True)  # 비어 있으면 지금까지
+    price = Column(Numeric(precision=18, scale=6), nullable=False)
+    note = Column(String, nullable=True)  # 예: "미국 국채 50년 5월 15일 만기"
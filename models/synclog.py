@@ -1,11 +1,19 @@
 # models/sync_log.py
-from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy import Column, Integer, Float, String, DateTime, Index
 from models.base import Base
 import datetime
 
 
 class SyncLog(Base):
     __tablename__ = "sync_log"
+    __table_args__ = (Index("ix_sync_log_exchange_timestamp", "exchange", "timestamp"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    exchange = Column(String(10), nullable=True)  # 예: "KRX", "NYSE"
+    finished_at = Column(DateTime, nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    status = Column(String(20), nullable=True)  # running, success, partial, failed
+    symbols_total = Column(Integer, nullable=True)
+    symbols_failed = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
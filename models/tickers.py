@@ -1,5 +1,6 @@
 # models/tickers.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Boolean, Column, Integer, Numeric, String, Date, DateTime, Enum
+from models.account import AssetType
 from models.base import Base
 
 
@@ -11,3 +12,13 @@ class Ticker(Base):
     name = Column(String(100), nullable=True)  # ETF/주식 풀네임
     exchange = Column(String(50), nullable=True)  # 거래소 (NYSE, NASDAQ 등)
     currency = Column(String(10), nullable=True)  # USD, KRW 등
+    last_synced_at = Column(DateTime, nullable=True)  # 마지막으로 최신 봉까지 받은 시각
+    last_bar_date = Column(Date, nullable=True)  # DB에 있는 가장 최근 봉 날짜
+    asset_type = Column(Enum(AssetType), nullable=True)  # 비어 있으면 stock
+    searchable = Column(Boolean, nullable=False, default=True, server_default="1")
+    provider_hint = Column(String(20), nullable=True)  # 시세를 받을 provider 이름
+    pricing_model = Column(String(20), nullable=True)  # 자체 가격 모델 (예: bond_model)
+    # 채권 (국채 CUSIP 등) 전용
+    coupon_rate = Column(Numeric(precision=8, scale=6), nullable=True)  # 예: 0.0125
+    maturity_date = Column(Date, nullable=True)
+    face_value = Column(Numeric(precision=12, scale=2), nullable=True)  # 1단위 액면가
@@ -0,0 +1,15 @@
+# models/yield_curve.py
+from sqlalchemy import Column, Integer, Numeric, Date, Index
+from models.base import Base
+
+
+class YieldCurvePoint(Base):
+    __tablename__ = "yield_curve_points"
+    __table_args__ = (
+        Index("ix_yield_curve_points_date_tenor", "date", "tenor_months", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(Date, nullable=False)
+    tenor_months = Column(Integer, nullable=False)  # 예: 3 (3 Mo), 120 (10 Yr)
+    yield_pct = Column(Numeric(precision=8, scale=4), nullable=False)  # 연 수익률 (%)
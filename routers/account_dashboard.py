@@ -4,14 +4,15 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from db import get_db
 from models.tickers import Ticker
-from models.transactions import Transaction, TransactionType
-from models.account import Account, AccountType
-from datetime import datetime, timedelta
+from models.transactions import Transaction
+from models.account import Account, AccountCurrencyType, AccountType
+from datetime import datetime
 from i18n_helpers import get_templates_with_i18n
 
+from services.account_daily_values import ensure_daily_values
+from services.fx_history import convert_series
 from services.market_data_service import price_lookup
 from services.plot_service import graphs
-from services.portfolio_service import Portfolio
 from services.transaction_service import (
     annotate_with_balances,
     annotate_with_quantities_by_symbol,
@@ -25,6 +26,7 @@ router = APIRouter()
 def view_transactions(
     request: Request,
     account_id: int = None,
+    currency: AccountCurrencyType = None,
     db: Session = Depends(get_db),
 ):
     accounts = db.query(Account).order_by(Account.order).all()
@@ -37,6 +39,7 @@ def view_transactions(
     graph_html_4 = "<p>No graph available</p>"
     portfolio_list = []
     portfolio_totals = {}
+    notice = None
 
     if account_id:
         selected_account = db.query(Account).get(account_id)
@@ -49,82 +52,53 @@ def view_transactions(
 
         if selected_account.account_type == AccountType.STOCK:
 
-            portfolio = Portfolio(db)
-
-            timestamps = []
-
-            cash = []
-            invest = []
-            valuation = []
-            returns = []
-
-            capital_gain = []
-            interest_income = []
-            dividend_income = []
-            total_income = []
-
-            start_date = transactions[0].date
             end_date = datetime.today().date()
-            num_days = (end_date - start_date).days + 1
-
-            tx_idx = 0
-            n = len(transactions)
-
-            for i in range(num_days):
-                current_date = start_date + timedelta(days=i)
-
-                while tx_idx < n and transactions[tx_idx].date == current_date:
-                    tx = transactions[tx_idx]
-                    if tx.type in [TransactionType.DEPOSIT, TransactionType.FX_DEPOSIT]:
-                        portfolio.deposit(tx.amount)
-                    elif tx.type in [
-                        TransactionType.WITHDRAWAL,
-                        TransactionType.FX_WITHDRAWAL,
-                    ]:
-                        portfolio.withdraw(tx.amount)
-                    elif tx.type == TransactionType.BUY:
-                        portfolio.buy(tx.amount, tx.symbol, tx.quantity, tx.price)
-                    elif tx.type == TransactionType.SELL:
-                        portfolio.sell(tx.amount, tx.symbol, tx.quantity, tx.price)
-                    elif tx.type == TransactionType.TAX_FEE:
-                        portfolio.process_tax_fee(tx.amount)
-                    elif tx.type == TransactionType.INTEREST:
-                        portfolio.process_interest(tx.amount)
-                    elif tx.type == TransactionType.DIVIDEND:
-                        portfolio.process_dividend(tx.amount, tx.symbol, current_date)
-                    elif tx.type == TransactionType.VESTING:
-                        portfolio.process_vesting(
-                            tx.amount, tx.symbol, tx.quantity, tx.price
-                        )
-
-                    tx_idx += 1
-
-                if current_date.weekday() in (5, 6):
-                    continue
-
-                timestamps.append(current_date.strftime("%Y-%m-%d"))
-
-                inv = float(portfolio.invest)
-                val = portfolio.process_valuation(current_date)
-
-                if inv == 0:
-                    date_return = 0
-                else:
-                    date_return = (val - inv) / inv * 100
-                cash.append(portfolio.cash)
-                invest.append(inv)
-                valuation.append(val)
-                returns.append(date_return)
-
-                capital_gain.append(portfolio.capital_gain)
-                interest_income.append(portfolio.interest)
-                dividend_income.append(portfolio.dividend)
-                total_income.append(
-                    portfolio.capital_gain + portfolio.interest + portfolio.dividend
-                )
+
+            # 저장된 일별 평가액을 구간 조회로 읽고, 빠진 거래일만 리플레이해 채운다
+            values, portfolio = ensure_daily_values(db, selected_account, end_date)
+
+            timestamps = values["timestamps"]
+            cash = values["cash"]
+            invest = values["invest"]
+            valuation = values["valuation"]
+            returns = values["returns"]
+            capital_gain = values["capital_gain"]
+            interest_income = values["interest_income"]
+            dividend_income = values["dividend_income"]
+            total_income = values["total_income"]
+
+            display_currency = selected_account.account_currency_type
+            if currency is not None and currency != display_currency:
+                # 날짜별 환율로 금액 시계열 전체를 한 번에 변환 (수익률은 그대로)
+                series = [
+                    cash,
+                    invest,
+                    valuation,
+                    capital_gain,
+                    interest_income,
+                    dividend_income,
+                    total_income,
+                ]
+                try:
+                    (
+                        cash,
+                        invest,
+                        valuation,
+                        capital_gain,
+                        interest_income,
+                        dividend_income,
+                        total_income,
+                    ) = convert_series(
+                        db, timestamps, series, display_currency, currency
+                    ).tolist()
+                    display_currency = currency
+                except LookupError as e:
+                    # 환율 이력이 없으면 계좌 통화 그대로 보여준다
+                    print(f"[account_dashboard] currency conversion skipped: {e}")
+                    notice = "fx_unavailable"
 
             fig_1, fig_2, fig_3, fig_4 = graphs(
-                selected_account.account_currency_type,
+                display_currency,
                 timestamps,
                 cash,
                 invest,
@@ -147,16 +121,18 @@ def view_transactions(
                 for t in db.query(Ticker).filter(Ticker.symbol.in_(symbols)).all()
             }
 
-            for symbol, h in portfolio.holdings.items():
+            for symbol in portfolio.holdings:
+                # 원장은 고정소수점이므로 표시용 float 로 한 번에 바꾼다
+                h = portfolio.position(symbol)
                 current_price = price_lookup(db, symbol, end_date) or h["avg_cost"]
-                valuation = float(current_price) * float(h["quantity"])
-                invested = float(h["avg_cost"] * h["quantity"])
+                valuation = float(current_price) * h["quantity"]
+                invested = h["cost"]
                 returns_amount = valuation - invested
                 returns_pct = (returns_amount / invested * 100) if invested > 0 else 0
 
-                realized_gain = float(h.get("realized_gain", 0))
+                realized_gain = h["realized_gain"]
 
-                dividend_total = float(h["dividend_total"])
+                dividend_total = h["dividend_total"]
                 dividend_pct = (dividend_total / invested * 100) if invested > 0 else 0
 
                 total_profit = returns_amount + dividend_total + realized_gain
@@ -233,5 +209,6 @@ def view_transactions(
             "graph_html_4": graph_html_4,
             "portfolio_list": portfolio_list,
             "portfolio_totals": portfolio_totals,
+            "notice": notice,
         },
     )
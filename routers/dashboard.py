@@ -3,7 +3,6 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from db import get_db
-import requests
 from datetime import datetime
 from fastapi.templating import Jinja2Templates
 from i18n_helpers import get_templates_with_i18n
@@ -14,12 +13,15 @@ from services.account_service import (
     get_checking_account_networth,
     get_stock_account_networth,
 )
+from services.fx_service import get_usd_krw
+from services.market_data_service import price_cache, price_writer
+from services.resilience import provider_status
+from services.sync_scheduler import scheduler
 
 templates = Jinja2Templates(directory="templates")
 router = APIRouter()
 
 
-
 @router.get("/dashboard", response_class=HTMLResponse)
 def dashboard(request: Request, db: Session = Depends(get_db)):
     i18n_templates = get_templates_with_i18n(request)
@@ -42,24 +44,27 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
 #             continue
 
 
+@router.get("/api/price_cache")
+def price_cache_stats():
+    return {**price_cache.stats(), "writer": price_writer.stats()}
+
+
+@router.get("/api/providers")
+def provider_circuits():
+    return provider_status()
+
+
+@router.get("/api/sync_status")
+def sync_status(db: Session = Depends(get_db)):
+    return scheduler.status(db)
+
+
 @router.get("/api/dashboard")
 def generate_dashboard_data(db: Session = Depends(get_db)):
-    # 1) 환율 불러오기
-    url = "https://api.manana.kr/exchange/rate.json"
-    resp = requests.get(url, timeout=5)
-    resp.raise_for_status()
-    data = resp.json()
-
-    usd_krw = None
-    as_of = None
-    for row in data:
-        name = row.get("name", "")
-        if "USD" in name and "KRW" in name:
-            usd_krw = float(row.get("rate"))
-            as_of = row.get("date")
-            break
-    if usd_krw is None:
-        raise RuntimeError("USD/KRW rate not found")
+    # 1) 환율 불러오기 (메모리/DB 캐시, 오래되면 백그라운드에서 갱신)
+    fx = get_usd_krw(db)
+    usd_krw = fx.rate
+    as_of = fx.as_of
 
     # 2) 총액/리스트 초기화
     usd_assets_value = 0
@@ -196,6 +201,8 @@ def generate_dashboard_data(db: Session = Depends(get_db)):
     # 5) 응답
     return {
         "rate": usd_krw,
+        "rate_stale": fx.stale,
+        "rate_default": fx.default,
         "as_of": as_of or datetime.now().strftime("%Y-%m-%d %H:%M"),
         "total": {"amount_usd": total_usd, "amount_krw": total_krw},
         "breakdown": {
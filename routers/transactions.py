@@ -9,6 +9,7 @@ from datetime import date
 from typing import Optional
 from i18n_helpers import get_templates_with_i18n
 
+from services.account_daily_values import transactions_changed
 from services.transaction_service import (
     annotate_with_balances,
     annotate_with_quantities_by_symbol,
@@ -101,6 +102,7 @@ def add_transaction(
     db.add(new_tx)
     db.commit()
     db.refresh(new_tx)
+    transactions_changed(db, account_id, date)
 
     return JSONResponse({"status": "ok"})
 
@@ -110,8 +112,10 @@ def delete_transaction(tx_id: int, db: Session = Depends(get_db)):
     tx = db.query(Transaction).get(tx_id)
     if tx:
         account_id = tx.account_id
+        tx_date = tx.date
         db.delete(tx)
         db.commit()
+        transactions_changed(db, account_id, tx_date)
         return RedirectResponse(
             url=f"/transactions?account_id={account_id}", status_code=303
         )
@@ -136,6 +140,8 @@ def update_transaction(
     if not tx:
         return RedirectResponse(url="/transactions", status_code=404)
 
+    # 옮겨진 거래는 이전 날짜와 새 날짜 중 이른 쪽부터 다시 계산해야 한다
+    changed_from = min(tx.date, date)
     tx.date = date
     tx.amount = amount
     tx.type = type
@@ -147,6 +153,7 @@ def update_transaction(
     tx.fee = float(fee) if fee and fee.strip() else None
 
     db.commit()
+    transactions_changed(db, tx.account_id, changed_from)
 
     return RedirectResponse(
         url=f"/transactions?account_id={tx.account_id}", status_code=303
@@ -170,6 +177,7 @@ async def upload_csv(
     if account_id == 16:  # Fidelity Stock Account
         db.query(Transaction).filter(Transaction.account_id == account_id).delete()
         db.commit()
+        transactions_changed(db, account_id)
 
         import pandas as pd
         from io import StringIO
@@ -0,0 +1,167 @@
+import hashlib
+import json
+from decimal import Decimal
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models.account_checkpoint import AccountCheckpoint
+from services.money import AMOUNT_SCALE, money
+from services.portfolio_service import Holding, Portfolio
+
+HOLDING_FIELDS = ("quantity", "cost", "dividend_total", "realized_gain")
+SCALAR_FIELDS = ("cash", "invest", "capital_gain", "interest", "dividend", "tax_fee")
+UPDATED_FIELDS = ("digest", "holdings") + SCALAR_FIELDS
+STORED_FIELDS = ("account_id", "date") + UPDATED_FIELDS
+# 저장 형식이 바뀌면 올린다. 다이제스트가 달라져 예전 체크포인트는 버려진다
+CHECKPOINT_FORMAT = "fixed-point-1"
+
+
+def _fingerprint(tx):
+    return "|".join(
+        str(v)
+        for v in (
+            tx.id,
+            tx.date,
+            getattr(tx.type, "value", tx.type),
+            tx.amount,
+            tx.symbol,
+            tx.quantity,
+            tx.price,
+        )
+    )
+
+
+def day_digests(transactions):
+    """Running digest per transaction day, in date order.
+
+    Each digest chains the previous one, so it identifies the whole
+    transaction set up to and including that day.
+    """
+    digests = []
+    digest = CHECKPOINT_FORMAT
+    current = None
+    h = None
+    for tx in transactions:
+        if tx.date != current:
+            if h is not None:
+                digest = h.hexdigest()
+                digests.append(digest)
+            current = tx.date
+            h = hashlib.sha256(digest.encode())
+        h.update(_fingerprint(tx).encode())
+        h.update(b"\n")
+    if h is not None:
+        digests.append(h.hexdigest())
+    return digests
+
+
+def _latest(db, account_id):
+    return (
+        db.query(AccountCheckpoint)
+        .filter(AccountCheckpoint.account_id == account_id)
+        .order_by(AccountCheckpoint.date.desc())
+        .first()
+    )
+
+
+def load_checkpoint(db, account_id, days, digests):
+    """The account's checkpoint if it still matches the transactions.
+
+    Only the latest row is kept per account. It is valid when its date is a
+    transaction day whose chained digest is unchanged; a stale one is dropped.
+    """
+    row = _latest(db, account_id)
+    if row is None:
+        return None
+    try:
+        digest = digests[days.index(row.date)]
+    except ValueError:
+        digest = None
+    if row.digest != digest:
+        invalidate_checkpoints(db, account_id)
+        return None
+    return row
+
+
+def snapshot(account_id, day, digest, portfolio):
+    """Checkpoint row for the portfolio state at the end of day."""
+    holdings = {
+        symbol: [getattr(h, f) for f in HOLDING_FIELDS]
+        for symbol, h in portfolio.holdings.items()
+    }
+    return AccountCheckpoint(
+        account_id=account_id,
+        date=day,
+        digest=digest,
+        holdings=json.dumps(holdings),
+        **{
+            f: Decimal(getattr(portfolio, f)).scaleb(-AMOUNT_SCALE)
+            for f in SCALAR_FIELDS
+        },
+    )
+
+
+def checkpoint_holdings(checkpoint):
+    """{symbol: Holding} stored on a checkpoint."""
+    return {
+        symbol: Holding(**dict(zip(HOLDING_FIELDS, values)))
+        for symbol, values in json.loads(checkpoint.holdings).items()
+    }
+
+
+def restore_portfolio(db, checkpoint):
+    """Portfolio positioned at a checkpoint, ready for later transactions."""
+    portfolio = Portfolio(db)
+    for f in SCALAR_FIELDS:
+        setattr(portfolio, f, money(getattr(checkpoint, f)))
+    # 개별 배당 내역(DividendLog)은 저장하지 않는다 (합계만 유지)
+    portfolio.holdings.update(checkpoint_holdings(checkpoint))
+    return portfolio
+
+
+def latest_portfolio(db, account_id, transactions):
+    """Portfolio after every transaction, from the last checkpoint if current."""
+    digests = day_digests(transactions)
+    last = _latest(db, account_id)
+    if (
+        last is None
+        or not digests
+        or last.date != transactions[-1].date
+        or last.digest != digests[-1]
+    ):
+        return None
+    return restore_portfolio(db, last)
+
+
+def save_checkpoint(db, checkpoint):
+    """Store checkpoint as the account's latest and drop the older rows.
+
+    An upsert on (account_id, date): two replays of one account can
+    snapshot the same day at once, and the later write wins instead of
+    failing on the unique index.
+    """
+    stmt = sqlite_insert(AccountCheckpoint).values(
+        {f: getattr(checkpoint, f) for f in STORED_FIELDS}
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["account_id", "date"],
+        set_={f: stmt.excluded[f] for f in UPDATED_FIELDS},
+    )
+    db.execute(stmt)
+    db.query(AccountCheckpoint).filter(
+        AccountCheckpoint.account_id == checkpoint.account_id,
+        AccountCheckpoint.date < checkpoint.date,
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def invalidate_checkpoints(db, account_id, from_date=None):
+    """Drop checkpoints on or after from_date (all of them when None)."""
+    query = db.query(AccountCheckpoint).filter(
+        AccountCheckpoint.account_id == account_id
+    )
+    if from_date is not None:
+        query = query.filter(AccountCheckpoint.date >= from_date)
+    deleted = query.delete(synchronize_session=False)
+    db.commit()
+    return deleted
@@ -0,0 +1,199 @@
+import os
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db import SessionLocal
+from models.account import Account, AccountType
+from models.account_daily_value import AccountDailyValue
+from models.transactions import Transaction
+from services.account_checkpoints import invalidate_checkpoints, latest_portfolio
+from services.portfolio_service import Portfolio
+from services.price_ingest import UPSERT_CHUNK_ROWS
+from services.price_prefetch import prefetch_account_prices
+from services.replay_engine import build_ledger, replay_account
+from services.trading_calendar import calendar_for_country
+from services.transaction_service import ledger_transactions
+
+VALUE_FIELDS = (
+    "cash",
+    "invest",
+    "valuation",
+    "returns",
+    "capital_gain",
+    "interest_income",
+    "dividend_income",
+    "total_income",
+)
+# 야간 동기화 뒤에는 최근 구간을 다시 계산한다 (늦게 들어온 봉, 종가 정정)
+REFRESH_DAYS = int(os.getenv("DAILY_VALUES_REFRESH_DAYS", "7"))
+
+
+def clear_daily_values(db, account_id, from_date=None):
+    """Drop stored rows on or after from_date (all of them when None)."""
+    query = db.query(AccountDailyValue).filter(
+        AccountDailyValue.account_id == account_id
+    )
+    if from_date is not None:
+        query = query.filter(AccountDailyValue.date >= from_date)
+    deleted = query.delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def transactions_changed(db, account_id, from_date=None):
+    """Write hook: everything derived from the account's history on or after
+    from_date is stale and is rebuilt on the next read."""
+    invalidate_checkpoints(db, account_id, from_date)
+    clear_daily_values(db, account_id, from_date)
+
+
+def prices_changed(db, symbol, from_date=None):
+    """Price hook: stored values of every account that traded symbol are stale
+    from from_date (or its first trade in symbol, whichever is later)."""
+    rows = (
+        db.query(Transaction.account_id, func.min(Transaction.date))
+        .filter(Transaction.symbol == symbol)
+        .group_by(Transaction.account_id)
+        .all()
+    )
+    cleared = 0
+    for account_id, first in rows:
+        start = max(first, from_date) if from_date else first
+        cleared += clear_daily_values(db, account_id, start)
+    return cleared
+
+
+def last_value_date(db, account_id):
+    row = _last_row(db, account_id)
+    return row[0] if row else None
+
+
+def _last_row(db, account_id):
+    return (
+        db.query(AccountDailyValue.date, AccountDailyValue.computed_at)
+        .filter(AccountDailyValue.account_id == account_id)
+        .order_by(AccountDailyValue.date.desc())
+        .first()
+    )
+
+
+def build_daily_values(db, account, transactions=None, end_date=None, from_date=None):
+    """Replay the account and store one row per session on or after from_date.
+
+    Rows before from_date are left alone. Returns the replay, or None when
+    the account has no transactions.
+    """
+    if transactions is None:
+        transactions = ledger_transactions(db, account.id)
+    clear_daily_values(db, account.id, from_date)
+    if not transactions:
+        return None
+    end_date = end_date or datetime.today().date()
+    prefetch_account_prices(transactions, end_date)
+    calendar = calendar_for_country(account.account_country)
+    replay = replay_account(
+        db, transactions, end_date, calendar, account.id, start=from_date
+    )
+
+    first = from_date.isoformat() if from_date else ""
+    columns = [getattr(replay, f).tolist() for f in VALUE_FIELDS]
+    computed_at = datetime.utcnow()
+    records = [
+        {
+            "account_id": account.id,
+            "date": date.fromisoformat(day),
+            "computed_at": computed_at,
+            **{f: values[i] for f, values in zip(VALUE_FIELDS, columns)},
+        }
+        for i, day in enumerate(replay.timestamps)
+        if day >= first
+    ]
+    for i in range(0, len(records), UPSERT_CHUNK_ROWS):
+        stmt = sqlite_insert(AccountDailyValue).values(
+            records[i : i + UPSERT_CHUNK_ROWS]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["account_id", "date"],
+            set_={f: stmt.excluded[f] for f in VALUE_FIELDS + ("computed_at",)},
+        )
+        db.execute(stmt)
+    db.commit()
+    return replay
+
+
+def read_daily_values(db, account_id, start=None, end=None):
+    """Stored series for [start, end] as {"timestamps": [...], field: [...]}."""
+    query = db.query(
+        AccountDailyValue.date, *(getattr(AccountDailyValue, f) for f in VALUE_FIELDS)
+    ).filter(AccountDailyValue.account_id == account_id)
+    if start is not None:
+        query = query.filter(AccountDailyValue.date >= start)
+    if end is not None:
+        query = query.filter(AccountDailyValue.date <= end)
+    rows = query.order_by(AccountDailyValue.date.asc()).all()
+    values = {"timestamps": [r[0].strftime("%Y-%m-%d") for r in rows]}
+    for i, f in enumerate(VALUE_FIELDS, start=1):
+        values[f] = [r[i] for r in rows]
+    return values
+
+
+def ensure_daily_values(db, account, end_date=None):
+    """Stored series up to end_date plus the current portfolio.
+
+    Only missing sessions are replayed into the table, plus the last stored
+    one when it was computed before that session's close. A current table
+    costs one range scan and a checkpoint read.
+    """
+    end_date = end_date or datetime.today().date()
+    transactions = ledger_transactions(db, account.id)
+    if not transactions:
+        return read_daily_values(db, account.id, end=end_date), Portfolio(db)
+
+    calendar = calendar_for_country(account.account_country)
+    last = _last_row(db, account.id)
+    portfolio = None
+    from_date = None
+    if last is not None:
+        last_date, computed_at = last
+        # 장 마감 전에 계산한 행은 당일 종가가 아니므로 그 행부터 다시 쓴다
+        provisional = computed_at is None or computed_at < calendar.session_close(
+            last_date
+        )
+        from_date = last_date if provisional else last_date + timedelta(days=1)
+    if from_date is None or calendar.has_session(from_date, end_date):
+        replay = build_daily_values(db, account, transactions, end_date, from_date)
+        portfolio = replay.portfolio
+    if portfolio is None:
+        portfolio = latest_portfolio(db, account.id, transactions)
+    if portfolio is None:
+        portfolio = build_ledger(db, transactions, account.id).portfolio
+    return read_daily_values(db, account.id, end=end_date), portfolio
+
+
+def refresh_daily_values(session_factory=None, days=REFRESH_DAYS):
+    """Nightly job: recompute the recent rows of every stock account.
+
+    days=None rebuilds every account from its first transaction.
+    """
+    db = (session_factory or SessionLocal)()
+    refreshed = 0
+    try:
+        accounts = db.query(Account).filter(Account.account_type == AccountType.STOCK)
+        for account in accounts.all():
+            try:
+                last = last_value_date(db, account.id)
+                from_date = last - timedelta(days=days) if last and days else None
+                build_daily_values(db, account, from_date=from_date)
+                refreshed += 1
+            except Exception as e:
+                db.rollback()
+                print(f"[daily_values] account {account.id} failed: {e}")
+    finally:
+        db.close()
+    return refreshed
+
+
+if __name__ == "__main__":
+    print(f"[daily_values] rebuilt {refresh_daily_values(days=None)} accounts")
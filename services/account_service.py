@@ -2,10 +2,12 @@ from collections import defaultdict
 from sqlalchemy.orm import Session
 from models.account import Account, AssetBreakdown, AssetType
 from models.transactions import Transaction, TransactionType
+from services.instrument_registry import ensure_loaded
 from services.market_data_service import (
     get_current_symbol_price,
     get_current_symbol_type,
 )
+from services.money import money, to_float
 from services.transaction_service import (
     annotate_with_balances,
     annotate_with_quantities_by_symbol,
@@ -36,14 +38,15 @@ def get_stock_account_networth(db: Session, account: Account) -> float:
     if not transactions:
         return 0.0
 
+    ensure_loaded(db)
     latest_balance = float(annotate_with_balances(transactions, account))
     portfolio = annotate_with_quantities_by_symbol(transactions, account)
     ab = AssetBreakdown(cash=latest_balance)
 
-    dividends_by_symbol = defaultdict(float)
+    dividends_by_symbol = defaultdict(int)
     for t in transactions:
         if t.type == TransactionType.DIVIDEND and t.symbol:
-            dividends_by_symbol[t.symbol] += float(t.amount)
+            dividends_by_symbol[t.symbol] += money(t.amount)
 
     for symbol, info in portfolio.items():
         quantity = info["quantity"]
@@ -52,9 +55,9 @@ def get_stock_account_networth(db: Session, account: Account) -> float:
         if abs(quantity) < 1e-6:
             continue
 
-        price = get_current_symbol_price(symbol)
+        price = get_current_symbol_price(symbol, db)
         valuation = price * quantity
-        dividend = dividends_by_symbol.get(symbol, 0.0)
+        dividend = to_float(dividends_by_symbol.get(symbol, 0))
         profit = valuation - cost_basis + dividend
 
         latest_balance += valuation
@@ -0,0 +1,212 @@
+import calendar
+import threading
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from db import SessionLocal
+from models.yield_curve import YieldCurvePoint
+
+# 미 재무부 Daily Treasury Par Yield Curve CSV 컬럼 -> 만기 (개월)
+TREASURY_TENORS = {
+    "1 Mo": 1,
+    "2 Mo": 2,
+    "3 Mo": 3,
+    "4 Mo": 4,
+    "6 Mo": 6,
+    "1 Yr": 12,
+    "2 Yr": 24,
+    "3 Yr": 36,
+    "5 Yr": 60,
+    "7 Yr": 84,
+    "10 Yr": 120,
+    "20 Yr": 240,
+    "30 Yr": 360,
+}
+COUPONS_PER_YEAR = 2
+DEFAULT_FACE_VALUE = 1000.0
+
+
+@dataclass(frozen=True)
+class BondTerms:
+    coupon_rate: float  # 연 이표율 (0.0125 = 1.25%)
+    maturity: date
+    face_value: float = DEFAULT_FACE_VALUE
+
+
+def bond_terms(instrument):
+    """BondTerms from a registry Instrument, or None if it has no bond terms."""
+    if instrument.coupon_rate is None or instrument.maturity_date is None:
+        return None
+    return BondTerms(
+        coupon_rate=instrument.coupon_rate,
+        maturity=instrument.maturity_date,
+        face_value=instrument.face_value or DEFAULT_FACE_VALUE,
+    )
+
+
+def _months_before(day, months, end_of_month):
+    y, m = divmod(day.year * 12 + day.month - 1 - months, 12)
+    last = calendar.monthrange(y, m + 1)[1]
+    return date(y, m + 1, last if end_of_month else min(day.day, last))
+
+
+def coupon_schedule(terms, first):
+    """Coupon dates from the last one on or before first through maturity."""
+    maturity = terms.maturity
+    end_of_month = maturity.day == calendar.monthrange(maturity.year, maturity.month)[1]
+    step = 12 // COUPONS_PER_YEAR
+    dates = [maturity]
+    while dates[-1] > first:
+        dates.append(_months_before(maturity, step * len(dates), end_of_month))
+    return np.array(dates[::-1], dtype="datetime64[D]")
+
+
+class YieldCurve:
+    """Daily par yield curves as a (dates x tenors) matrix, gaps interpolated."""
+
+    def __init__(self, dates, tenor_months, yields_pct):
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.tenors = np.asarray(tenor_months, dtype=np.float64)
+        yields = np.array(yields_pct, dtype=np.float64).reshape(
+            len(self.dates), len(self.tenors)
+        )
+        # 일부 만기가 빠진 날은 같은 날의 다른 만기로 선형 보간한다
+        for row in yields:
+            known = ~np.isnan(row)
+            if known.any() and not known.all():
+                row[~known] = np.interp(
+                    self.tenors[~known], self.tenors[known], row[known]
+                )
+        self.yields = yields / 100
+
+    def __len__(self):
+        return len(self.dates)
+
+    def yields_for(self, days, years_to_maturity):
+        """Yield for each (day, remaining term) pair; NaN before the first curve."""
+        rows = np.searchsorted(self.dates, days, side="right") - 1
+        months = np.asarray(years_to_maturity) * 12
+        if not len(self.dates) or len(self.tenors) < 2:
+            return np.full(np.shape(days), np.nan)
+        j = np.clip(np.searchsorted(self.tenors, months), 1, len(self.tenors) - 1)
+        t0, t1 = self.tenors[j - 1], self.tenors[j]
+        r = np.maximum(rows, 0)
+        y0, y1 = self.yields[r, j - 1], self.yields[r, j]
+        # 곡선 양 끝 밖은 가장 가까운 만기의 수익률을 그대로 쓴다
+        frac = np.clip((months - t0) / (t1 - t0), 0.0, 1.0)
+        return np.where(rows >= 0, y0 + frac * (y1 - y0), np.nan)
+
+
+def price_series(terms, days, curve):
+    """Vectorized clean and dirty prices per unit (face_value) for each day.
+
+    Street convention with actual/actual accrual inside the coupon period;
+    days on or after maturity are valued at face. Returns a dict of arrays
+    keyed "clean", "dirty", "accrued" and "yield".
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    face = terms.face_value
+    coupon = face * terms.coupon_rate / COUPONS_PER_YEAR
+    if not len(days):
+        empty = np.array([], dtype=np.float64)
+        return {"clean": empty, "dirty": empty, "accrued": empty, "yield": empty}
+
+    schedule = coupon_schedule(terms, days.min().astype(object))
+    maturity = np.datetime64(terms.maturity, "D")
+    alive = days < maturity
+
+    i = np.clip(np.searchsorted(schedule, days, side="right"), 1, len(schedule) - 1)
+    prev, nxt = schedule[i - 1], schedule[i]
+    w = (nxt - days).astype(np.float64) / (nxt - prev).astype(np.float64)
+    remaining = len(schedule) - i  # 남은 이표 횟수 (만기 포함)
+
+    years = (maturity - days).astype(np.float64) / 365.25
+    y = curve.yields_for(days, np.maximum(years, 0.0))
+    v = 1.0 / (1.0 + y / COUPONS_PER_YEAR)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = np.where(
+            np.isclose(v, 1.0),
+            remaining,
+            v**w * (1 - v**remaining) / (1 - v),
+        )
+    dirty = coupon * annuity + face * v ** (w + remaining - 1)
+    accrued = coupon * (1 - w)
+
+    dirty = np.where(alive, dirty, face)
+    accrued = np.where(alive, accrued, 0.0)
+    return {"clean": dirty - accrued, "dirty": dirty, "accrued": accrued, "yield": y}
+
+
+_curve = None
+_lock = threading.Lock()
+
+
+def load_yield_curve(db):
+    """Read yield_curve_points into the shared YieldCurve."""
+    global _curve
+    rows = db.query(
+        YieldCurvePoint.date, YieldCurvePoint.tenor_months, YieldCurvePoint.yield_pct
+    ).all()
+    frame = pd.DataFrame(rows, columns=["date", "tenor", "yield"])
+    if frame.empty:
+        curve = YieldCurve([], [], [])
+    else:
+        frame["yield"] = frame["yield"].astype(float)
+        matrix = frame.pivot(index="date", columns="tenor", values="yield").sort_index()
+        curve = YieldCurve(matrix.index.values, matrix.columns.values, matrix.values)
+    with _lock:
+        _curve = curve
+    return curve
+
+
+def get_yield_curve(session_factory=None):
+    with _lock:
+        curve = _curve
+    if curve is not None:
+        return curve
+    db = (session_factory or SessionLocal)()
+    try:
+        return load_yield_curve(db)
+    finally:
+        db.close()
+
+
+def import_treasury_curve_csv(db, path):
+    """Upsert a Treasury par yield curve CSV; returns the points written."""
+    frame = pd.read_csv(path)
+    frame["Date"] = pd.to_datetime(frame["Date"], format="%m/%d/%Y").dt.date
+    columns = [c for c in TREASURY_TENORS if c in frame.columns]
+    points = frame.melt(id_vars="Date", value_vars=columns).dropna()
+    records = [
+        {"date": d, "tenor_months": TREASURY_TENORS[c], "yield_pct": float(y)}
+        for d, c, y in zip(points["Date"], points["variable"], points["value"])
+    ]
+    for i in range(0, len(records), 500):
+        stmt = sqlite_insert(YieldCurvePoint).values(records[i : i + 500])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["date", "tenor_months"],
+            set_={"yield_pct": stmt.excluded.yield_pct},
+        )
+        db.execute(stmt)
+    db.commit()
+    load_yield_curve(db)
+    return len(records)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from services.market_data_service import reprice_model_bonds
+
+    session = SessionLocal()
+    try:
+        for csv_path in sys.argv[1:]:
+            written = import_treasury_curve_csv(session, csv_path)
+            print(f"[bond_pricing] {csv_path}: {written} curve points")
+        print(f"[bond_pricing] repriced {reprice_model_bonds(session)} bonds")
+    finally:
+        session.close()
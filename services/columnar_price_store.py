@@ -0,0 +1,115 @@
+import os
+import re
+import uuid
+
+import numpy as np
+
+from models.price import Price
+from models.tickers import Ticker
+
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", os.path.join("data", "price_store"))
+# ohlcv 파일의 행 순서. close를 첫 행에 두어 종가 배열이 연속된 메모리가 되게 한다
+FIELDS = ("close", "open", "high", "low", "volume")
+
+
+def _path(directory, symbol, kind):
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+    return os.path.join(directory, f"{safe}.{kind}.npy")
+
+
+def _save_atomic(path, array):
+    # 다른 워커가 보고 있는 기존 파일은 교체 후에도 그대로 유효하다
+    tmp = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+
+def write_symbol_columns(symbol, dates, ohlcv, directory=PRICE_STORE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    _save_atomic(_path(directory, symbol, "ohlcv"), ohlcv)
+    # 날짜 파일을 나중에 바꿔서, 날짜만 있고 가격이 없는 상태를 읽지 않게 한다
+    _save_atomic(_path(directory, symbol, "dates"), dates)
+
+
+def drop_symbol_columns(symbol, directory=PRICE_STORE_DIR):
+    """Remove a symbol's arrays so readers fall back to the prices table."""
+    # 날짜 파일을 먼저 지워서, 가격만 남은 상태는 항목이 없는 것으로 읽힌다
+    for kind in ("dates", "ohlcv"):
+        try:
+            os.remove(_path(directory, symbol, kind))
+        except FileNotFoundError:
+            pass
+
+
+def store_exists(directory=PRICE_STORE_DIR):
+    return os.path.isdir(directory)
+
+
+def export_price_store(db, directory=PRICE_STORE_DIR, symbols=None):
+    """Regenerate per-ticker date and OHLCV arrays from the prices table.
+
+    symbols limits the export to those tickers (default: every ticker).
+    """
+    exported = 0
+    tickers = db.query(Ticker)
+    if symbols is not None:
+        tickers = tickers.filter(Ticker.symbol.in_(list(symbols)))
+    for ticker in tickers.all():
+        rows = (
+            db.query(
+                Price.date, Price.close, Price.open, Price.high, Price.low, Price.volume
+            )
+            .filter(Price.ticker_id == ticker.id, Price.close.isnot(None))
+            .order_by(Price.date.asc())
+            .all()
+        )
+        if not rows:
+            continue
+        dates = np.array([r[0] for r in rows], dtype="datetime64[D]")
+        ohlcv = np.array(
+            [[np.nan if v is None else float(v) for v in r[1:]] for r in rows],
+            dtype=np.float64,
+        ).T.copy()
+        write_symbol_columns(ticker.symbol, dates, ohlcv, directory)
+        exported += 1
+    return exported
+
+
+def load_symbol_columns(symbol, directory=PRICE_STORE_DIR):
+    """Read-only memory maps (dates, ohlcv) for a symbol, or None if absent.
+
+    ohlcv has one row per field in FIELDS order, so ohlcv[0] is the closes.
+    All worker processes mapping the same files share one page-cache copy.
+    """
+    dates_path = _path(directory, symbol, "dates")
+    ohlcv_path = _path(directory, symbol, "ohlcv")
+    if not (os.path.exists(dates_path) and os.path.exists(ohlcv_path)):
+        return None
+    try:
+        dates = np.load(dates_path, mmap_mode="r")
+        ohlcv = np.load(ohlcv_path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        print(f"[WARN] price store unreadable for {symbol}: {e}")
+        return None
+    if ohlcv.shape != (len(FIELDS), len(dates)):
+        return None
+    return dates, ohlcv
+
+
+def load_symbol_closes(symbol, directory=PRICE_STORE_DIR):
+    columns = load_symbol_columns(symbol, directory)
+    if columns is None:
+        return None
+    dates, ohlcv = columns
+    return dates, ohlcv[0]
+
+
+if __name__ == "__main__":
+    from db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"[columnar_price_store] exported {export_price_store(session)} tickers")
+    finally:
+        session.close()
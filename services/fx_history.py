@@ -0,0 +1,135 @@
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models.fx_rate import FxDailyRate
+from services.market_data_provider import FDR
+from services.price_index import PriceIndex
+from services.price_ingest import UPSERT_CHUNK_ROWS
+from services.price_range_planner import MAX_GAP_DAYS
+
+_indexes = {}  # (base, quote) -> 일별 환율 PriceIndex
+_lock = threading.Lock()
+
+
+def backfill_fx(db, start, end=None, base="USD", quote="KRW"):
+    """Bulk upsert daily closes for a currency pair; returns the rows written."""
+    df = FDR.history(f"{base}/{quote}", start, end)
+    if df is None or df.empty or "Close" not in df.columns:
+        return 0
+    closes = df["Close"].dropna()
+    records = [
+        {"base": base, "quote": quote, "date": d.date(), "close": float(c)}
+        for d, c in zip(closes.index, closes.to_numpy())
+    ]
+    # 여러 해를 한 번에 받으면 SQLite 바인드 변수 한도를 넘으므로 나눠서 쓴다
+    for i in range(0, len(records), UPSERT_CHUNK_ROWS):
+        stmt = sqlite_insert(FxDailyRate).values(records[i : i + UPSERT_CHUNK_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["base", "quote", "date"],
+            set_={"close": stmt.excluded.close},
+        )
+        db.execute(stmt)
+    db.commit()
+    with _lock:
+        _indexes.pop((base, quote), None)
+    return len(records)
+
+
+def load_fx_index(db, base="USD", quote="KRW"):
+    """Cached as-of index of the stored daily closes for a pair."""
+    with _lock:
+        index = _indexes.get((base, quote))
+    if index is not None:
+        return index
+    rows = (
+        db.query(FxDailyRate.date, FxDailyRate.close)
+        .filter(FxDailyRate.base == base, FxDailyRate.quote == quote)
+        .all()
+    )
+    index = PriceIndex.from_rows(rows)
+    with _lock:
+        _indexes[(base, quote)] = index
+    return index
+
+
+def ensure_fx_history(db, start, end=None, base="USD", quote="KRW"):
+    """Backfill only the missing head/tail of [start, end] and return the index."""
+    end = min(end or datetime.today().date(), datetime.today().date())
+    index = load_fx_index(db, base, quote)
+    ranges = []
+    if not len(index):
+        ranges.append((start, end))
+    else:
+        if start < index.first_date:
+            ranges.append((start, index.first_date - timedelta(days=1)))
+        if (end - index.last_date).days > MAX_GAP_DAYS:
+            ranges.append((index.last_date + timedelta(days=1), end))
+    for s, e in ranges:
+        try:
+            backfill_fx(db, s, e, base, quote)
+        except Exception as ex:
+            print(f"[WARN] {base}/{quote} backfill {s}~{e} failed: {ex}")
+    if ranges:
+        index = load_fx_index(db, base, quote)
+    return index
+
+
+def fx_rate_as_of(db, date, base="USD", quote="KRW"):
+    """Daily close on or before date, or None when nothing is stored yet."""
+    return load_fx_index(db, base, quote).as_of(date)
+
+
+def conversion_factors(db, dates, from_currency, to_currency):
+    """Per-day multipliers turning from_currency amounts into to_currency.
+
+    Dates before the first stored close use that first close, so early
+    history is converted rather than dropped.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    # AccountCurrencyType 또는 "USD" 같은 문자열 모두 받는다
+    from_currency = getattr(from_currency, "value", from_currency)
+    to_currency = getattr(to_currency, "value", to_currency)
+    if from_currency == to_currency or not len(dates):
+        return np.ones(dates.shape)
+
+    if (from_currency, to_currency) == ("USD", "KRW"):
+        invert = False
+    elif (from_currency, to_currency) == ("KRW", "USD"):
+        invert = True
+    else:
+        raise ValueError(f"unsupported conversion {from_currency}->{to_currency}")
+
+    index = ensure_fx_history(
+        db, dates.min().astype(object), dates.max().astype(object)
+    )
+    if not len(index):
+        raise LookupError("no USD/KRW history available")
+    rates = index.as_of_many(dates)
+    rates = np.where(np.isnan(rates), index.closes[0], rates)
+    return 1.0 / rates if invert else rates
+
+
+def convert_series(db, dates, values, from_currency, to_currency):
+    """Convert one or more aligned value series day by day in one pass.
+
+    values may be 1-D (one series) or 2-D with one row per series; every
+    row is multiplied by the same per-day factor vector.
+    """
+    factors = conversion_factors(db, dates, from_currency, to_currency)
+    return np.asarray(values, dtype=np.float64) * factors
+
+
+if __name__ == "__main__":
+    import sys
+
+    from db import SessionLocal
+
+    start = datetime.strptime(sys.argv[1], "%Y-%m-%d").date()
+    session = SessionLocal()
+    try:
+        print(f"[fx_history] upserted {backfill_fx(session, start)} USD/KRW closes")
+    finally:
+        session.close()
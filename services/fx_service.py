@@ -0,0 +1,138 @@
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import requests
+
+from db import SessionLocal
+from models.fx_rate import FxRate
+from services.resilience import resilient_call
+
+FX_RATE_URL = "https://api.manana.kr/exchange/rate.json"
+FX_TIMEOUT_SECONDS = 5
+FX_TTL = timedelta(seconds=int(os.getenv("FX_TTL_SECONDS", "600")))
+# 저장된 환율도 없고 API 도 안 될 때 (최초 실행) 쓰는 값. default 로 표시된다
+FX_DEFAULT_USD_KRW = float(os.getenv("FX_DEFAULT_USD_KRW", "1400"))
+
+
+@dataclass
+class FxQuote:
+    rate: float
+    as_of: str
+    fetched_at: datetime
+    stale: bool = False
+    default: bool = False  # 조회된 적 없는 FX_DEFAULT_USD_KRW 값
+
+
+_current = None  # 마지막으로 알려진 USD/KRW FxQuote
+_lock = threading.Lock()
+_refreshing = False
+
+
+def _get_rates():
+    resp = requests.get(FX_RATE_URL, timeout=FX_TIMEOUT_SECONDS)
+    # 5xx 도 재시도와 fx_api 회로 집계 대상이 되도록 호출 안에서 올린다
+    resp.raise_for_status()
+    return resp
+
+
+def fetch_usd_krw():
+    """(rate, as_of) straight from the upstream API; raises on any failure."""
+    resp = resilient_call("fx_api", "USD/KRW", _get_rates)
+    for row in resp.json():
+        name = row.get("name", "")
+        if "USD" in name and "KRW" in name:
+            return float(row.get("rate")), row.get("date")
+    raise RuntimeError("USD/KRW rate not found")
+
+
+def _store(db, rate, as_of):
+    global _current
+    now = datetime.utcnow()
+    db.add(FxRate(base="USD", quote="KRW", rate=rate, as_of=as_of, fetched_at=now))
+    db.commit()
+    quote = FxQuote(rate=rate, as_of=as_of, fetched_at=now)
+    with _lock:
+        _current = quote
+    return quote
+
+
+def refresh_usd_krw(db):
+    rate, as_of = fetch_usd_krw()
+    return _store(db, rate, as_of)
+
+
+def _refresh_in_background(session_factory):
+    global _refreshing
+    db = session_factory()
+    try:
+        refresh_usd_krw(db)
+    except Exception as e:
+        print(f"[WARN] USD/KRW refresh failed, keeping last known rate: {e}")
+    finally:
+        db.close()
+        with _lock:
+            _refreshing = False
+
+
+def _load_last_known(db):
+    global _current
+    row = (
+        db.query(FxRate)
+        .filter(FxRate.base == "USD", FxRate.quote == "KRW")
+        .order_by(FxRate.fetched_at.desc())
+        .first()
+    )
+    if row is None:
+        return None
+    quote = FxQuote(rate=float(row.rate), as_of=row.as_of, fetched_at=row.fetched_at)
+    with _lock:
+        if _current is None:
+            _current = quote
+        return _current
+
+
+def get_usd_krw(db, session_factory=None) -> FxQuote:
+    """USD/KRW without waiting on the upstream API once any rate is known.
+
+    A rate older than FX_TTL is returned flagged as stale while a background
+    thread fetches a new one; the upstream is only awaited on a cold start.
+    If that fails too, FX_DEFAULT_USD_KRW is returned flagged as default.
+    """
+    global _refreshing
+    with _lock:
+        current = _current
+    if current is None:
+        current = _load_last_known(db)
+    if current is None:
+        try:
+            return refresh_usd_krw(db)
+        except Exception as e:
+            print(f"[WARN] no USD/KRW rate known, using the default: {e}")
+            return FxQuote(
+                rate=FX_DEFAULT_USD_KRW,
+                as_of=None,
+                fetched_at=datetime.utcnow(),
+                stale=True,
+                default=True,
+            )
+
+    if datetime.utcnow() - current.fetched_at < FX_TTL:
+        return current
+
+    with _lock:
+        start_refresh = not _refreshing
+        _refreshing = True
+    if start_refresh:
+        threading.Thread(
+            target=_refresh_in_background,
+            args=(session_factory or SessionLocal,),
+            daemon=True,
+        ).start()
+    return FxQuote(
+        rate=current.rate,
+        as_of=current.as_of,
+        fetched_at=current.fetched_at,
+        stale=True,
+    )
@@ -0,0 +1,92 @@
+import threading
+from dataclasses import dataclass
+from datetime import date
+
+from models.account import AssetType
+from models.tickers import Ticker
+
+
+@dataclass(frozen=True)
+class Instrument:
+    symbol: str
+    asset_type: AssetType = AssetType.STOCK
+    searchable: bool = True
+    provider_hint: str = None
+    pricing_model: str = None
+    currency: str = None
+    exchange: str = None
+    coupon_rate: float = None
+    maturity_date: date = None
+    face_value: float = None
+
+
+_instruments = {}  # symbol -> Instrument
+_loaded = False
+_lock = threading.Lock()
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def _from_ticker(ticker):
+    return Instrument(
+        symbol=ticker.symbol,
+        asset_type=ticker.asset_type or AssetType.STOCK,
+        searchable=ticker.searchable is not False,
+        provider_hint=ticker.provider_hint,
+        pricing_model=ticker.pricing_model,
+        currency=ticker.currency,
+        exchange=ticker.exchange,
+        coupon_rate=_float(ticker.coupon_rate),
+        maturity_date=ticker.maturity_date,
+        face_value=_float(ticker.face_value),
+    )
+
+
+def load_registry(db):
+    """(Re)load every ticker row into the in-memory registry."""
+    global _instruments, _loaded
+    instruments = {t.symbol: _from_ticker(t) for t in db.query(Ticker).all()}
+    with _lock:
+        _instruments = instruments
+        _loaded = True
+    print(f"[instrument_registry] loaded {len(instruments)} instruments")
+    return len(instruments)
+
+
+def ensure_loaded(db):
+    if not _loaded and db is not None:
+        load_registry(db)
+
+
+def refresh_instrument(ticker):
+    """Apply one changed tickers row to the registry."""
+    with _lock:
+        _instruments[ticker.symbol] = _from_ticker(ticker)
+
+
+def update_instrument(db, symbol, **fields):
+    """Create or change a tickers row and refresh its registry entry."""
+    ticker = db.query(Ticker).filter_by(symbol=symbol).first()
+    if ticker is None:
+        ticker = Ticker(symbol=symbol)
+        db.add(ticker)
+    for name, value in fields.items():
+        setattr(ticker, name, value)
+    db.commit()
+    refresh_instrument(ticker)
+    return ticker
+
+
+def get_instrument(symbol):
+    """Registry entry for symbol; unknown symbols get the defaults."""
+    return _instruments.get(symbol) or Instrument(symbol=symbol)
+
+
+def asset_type_for(symbol):
+    return get_instrument(symbol).asset_type
+
+
+def is_searchable(symbol):
+    return get_instrument(symbol).searchable
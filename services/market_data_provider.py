@@ -0,0 +1,189 @@
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+import FinanceDataReader as fdr
+import pandas as pd
+import yfinance as yf
+
+from services.bond_pricing import bond_terms, get_yield_curve, price_series
+from services.instrument_registry import get_instrument
+from services.resilience import resilient_call
+from services.trading_calendar import NYSE
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# 마지막 봉만 필요하므로 전체 히스토리 대신 최근 며칠만 받는다
+LAST_BAR_LOOKBACK = timedelta(days=14)
+
+
+class MarketDataProvider(ABC):
+    """Source of daily OHLCV bars and latest closes for a provider symbol.
+
+    history() returns a DataFrame indexed by date with OHLCV columns (empty
+    when the provider has nothing); errors are raised, not swallowed.
+    Subclasses must implement it; last_close() defaults to its last bar.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def history(self, symbol: str, start, end) -> pd.DataFrame:
+        """Daily bars for symbol in [start, end] (end None = up to today)."""
+
+    def last_close(self, symbol: str):
+        df = self.history(symbol, datetime.today().date() - LAST_BAR_LOOKBACK, None)
+        if df.empty:
+            return None
+        return float(df["Close"].iloc[-1])
+
+
+class FdrProvider(MarketDataProvider):
+    name = "fdr"
+
+    def _download(self, symbol, start, end):
+        if end is None:
+            return fdr.DataReader(symbol, start)
+        return fdr.DataReader(symbol, start, end)
+
+    def history(self, symbol, start, end):
+        return resilient_call(
+            self.name,
+            ("history", symbol, start, end),
+            lambda: self._download(symbol, start, end),
+        )
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    def _download(self, symbol, start, end):
+        ticker = yf.Ticker(symbol)
+        if end is None:
+            return ticker.history(start=start)
+        # yfinance의 end는 해당 날짜를 포함하지 않는다
+        return ticker.history(start=start, end=end + timedelta(days=1))
+
+    def history(self, symbol, start, end):
+        return resilient_call(
+            self.name,
+            ("history", symbol, start, end),
+            lambda: self._download(symbol, start, end),
+        )
+
+    def last_close(self, symbol):
+        df = resilient_call(
+            self.name,
+            ("last_close", symbol),
+            lambda: yf.Ticker(symbol).history(period="1d"),
+        )
+        if df.empty:
+            return None
+        return float(df["Close"].iloc[-1])
+
+
+class BondModelProvider(MarketDataProvider):
+    """Prices Treasuries locally from ticker bond terms and the stored curve.
+
+    Bars are dirty prices per unit on NYSE sessions; nothing goes over the
+    network, so bond-heavy replays cost only the vectorized pricing.
+    """
+
+    name = "bond_model"
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory
+
+    def history(self, symbol, start, end):
+        terms = bond_terms(get_instrument(symbol))
+        if terms is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        days = NYSE.sessions(start, end or datetime.today().date())
+        prices = price_series(terms, days, get_yield_curve(self.session_factory))
+        df = pd.DataFrame({"Close": prices["dirty"]}, index=pd.DatetimeIndex(days))
+        return df.dropna()
+
+
+def _fixture_path(directory, symbol):
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+    return os.path.join(directory, f"{safe}.csv")
+
+
+class ReplayProvider(MarketDataProvider):
+    """Deterministic offline provider serving recorded OHLCV CSV fixtures.
+
+    Each call sleeps latency_ms first, so cold- and warm-cache timings can
+    be measured without the network but with a realistic provider cost.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixture_dir, latency_ms=0):
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self._frames = {}
+
+    def _frame(self, symbol):
+        if symbol not in self._frames:
+            path = _fixture_path(self.fixture_dir, symbol)
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col=0, parse_dates=True)
+                self._frames[symbol] = df.sort_index()
+            else:
+                self._frames[symbol] = pd.DataFrame(columns=OHLCV_COLUMNS)
+        return self._frames[symbol]
+
+    def history(self, symbol, start, end):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        df = self._frame(symbol)
+        if df.empty:
+            return df.copy()
+        end = end or datetime.today().date()
+        mask = (df.index >= pd.Timestamp(start)) & (df.index <= pd.Timestamp(end))
+        return df.loc[mask].copy()
+
+    def last_close(self, symbol):
+        # 녹화된 데이터가 오래됐더라도 마지막 봉을 그대로 돌려준다
+        df = self.history(symbol, pd.Timestamp.min.date(), None)
+        if df.empty:
+            return None
+        return float(df["Close"].iloc[-1])
+
+
+def record_fixture(provider, symbol, start, end, fixture_dir):
+    """Save provider bars as a ReplayProvider fixture; returns the row count."""
+    df = provider.history(symbol, start, end)
+    os.makedirs(fixture_dir, exist_ok=True)
+    df.reindex(columns=OHLCV_COLUMNS).to_csv(_fixture_path(fixture_dir, symbol))
+    return len(df)
+
+
+FDR = FdrProvider()
+YFINANCE = YFinanceProvider()
+BOND_MODEL = BondModelProvider()
+
+_override = None
+
+
+def _provider_from_env():
+    if os.getenv("MARKET_DATA_PROVIDER", "live") == "replay":
+        return ReplayProvider(
+            os.getenv("MARKET_DATA_FIXTURES", os.path.join("data", "fixtures")),
+            latency_ms=float(os.getenv("MARKET_DATA_LATENCY_MS", "0")),
+        )
+    return None
+
+
+def set_provider(provider):
+    """Route every lookup to one provider (e.g. ReplayProvider); None = live."""
+    global _override
+    _override = provider
+
+
+def get_override():
+    return _override
+
+
+set_provider(_provider_from_env())
@@ -1,166 +1,276 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+import os
+import numpy as np
 import requests
-import time
-import FinanceDataReader as fdr
-import yfinance as yf
+from sqlalchemy.orm import Session
 
-from models.account import AssetType
 from models.price import Price
 from models.tickers import Ticker
+from services.bond_pricing import load_yield_curve
+from services.columnar_price_store import drop_symbol_columns, load_symbol_closes
+from services.instrument_registry import (
+    asset_type_for,
+    ensure_loaded,
+    get_instrument,
+    is_searchable,
+)
+from services.market_data_provider import BOND_MODEL
+from services.negative_cache import clear_misses, is_known_miss, record_miss
+from services.price_cache import PriceCache
+from services.price_index import PriceIndex
+from services.price_ingest import price_records
+from services.price_overrides import override_price, retire_overrides
+from services.price_range_planner import missing_ranges, plan_fetches
+from services.price_writer import PriceWrite, PriceWriter
+from services.provider_router import record_success, route
+from services.quote_service import get_latest_quote
+from services.resilience import TRANSIENT_ERRORS, CircuitOpenError
+from services.ticker_service import get_or_create_ticker
+from services.trading_calendar import calendar_for_symbol
 
 
 def get_current_symbol_type(symbol: str):
-    if symbol in [
-        "US912810SN90",
-        "US912810SQ22",
-        "US91282CAJ09",
-        "US91282CAT80",
-        "US91282CBQ33",
-        "157450",
-        "BIL",
-    ]:
-        return AssetType.BOND
-    return AssetType.STOCK
-
-
-def get_current_symbol_price(symbol: str) -> float:
-    now = time.time()
-
-    if symbol == "Conviva":
-        return 1.23
-    elif symbol == "US912810SN90":  # 미국 국채 50년 5월 15일 만기
-        return 4781.06 / 10
-    elif symbol == "US912810SQ22":  # 미국 국채 40년 8월 15일 만기
-        return 10459.28 / 17
-    elif symbol == "US91282CAJ09":  # 미국 국채 25년 8월 31일 만기
-        return 9993.71 / 10
-    elif symbol == "US91282CAT80":  # 미국 국채 25년 10월 31일 만기
-        return 9924.85 / 10
-    elif symbol == "US91282CBQ33":  # 미국 국채 26년 2월 28일 만기
-        return 9832.47 / 10
-    elif symbol == "VFFSX":
-        return 316.72
-    elif symbol == "VIIIX":
-        return 526.17
-
-    if symbol.isdigit():
-        symbol = f"{symbol}"
-
-    try:
-        df = fdr.DataReader(symbol)
-        if not df.empty:
-            price = df["Close"].iloc[-1]
-            print("price found, ", symbol, ":", price)
-            return float(price)
-    except Exception as e:
-        print(f"[WARN] FDR failed for {symbol}: {e}")
-
-    try:
-        ticker = yf.Ticker(f"{symbol}.KS")
-        price = ticker.history(period="1d")["Close"].iloc[-1]
-        print("price found, ", symbol, ":", price)
-        return float(price)
-    except Exception as e:
-        print(f"[ERROR] Failed to fetch price for {symbol}: {e}")
-        return 0.0
+    return asset_type_for(symbol)
+
+
+def get_current_symbol_price(symbol: str, db=None) -> float:
+    override = override_price(db, symbol)
+    if override is not None:
+        return override
+    if symbol in scheduled_symbols and db is not None:
+        price = price_lookup(db, symbol, datetime.today().date())
+        if price is not None:
+            return price
+
+    price = get_latest_quote(db, symbol)
+    return price if price is not None else 0.0
 
 
 def not_searchable_symbol(symbol):
-    if symbol in [
-        "US912810SN90",
-        "US912810SQ22",
-        "US91282CAJ09",
-        "US91282CAT80",
-        "US91282CBQ33",
-        "US91282CHD65",
-        "0P0000RRID",
-        "92206T105",
-        "K55101DN7441",
-        "SPAXX",
-    ]:
-        return True
-    return False
-
-
-price_cache = {}
-tracking_symbols = {}
+    return not is_searchable(symbol)
+
+
+def symbol_calendar(symbol):
+    """Trading calendar of the ticker's exchange (code shape when unknown)."""
+    return calendar_for_symbol(symbol, get_instrument(symbol).exchange)
+
+
+# 최신 봉을 받은 지 이 시간이 지나지 않았으면 최근 날짜도 DB의 마지막 봉으로 응답한다
+PRICE_STALENESS = timedelta(minutes=int(os.getenv("PRICE_STALENESS_MINUTES", "360")))
+
+price_cache = PriceCache()
+last_synced = {}  # symbol -> 마지막 동기화 시각 (UTC)
+# 백그라운드 스케줄러가 동기화하는 심볼: 요청 경로에서는 다운로드하지 않는다
+scheduled_symbols = set()
+
+
+def is_price_fresh(symbol: str) -> bool:
+    synced_at = last_synced.get(symbol)
+    return synced_at is not None and datetime.utcnow() - synced_at < PRICE_STALENESS
+
+
+def _store_covers(symbol, day):
+    stored = load_symbol_closes(symbol)
+    return (
+        stored is not None
+        and len(stored[0]) > 0
+        and np.datetime64(day, "D") <= stored[0][-1]
+    )
+
+
+def _prices_durable(write):
+    bars = [(r["date"], r["close"]) for r in write.records]
+    if bars:
+        first = min(d for d, _ in bars)
+        if _store_covers(write.symbol, first):
+            # 스토어 기간 안의 정정: 스토어는 DB 보다 오래된 값이 되므로 버리고 다시 읽는다
+            drop_symbol_columns(write.symbol)
+            price_cache.invalidate(write.symbol)
+        else:
+            # 커밋 전에 캐시가 DB에서 다시 읽혔더라도 이제 봉이 들어있도록 한 번 더 반영
+            price_cache.patch(write.symbol, bars)
+        with Session(bind=write.bind) as db:
+            _prices_changed(db, write.symbol, first)
+
+
+def _prices_changed(db, symbol, from_date):
+    # 순환 import (account_daily_values → replay_engine → 이 모듈) 를 피한다
+    from services.account_daily_values import prices_changed
+
+    prices_changed(db, symbol, from_date)
+
+
+def _prices_failed(write, error):
+    # 디스크에 없는 봉이 메모리에만 남지 않도록 다음 조회 때 다시 읽게 한다
+    price_cache.invalidate(write.symbol)
+    last_synced.pop(write.symbol, None)
+
+
+price_writer = PriceWriter(on_durable=_prices_durable, on_failed=_prices_failed)
+
+
+def _read_price_index(db, symbol: str):
+    ticker = get_or_create_ticker(db, symbol)
+    if ticker.last_synced_at:
+        last_synced[symbol] = ticker.last_synced_at
+
+    query = db.query(Price.date, Price.close).filter(Price.ticker_id == ticker.id)
+    stored = load_symbol_closes(symbol)
+    if stored is not None and len(stored[0]):
+        # 공유 메모리맵을 그대로 쓰고, 스토어 생성 이후 들어온 봉만 DB에서 보충
+        index = PriceIndex.from_sorted(*stored)
+        query = query.filter(Price.date > index.last_date)
+        index.insert(query.order_by(Price.date.asc()).all())
+    else:
+        index = PriceIndex.from_rows(query.order_by(Price.date.asc()).all())
+    return ticker.id, index
+
+
+def load_price_index(db, symbol: str):
+    return price_cache.get_or_load(symbol, lambda: _read_price_index(db, symbol))
+
+
+def ensure_price_coverage(db, symbol: str, start, end, refresh=False):
+    """Download whatever bars [start, end] is missing for symbol.
+
+    refresh=True (the sync scheduler) also fetches past a fresh last bar
+    and covers symbols that requests otherwise leave to the scheduler.
+    """
+    if not symbol or not_searchable_symbol(symbol):
+        return
+    if not refresh and symbol in scheduled_symbols:
+        return
+
+    today = datetime.today().date()
+    end = min(end, today)
+    ticker_id, index = load_price_index(db, symbol)
+    if index.last_date and is_price_fresh(symbol) and not refresh:
+        end = min(end, index.last_date)
+
+    providers = route(symbol)
+    calendar = symbol_calendar(symbol)
+
+    def known_miss(r):
+        return all(
+            is_known_miss(db, provider.name, provider_symbol, r[0], r[1])
+            for provider, provider_symbol in providers
+        )
+
+    fetched = []
+    frames = []
+    plan = plan_fetches(index, start, end, skip=known_miss, calendar=calendar)
+    for fetch_start, fetch_end in plan:
+        print("[market_data_service] download data ", symbol, fetch_start, fetch_end)
+        for provider, provider_symbol in providers:
+            if is_known_miss(
+                db, provider.name, provider_symbol, fetch_start, fetch_end
+            ):
+                continue
+            try:
+                df = provider.history(provider_symbol, fetch_start, fetch_end)
+            except (CircuitOpenError, *TRANSIENT_ERRORS) as e:
+                # 일시적인 장애는 negative cache에 남기지 않는다
+                print(f"[WARN] {provider.name} unavailable for {symbol}: {e}")
+                continue
+            except Exception as e:
+                print(f"[ERROR] Failed to fetch {symbol} from {provider.name}: {e}")
+                record_miss(
+                    db, provider.name, provider_symbol, fetch_start, fetch_end, str(e)
+                )
+                continue
+            frames.append(df)
+            fetched.append((provider, provider_symbol, fetch_start, fetch_end))
+            if not df.empty:
+                record_success(db, symbol, provider)
+                break
+
+    records = []
+    for df in frames:
+        records.extend(price_records(ticker_id, df))
+    if records:
+        bars = [(r["date"], r["close"]) for r in records]
+        # 조회는 메모리에서 바로 보이게 하고, SQLite 기록은 writer 스레드에 맡긴다
+        if not price_cache.patch(symbol, bars):
+            index.insert(bars)
+
+    # 받아왔는데도 비어있는 구간은 다시 요청하지 않도록 기록
+    for provider, provider_symbol, fetch_start, fetch_end in fetched:
+        for miss_start, miss_end in missing_ranges(
+            index, fetch_start, fetch_end, calendar=calendar
+        ):
+            record_miss(
+                db, provider.name, provider_symbol, miss_start, miss_end, "empty"
+            )
+
+    synced_at = None
+    if any(fetch[3] >= today for fetch in fetched):
+        synced_at = datetime.utcnow()
+        last_synced[symbol] = synced_at
+    if records or synced_at:
+        price_writer.submit(
+            db,
+            PriceWrite(symbol, ticker_id, records, synced_at, index.last_date),
+        )
 
 
 def price_lookup(db, symbol: str, date):
     if not symbol:
         print("[ERROR] symbol is empty", date)
         return None
+    ensure_loaded(db)
+    # 수동 가격이 있으면 provider를 거치지 않는다
+    override = override_price(db, symbol, date)
+    if override is not None:
+        return override
     if not_searchable_symbol(symbol):
         return None
 
-    if symbol not in tracking_symbols:
-        ticker = db.query(Ticker).filter_by(symbol=symbol).first()
-        if not ticker:
-            ticker = Ticker(symbol=symbol)
-            db.add(ticker)
-            db.commit()
-            db.refresh(ticker)
-
-        prices = db.query(Price).filter(Price.ticker_id == ticker.id).all()
-        price_cache[symbol] = {str(p.date): float(p.close) for p in prices}
-        tracking_symbols[symbol] = ticker.id
-
-    ticker_id = tracking_symbols[symbol]
+    _, index = load_price_index(db, symbol)
 
-    if symbol in price_cache and str(date) in price_cache[symbol]:
-        return price_cache[symbol][str(date)]
+    if index.brackets(date):
+        return index.as_of(date)
+    if index.last_date and date > index.last_date:
+        # 마지막 봉 이후 거래일이 없으면 (주말, 휴장일) 받아올 것도 없다
+        no_session = not symbol_calendar(symbol).has_session(
+            index.last_date + timedelta(days=1), date
+        )
+        if no_session or is_price_fresh(symbol):
+            return index.as_of(date)
 
-    price = (
-        db.query(Price).filter(Price.ticker_id == ticker_id, Price.date == date).first()
-    )
-    if price:
-        return float(price.close)
-
-    past_price = (
-        db.query(Price)
-        .filter(Price.ticker_id == ticker_id, Price.date < date)
-        .order_by(Price.date.desc())
-        .first()
+    ensure_price_coverage(
+        db, symbol, date - timedelta(days=60), date + timedelta(days=60)
     )
+    _, index = load_price_index(db, symbol)
+    return index.as_of(date)
 
-    future_price = (
-        db.query(Price)
-        .filter(Price.ticker_id == ticker_id, Price.date > date)
-        .order_by(Price.date.asc())
-        .first()
-    )
 
-    if past_price and future_price:
-        return float(past_price.close)
+def reprice_model_bonds(db):
+    """Drop locally priced bond bars so they are recomputed from the new curve.
 
-    print("[market_data_service] download data ", symbol, date)
-    try:
-        df = fdr.DataReader(
-            symbol, date - timedelta(days=60), date + timedelta(days=60)
+    Fixed prices (overrides) of those bonds stay in force until the curve
+    covers their dates; only then are they retired in favor of the model.
+    """
+    price_writer.flush()
+    tickers = db.query(Ticker).filter(Ticker.pricing_model == BOND_MODEL.name).all()
+    for ticker in tickers:
+        db.query(Price).filter(Price.ticker_id == ticker.id).delete()
+        ticker.last_synced_at = None
+        last_synced.pop(ticker.symbol, None)
+        # 스토어에 남은 이전 곡선의 가격이 다시 읽히지 않게 한다
+        drop_symbol_columns(ticker.symbol)
+        price_cache.invalidate(ticker.symbol)
+        clear_misses(db, ticker.symbol)
+    db.commit()
+    for ticker in tickers:
+        _prices_changed(db, ticker.symbol, None)
+    curve = load_yield_curve(db)
+    if len(curve):
+        retired = retire_overrides(
+            db, [t.symbol for t in tickers], curve.dates[0].astype(object)
         )
-        for idx, row in df.iterrows():
-            db.add(
-                Price(
-                    ticker_id=ticker_id,
-                    date=idx.date(),
-                    close=row["Close"],
-                    open=row.get("Open"),
-                    high=row.get("High"),
-                    low=row.get("Low"),
-                    volume=row.get("Volume"),
-                )
-            )
-        db.commit()
-    except Exception as e:
-        print(f"[ERROR] Failed to fetch {symbol} from FDR: {e}")
-
-    price = (
-        db.query(Price)
-        .filter(Price.ticker_id == ticker_id, Price.date <= date)
-        .order_by(Price.date.desc())
-        .first()
-    )
-    return float(price.close) if price else None
+        if retired:
+            print(f"[market_data_service] retired {retired} bond price overrides")
+    return len(tickers)
 
 
 # df = fdr.DataReader("VIIIX", "2025-09-01", "2025-09-10")
@@ -0,0 +1,61 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+
+# 원장 금액은 정수로 스케일해서 다룬다. 스케일은 transactions 컬럼과 같다
+# (KRW 계좌도 amount 는 소수 둘째 자리까지 저장되므로 통화와 무관하게 같은 스케일)
+AMOUNT_SCALE = 2  # amount, price: Numeric(12, 2)
+QUANTITY_SCALE = 4  # quantity: Numeric(12, 4)
+_AMOUNT_FACTOR = 10**AMOUNT_SCALE
+_QUANTITY_FACTOR = 10**QUANTITY_SCALE
+
+
+def to_units(value, scale):
+    """Decimal/float/int/str -> int scaled by 10**scale.
+
+    Column values carry at most `scale` decimals, for which going through
+    float is exact (and much cheaper than Decimal.scaleb); strings take the
+    exact Decimal path with half-even rounding.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * 10**scale
+    if isinstance(value, str):
+        return int(Decimal(value).scaleb(scale).to_integral_value(ROUND_HALF_EVEN))
+    return round(float(value) * 10**scale)
+
+
+def money(value):
+    # Numeric 컬럼 값(Decimal)이 대부분이라 그 경우만 바로 처리한다
+    if value.__class__ is Decimal:
+        return round(float(value) * _AMOUNT_FACTOR)
+    return to_units(value, AMOUNT_SCALE)
+
+
+def quantity(value):
+    if value.__class__ is Decimal:
+        return round(float(value) * _QUANTITY_FACTOR)
+    return to_units(value, QUANTITY_SCALE)
+
+
+def div_round(numerator, denominator):
+    """Integer division rounded half-even, for positive denominators."""
+    q, r = divmod(numerator, denominator)
+    twice = 2 * r
+    if twice > denominator or (twice == denominator and q % 2):
+        q += 1
+    return q
+
+
+def cost_of(qty_units, price_units):
+    """Money units for a quantity at a per-unit price (both scaled)."""
+    return div_round(qty_units * price_units, _QUANTITY_FACTOR)
+
+
+def pro_rata(amount_units, part, whole):
+    """amount * part / whole in money units, e.g. the cost basis of a sale."""
+    return div_round(amount_units * part, whole)
+
+
+def to_float(units, scale=AMOUNT_SCALE):
+    """Scaled int (or int array) -> float, at the presentation edge."""
+    return units / 10**scale
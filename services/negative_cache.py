@@ -0,0 +1,92 @@
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from models.fetch_miss import FetchMiss
+
+NEGATIVE_CACHE_TTL = timedelta(hours=float(os.getenv("NEGATIVE_CACHE_TTL_HOURS", "24")))
+# 최근 날짜는 장 마감 후 데이터가 생길 수 있으므로 짧게 기억한다
+RECENT_MISS_TTL = timedelta(hours=float(os.getenv("RECENT_MISS_TTL_HOURS", "1")))
+RECENT_DAYS = 3
+
+_misses = defaultdict(list)  # (provider, symbol) -> [(start, end, expires_at)]
+_loaded = False
+_lock = threading.Lock()
+
+
+def _ttl_for(end):
+    if end is None or end >= datetime.today().date() - timedelta(days=RECENT_DAYS):
+        return RECENT_MISS_TTL
+    return NEGATIVE_CACHE_TTL
+
+
+def _load(db):
+    global _loaded
+    if _loaded or db is None:
+        return
+    now = datetime.utcnow()
+    db.query(FetchMiss).filter(
+        FetchMiss.attempted_at < now - NEGATIVE_CACHE_TTL
+    ).delete()
+    db.commit()
+    for m in db.query(FetchMiss).all():
+        expires_at = m.attempted_at + _ttl_for(m.end_date)
+        if expires_at > now:
+            _misses[(m.provider, m.symbol)].append(
+                (m.start_date, m.end_date, expires_at)
+            )
+    _loaded = True
+
+
+def _covers(miss_start, miss_end, start, end):
+    if miss_start is None or miss_end is None:
+        return start is None and end is None
+    if start is None or end is None:
+        return False
+    return miss_start <= start and end <= miss_end
+
+
+def is_known_miss(db, provider: str, symbol: str, start=None, end=None) -> bool:
+    """True if the same or a wider lookup failed or came back empty within TTL."""
+    with _lock:
+        _load(db)
+        now = datetime.utcnow()
+        entries = [e for e in _misses.get((provider, symbol), []) if e[2] > now]
+        if entries:
+            _misses[(provider, symbol)] = entries
+        else:
+            _misses.pop((provider, symbol), None)
+        return any(_covers(s, e, start, end) for s, e, _ in entries)
+
+
+def record_miss(db, provider: str, symbol: str, start=None, end=None, reason=None):
+    now = datetime.utcnow()
+    with _lock:
+        _load(db)
+        _misses[(provider, symbol)].append((start, end, now + _ttl_for(end)))
+    if db is not None:
+        db.add(
+            FetchMiss(
+                provider=provider,
+                symbol=symbol,
+                start_date=start,
+                end_date=end,
+                attempted_at=now,
+                reason=reason,
+            )
+        )
+        db.commit()
+
+
+def clear_misses(db=None, symbol: str = None):
+    """Forget recorded misses, e.g. after a manual data fix for a symbol."""
+    with _lock:
+        for key in [k for k in _misses if symbol is None or k[1] == symbol]:
+            del _misses[key]
+    if db is not None:
+        query = db.query(FetchMiss)
+        if symbol is not None:
+            query = query.filter(FetchMiss.symbol == symbol)
+        query.delete()
+        db.commit()
@@ -1,9 +1,68 @@
+from array import array
 from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
 
+from models.transactions import TransactionType
 from services.market_data_service import price_lookup
+from services.money import QUANTITY_SCALE, cost_of, pro_rata, to_float
+
+
+@dataclass(slots=True)
+class Holding:
+    """One symbol's position in ledger units (see Portfolio)."""
+
+    quantity: int = 0
+    cost: int = 0  # 보유분의 총 매입원가
+    dividend_total: int = 0
+    realized_gain: int = 0
+
+
+class DividendLog:
+    """Every dividend as (date, symbol, amount), kept in flat int arrays
+    rather than a list of tuples per holding."""
+
+    __slots__ = ("days", "symbol_ids", "amounts", "symbols", "_ids")
+
+    def __init__(self):
+        self.days = array("l")  # date.toordinal()
+        self.symbol_ids = array("l")
+        self.amounts = array("q")  # AMOUNT_SCALE units
+        self.symbols = []
+        self._ids = {}
+
+    def append(self, day, symbol, amount):
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        self.days.append(day.toordinal())
+        self.symbol_ids.append(symbol_id)
+        self.amounts.append(amount)
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def entries(self, symbol=None):
+        """(date, symbol, amount) in the order received, optionally for one symbol."""
+        wanted = self._ids.get(symbol, -1) if symbol is not None else None
+        for day, symbol_id, amount in zip(self.days, self.symbol_ids, self.amounts):
+            if wanted is None or symbol_id == wanted:
+                yield date.fromordinal(day), self.symbols[symbol_id], amount
 
 
 class Portfolio:
+    """Account ledger in fixed point.
+
+    Money fields are ints in AMOUNT_SCALE units (cents) and quantities ints
+    in QUANTITY_SCALE units; convert with services.money.to_float for display.
+    apply() takes LedgerTransaction rows, which are already in those units.
+    A holding keeps its total cost rather than an average cost, so sells
+    take their cost basis pro rata without rounding drift. Closed positions
+    stay in holdings (their realized gain and dividends still count);
+    active_holdings() skips them.
+    """
+
     def __init__(self, db):
         self.db = db
         self.cash = 0
@@ -13,15 +72,14 @@ class Portfolio:
         self.dividend = 0
         self.tax_fee = 0
 
-        self.holdings = defaultdict(
-            lambda: {
-                "quantity": 0,
-                "avg_cost": 0,
-                "dividend_total": 0,
-                "dividends": [],
-                "realized_gain": 0,
-            }
-        )
+        self.holdings = defaultdict(Holding)
+        self.dividends = DividendLog()
+
+    def apply(self, tx):
+        """Apply one LedgerTransaction to the ledger."""
+        handler = _HANDLERS.get(tx.type)
+        if handler is not None:
+            handler(self, tx)
 
     def deposit(self, amount):
         self.cash += amount
@@ -30,30 +88,30 @@ class Portfolio:
         self.cash -= amount
 
     def buy(self, amount, symbol, quantity, price):
-        cost = quantity * price
+        cost = cost_of(quantity, price)
         self.cash -= amount
 
         h = self.holdings[symbol]
-        total_cost = h["avg_cost"] * h["quantity"] + cost
-        h["quantity"] += quantity
-        h["avg_cost"] = total_cost / h["quantity"]
+        h.quantity += quantity
+        h.cost += cost
 
         self.invest += cost
 
     def sell(self, amount, symbol, quantity, price):
         h = self.holdings[symbol]
-        if quantity > h["quantity"]:
+        if quantity > h.quantity:
             raise ValueError("Not enough holdings to sell")
 
-        revenue = quantity * price
-        cost_basis = h["avg_cost"] * quantity
+        revenue = cost_of(quantity, price)
+        cost_basis = pro_rata(h.cost, quantity, h.quantity)
         self.cash += revenue
-        h["quantity"] -= quantity
+        h.quantity -= quantity
+        h.cost -= cost_basis
 
         realized = revenue - cost_basis
 
         self.capital_gain += realized
-        h["realized_gain"] += realized
+        h.realized_gain += realized
         self.invest -= cost_basis
 
     def process_tax_fee(self, amount):
@@ -68,31 +126,51 @@ class Portfolio:
         self.cash += amount
         self.dividend += amount
 
-        h = self.holdings[symbol]
-        h["dividend_total"] += amount
-        h["dividends"].append((date, amount))
+        self.holdings[symbol].dividend_total += amount
+        self.dividends.append(date, symbol, amount)
 
     def process_vesting(self, amount, symbol, quantity, price):
-        cost = quantity * price
-
         h = self.holdings[symbol]
-        total_cost = h["avg_cost"] * h["quantity"] + cost
-        h["quantity"] += quantity
-        h["avg_cost"] = total_cost / h["quantity"]
+        h.quantity += quantity
+        h.cost += cost_of(quantity, price)
 
         self.invest += amount
 
+    def active_holdings(self):
+        """(symbol, Holding) pairs for positions still held."""
+        return [(symbol, h) for symbol, h in self.holdings.items() if h.quantity]
+
+    def avg_cost(self, symbol):
+        """Average cost per unit as a float price (0 for a closed position)."""
+        h = self.holdings[symbol]
+        if not h.quantity:
+            return 0.0
+        return to_float(h.cost) / to_float(h.quantity, QUANTITY_SCALE)
+
+    def position(self, symbol):
+        """Float view of one holding for display."""
+        h = self.holdings[symbol]
+        return {
+            "quantity": to_float(h.quantity, QUANTITY_SCALE),
+            "avg_cost": self.avg_cost(symbol),
+            "cost": to_float(h.cost),
+            "dividend_total": to_float(h.dividend_total),
+            "realized_gain": to_float(h.realized_gain),
+        }
+
     def process_valuation(self, date):
         print("process_valuation", date)
         valuation = 0
-        for symbol, h in self.holdings.items():
+        # 청산된 종목은 평가액이 0 이므로 건너뛴다
+        for symbol, h in self.active_holdings():
+            quantity = to_float(h.quantity, QUANTITY_SCALE)
             price = price_lookup(self.db, symbol, date)
             if price:
                 # print("[portfolio_service], price found", date, symbol, price)
-                valuation += float(h["quantity"]) * price
+                valuation += quantity * price
             else:
                 # print("[portfolio_service], price NOT found", date, symbol)
-                valuation += float(h["quantity"]) * float(h["avg_cost"])
+                valuation += to_float(h.cost)
         return valuation
 
     def print_holdings(self):
@@ -101,10 +179,34 @@ class Portfolio:
             print("No holdings")
             return
 
-        for symbol, h in self.holdings.items():
+        for symbol in self.holdings:
+            p = self.position(symbol)
             print(
                 f"Symbol: {symbol}, "
-                f"Quantity: {h['quantity']}, "
-                f"Avg Cost: {h['avg_cost']:.2f}"
+                f"Quantity: {p['quantity']}, "
+                f"Avg Cost: {p['avg_cost']:.2f}"
             )
         print("==========================")
+
+
+# 거래 유형별 처리 (값은 이미 고정소수점 정수)
+_HANDLERS = {
+    TransactionType.DEPOSIT: lambda p, tx: p.deposit(tx.amount),
+    TransactionType.FX_DEPOSIT: lambda p, tx: p.deposit(tx.amount),
+    TransactionType.WITHDRAWAL: lambda p, tx: p.withdraw(tx.amount),
+    TransactionType.FX_WITHDRAWAL: lambda p, tx: p.withdraw(tx.amount),
+    TransactionType.BUY: lambda p, tx: p.buy(
+        tx.amount, tx.symbol, tx.quantity, tx.price
+    ),
+    TransactionType.SELL: lambda p, tx: p.sell(
+        tx.amount, tx.symbol, tx.quantity, tx.price
+    ),
+    TransactionType.TAX_FEE: lambda p, tx: p.process_tax_fee(tx.amount),
+    TransactionType.INTEREST: lambda p, tx: p.process_interest(tx.amount),
+    TransactionType.DIVIDEND: lambda p, tx: p.process_dividend(
+        tx.amount, tx.symbol, tx.date
+    ),
+    TransactionType.VESTING: lambda p, tx: p.process_vesting(
+        tx.amount, tx.symbol, tx.quantity, tx.price
+    ),
+}
@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+
+PRICE_CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", "512"))
+PRICE_CACHE_MAX_BYTES = int(os.getenv("PRICE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class PriceCache:
+    """Bounded LRU of per-ticker price indexes shared by request threads.
+
+    Entries are (ticker_id, PriceIndex) keyed by symbol. Only one thread
+    populates a given symbol at a time; others wait for it and then hit.
+    """
+
+    def __init__(
+        self, max_entries=PRICE_CACHE_MAX_ENTRIES, max_bytes=PRICE_CACHE_MAX_BYTES
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}  # symbol -> 해당 심볼을 로드 중인 스레드들이 공유하는 락
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup(self, symbol):
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                self._entries.move_to_end(symbol)
+                self.hits += 1
+            return entry
+
+    def get(self, symbol):
+        entry = self._lookup(symbol)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+        return entry
+
+    def get_or_load(self, symbol, loader):
+        """Cached entry for symbol, calling loader() once on a miss."""
+        entry = self._lookup(symbol)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            self.misses += 1
+            key_lock = self._loading.setdefault(symbol, threading.Lock())
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(symbol)
+            if entry is None:
+                entry = loader()
+                self.put(symbol, entry)
+        with self._lock:
+            self._loading.pop(symbol, None)
+        return entry
+
+    def put(self, symbol, entry):
+        with self._lock:
+            self._entries[symbol] = entry
+            self._entries.move_to_end(symbol)
+            self._evict()
+
+    def patch(self, symbol, bars):
+        """Merge freshly ingested bars into a cached index, if it is cached."""
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None:
+                entry[1].insert(bars)
+                self._evict()
+        return entry is not None
+
+    def invalidate(self, symbol=None):
+        """Drop one symbol (or everything) so the next lookup reloads it."""
+        with self._lock:
+            if symbol is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(symbol, None) is not None:
+                self.invalidations += 1
+
+    def _nbytes(self):
+        return sum(index.nbytes for _, index in self._entries.values())
+
+    def _evict(self):
+        # 가장 최근에 쓴 항목 하나는 예산을 넘더라도 남겨둔다
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._nbytes() > self.max_bytes
+        ):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __contains__(self, symbol):
+        with self._lock:
+            return symbol in self._entries
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._nbytes(),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,168 @@
+import numpy as np
+
+_NO_DATES = np.array([], dtype="datetime64[D]")
+_NO_CLOSES = np.array([], dtype=np.float64)
+
+
+def _to_day(date):
+    return np.datetime64(date, "D")
+
+
+def _merge(old_dates, old_closes, dates, closes):
+    """Sorted union of two bar sets; on equal dates the second one wins."""
+    dates = np.concatenate([old_dates, dates])
+    closes = np.concatenate([old_closes, closes])
+    order = np.argsort(dates, kind="stable")
+    dates = dates[order]
+    closes = closes[order]
+    # stable sort keeps the newer bar last among equal dates
+    keep = np.append(dates[1:] != dates[:-1], True)
+    return dates[keep], closes[keep]
+
+
+class PriceIndex:
+    """Per-ticker as-of index: sorted trading dates and their closes.
+
+    Lookups are a binary search over the date array, so a warmed-up index
+    answers "last close on or before D" without touching the database.
+    All arrays live in one tuple that insert() swaps in a single
+    assignment, so a concurrent reader never sees a half-patched index.
+
+    A read-only base (the shared memory maps of the columnar store) is never
+    copied: bars inserted later go to a small overlay next to it, which
+    lookups consult as well and which wins on equal dates.
+    """
+
+    def __init__(self, dates=None, closes=None):
+        dates = np.asarray(dates if dates is not None else [], dtype="datetime64[D]")
+        closes = np.asarray(closes if closes is not None else [], dtype=np.float64)
+        order = np.argsort(dates, kind="stable")
+        self._arrays = (dates[order], closes[order], _NO_DATES, _NO_CLOSES, 0)
+
+    @classmethod
+    def from_sorted(cls, dates, closes):
+        """Wrap already sorted arrays as-is, e.g. read-only memory maps."""
+        index = cls.__new__(cls)
+        index._arrays = (dates, closes, _NO_DATES, _NO_CLOSES, 0)
+        return index
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (date, close) pairs, skipping empty or NaN closes."""
+        rows = [(d, float(c)) for d, c in rows if d is not None and c is not None]
+        rows = [(d, c) for d, c in rows if not np.isnan(c)]
+        return cls([d for d, _ in rows], [c for _, c in rows])
+
+    def _merged(self):
+        dates, closes, extra_dates, extra_closes, _ = self._arrays
+        if not len(extra_dates):
+            return dates, closes
+        return _merge(dates, closes, extra_dates, extra_closes)
+
+    @property
+    def dates(self):
+        return self._merged()[0]
+
+    @property
+    def closes(self):
+        return self._merged()[1]
+
+    @property
+    def overlay_size(self):
+        """Bars held beside a read-only base (0 once the store is regenerated)."""
+        return len(self._arrays[2])
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self._arrays[:4])
+
+    def __len__(self):
+        dates, _, extra_dates, _, duplicates = self._arrays
+        return len(dates) + len(extra_dates) - duplicates
+
+    @property
+    def first_date(self):
+        dates, _, extra_dates, _, _ = self._arrays
+        firsts = [d[0] for d in (dates, extra_dates) if len(d)]
+        return min(firsts).astype(object) if firsts else None
+
+    @property
+    def last_date(self):
+        dates, _, extra_dates, _, _ = self._arrays
+        lasts = [d[-1] for d in (dates, extra_dates) if len(d)]
+        return max(lasts).astype(object) if lasts else None
+
+    def brackets(self, date):
+        """True when the index has bars on both sides of (or exactly on) date."""
+        if not len(self):
+            return False
+        day = _to_day(date)
+        return _to_day(self.first_date) <= day <= _to_day(self.last_date)
+
+    def window(self, start, end):
+        """Sorted dates within [start, end] plus the nearest bar on either side."""
+        lo_day, hi_day = _to_day(start), _to_day(end)
+        dates, _, extra_dates, _, _ = self._arrays
+        parts = []
+        for d in (dates, extra_dates):
+            lo = np.searchsorted(d, lo_day, side="left")
+            hi = np.searchsorted(d, hi_day, side="right")
+            parts.append(d[max(lo - 1, 0) : hi + 1])
+        merged = np.unique(np.concatenate(parts))
+        lo = np.searchsorted(merged, lo_day, side="left")
+        hi = np.searchsorted(merged, hi_day, side="right")
+        return merged[max(lo - 1, 0) : hi + 1]
+
+    def as_of(self, date):
+        """Last close on or before date, or None when date precedes every bar."""
+        dates, closes, extra_dates, _, _ = self._arrays
+        if not len(extra_dates):
+            i = int(np.searchsorted(dates, _to_day(date), side="right")) - 1
+            return float(closes[i]) if i >= 0 else None
+        value = self.as_of_many([_to_day(date)])[0]
+        return None if np.isnan(value) else float(value)
+
+    def as_of_many(self, dates):
+        """Vectorized as_of over many dates; NaN where a date precedes every bar."""
+        stored, closes, extra_dates, extra_closes, _ = self._arrays
+        days = np.asarray(dates, dtype="datetime64[D]")
+        result = _as_of(stored, closes, days)
+        if not len(extra_dates):
+            return result
+        j = np.searchsorted(extra_dates, days, side="right") - 1
+        i = np.searchsorted(stored, days, side="right") - 1
+        # overlay 의 봉이 기준 봉과 같은 날이거나 더 최근이면 overlay 값을 쓴다
+        newer = j >= 0
+        if len(stored):
+            newer &= (i < 0) | (
+                extra_dates[np.maximum(j, 0)] >= stored[np.maximum(i, 0)]
+            )
+        return np.where(newer, extra_closes[np.maximum(j, 0)], result)
+
+    def insert(self, rows):
+        """Patch new (date, close) bars in; a new bar replaces an old one."""
+        new = PriceIndex.from_rows(rows)
+        if not len(new):
+            return
+        dates, closes, extra_dates, extra_closes, _ = self._arrays
+        if dates.flags.writeable:
+            dates, closes = _merge(dates, closes, new.dates, new.closes)
+            self._arrays = (dates, closes, _NO_DATES, _NO_CLOSES, 0)
+            return
+        extra_dates, extra_closes = _merge(
+            extra_dates, extra_closes, new.dates, new.closes
+        )
+        i = np.searchsorted(dates, extra_dates)
+        duplicates = int(
+            np.count_nonzero(dates[np.minimum(i, len(dates) - 1)] == extra_dates)
+            if len(dates)
+            else 0
+        )
+        self._arrays = (dates, closes, extra_dates, extra_closes, duplicates)
+
+
+def _as_of(dates, closes, days):
+    if not len(closes):
+        return np.full(days.shape, np.nan)
+    i = np.searchsorted(dates, days, side="right") - 1
+    return np.where(i >= 0, closes[np.maximum(i, 0)], np.nan)
@@ -0,0 +1,45 @@
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models.price import Price
+
+PROVIDER_COLUMNS = {
+    "Close": "close",
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Volume": "volume",
+}
+# SQLite 바인드 변수 한도를 넘지 않도록 나눠서 넣는다
+UPSERT_CHUNK_ROWS = 500
+
+
+def price_records(ticker_id: int, df):
+    """Provider OHLCV frame -> list of prices rows, built column-wise."""
+    if df is None or df.empty or "Close" not in df.columns:
+        return []
+    frame = df.reindex(columns=list(PROVIDER_COLUMNS)).rename(columns=PROVIDER_COLUMNS)
+    frame = frame[frame["close"].notna()]
+    frame = frame.astype(object).where(frame.notna(), None)
+    frame.insert(0, "date", frame.index.date)
+    frame.insert(0, "ticker_id", ticker_id)
+    return frame.to_dict("records")
+
+
+def upsert_price_records(db, records):
+    """INSERT ... ON CONFLICT (ticker_id, date) DO UPDATE for prepared rows."""
+    for i in range(0, len(records), UPSERT_CHUNK_ROWS):
+        stmt = sqlite_insert(Price).values(records[i : i + UPSERT_CHUNK_ROWS])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ticker_id", "date"],
+            set_={c: stmt.excluded[c] for c in PROVIDER_COLUMNS.values()},
+        )
+        db.execute(stmt)
+    db.commit()
+
+
+def upsert_prices(db, ticker_id: int, df):
+    """Bulk upsert a provider frame; returns the (date, close) bars written."""
+    records = price_records(ticker_id, df)
+    if records:
+        upsert_price_records(db, records)
+    return [(r["date"], r["close"]) for r in records]
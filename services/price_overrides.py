@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date as date_type
+
+import numpy as np
+
+from models.price_override import PriceOverride
+
+_overrides = {}  # symbol -> (effective_from 목록, [(from, to, price)]) from 순 정렬
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_overrides(db):
+    """(Re)load every override row into the per-symbol as-of table."""
+    global _overrides, _loaded
+    by_symbol = defaultdict(list)
+    for row in db.query(PriceOverride).all():
+        start = row.effective_from or date_type.min
+        by_symbol[row.symbol].append((start, row.effective_to, float(row.price)))
+    overrides = {}
+    for symbol, rows in by_symbol.items():
+        rows.sort(key=lambda r: r[0])
+        overrides[symbol] = ([r[0] for r in rows], rows)
+    with _lock:
+        _overrides = overrides
+        _loaded = True
+    return sum(len(rows) for _, rows in overrides.values())
+
+
+def override_price(db, symbol, date=None):
+    """Manual price for symbol on date (default today), or None.
+
+    When periods overlap the one that started most recently wins; no
+    provider is consulted for a symbol/date an override covers.
+    """
+    if not _loaded and db is not None:
+        load_overrides(db)
+    entry = _overrides.get(symbol)
+    if entry is None:
+        return None
+    date = date or date_type.today()
+    starts, rows = entry
+    for start, end, price in reversed(rows[: bisect_right(starts, date)]):
+        if end is None or date <= end:
+            return price
+    return None
+
+
+def override_series(db, symbol, days):
+    """Vectorized override_price over a datetime64[D] array; NaN where uncovered."""
+    if not _loaded and db is not None:
+        load_overrides(db)
+    days = np.asarray(days, dtype="datetime64[D]")
+    prices = np.full(days.shape, np.nan)
+    entry = _overrides.get(symbol)
+    if entry is None:
+        return prices
+    # from 순으로 덮어쓰므로 겹치는 구간은 나중에 시작한 쪽이 남는다
+    for start, end, price in entry[1]:
+        covered = days >= np.datetime64(start, "D")
+        if end is not None:
+            covered &= days <= np.datetime64(end, "D")
+        prices[covered] = price
+    return prices
+
+
+def set_override(db, symbol, price, effective_from=None, effective_to=None, note=None):
+    """Add an override row and reload the table so it applies immediately."""
+    db.add(
+        PriceOverride(
+            symbol=symbol,
+            price=price,
+            effective_from=effective_from,
+            effective_to=effective_to,
+            note=note,
+        )
+    )
+    db.commit()
+    load_overrides(db)
+    _prices_changed(db, symbol, effective_from)
+
+
+def _prices_changed(db, symbol, from_date):
+    # account_daily_values 가 replay_engine 을 거쳐 이 모듈을 import 한다
+    from services.account_daily_values import prices_changed
+
+    prices_changed(db, symbol, from_date)
+
+
+def retire_overrides(db, symbols, covered_from):
+    """Drop open-ended overrides of symbols that start on or after covered_from.
+
+    Used once a pricing source (e.g. the bond model's yield curve) covers
+    those dates; returns the rows removed.
+    """
+    if not symbols:
+        return 0
+    deleted = (
+        db.query(PriceOverride)
+        .filter(
+            PriceOverride.symbol.in_(list(symbols)),
+            PriceOverride.effective_to.is_(None),
+            PriceOverride.effective_from >= covered_from,
+        )
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    load_overrides(db)
+    if deleted:
+        for symbol in symbols:
+            _prices_changed(db, symbol, covered_from)
+    return deleted
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from db import SessionLocal
+from models.transactions import TransactionType
+from services.market_data_service import ensure_price_coverage
+from services.money import quantity
+
+PREFETCH_WORKERS = int(os.getenv("PRICE_PREFETCH_WORKERS", "8"))
+
+
+def symbol_date_ranges(transactions, end_date):
+    """(start, end) replay span per symbol, from its first transaction to
+    end_date, or to the day the position went to zero if it is closed."""
+    first, held, changed = {}, {}, {}
+    for tx in sorted(transactions, key=lambda t: (t.date, t.id)):
+        if not tx.symbol:
+            continue
+        first.setdefault(tx.symbol, tx.date)
+        held.setdefault(tx.symbol, 0)
+        if tx.type in (TransactionType.BUY, TransactionType.VESTING):
+            held[tx.symbol] += quantity(tx.quantity or 0)
+        elif tx.type == TransactionType.SELL:
+            held[tx.symbol] -= quantity(tx.quantity or 0)
+        else:
+            continue
+        changed[tx.symbol] = tx.date
+    # 청산한 종목은 마지막 매도일 이후 가격이 필요 없다
+    return {
+        symbol: (
+            start,
+            end_date if held[symbol] > 0 else changed.get(symbol, start),
+        )
+        for symbol, start in first.items()
+    }
+
+
+def _warm(session_factory, symbol, start, end):
+    # 세션은 스레드 간에 공유할 수 없으므로 작업마다 새로 연다
+    db = session_factory()
+    try:
+        ensure_price_coverage(db, symbol, start, end)
+    except Exception as e:
+        print(f"[ERROR] Failed to prefetch {symbol}: {e}")
+    finally:
+        db.close()
+
+
+def prefetch_prices(ranges, max_workers=PREFETCH_WORKERS, session_factory=None):
+    """Warm the price store for every {symbol: (start, end)} concurrently.
+
+    Each symbol is fetched on its own worker, so a cold account costs about
+    as long as its slowest symbol instead of the sum of all of them.
+    """
+    if not ranges:
+        return
+    session_factory = session_factory or SessionLocal
+    workers = max(1, min(max_workers, len(ranges)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_warm, session_factory, symbol, start, end)
+            for symbol, (start, end) in ranges.items()
+        ]
+        for future in futures:
+            future.result()
+
+
+def prefetch_account_prices(transactions, end_date, **kwargs):
+    prefetch_prices(symbol_date_ranges(transactions, end_date), **kwargs)
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import numpy as np
+
+# 거래소 휴장이 이보다 길게 이어지는 경우는 없으므로, 더 긴 공백은 누락 구간으로 본다
+MAX_GAP_DAYS = 7
+# 누락 구간 사이가 이 정도로 가까우면 한 번의 다운로드로 합친다
+MERGE_GAP_DAYS = 30
+
+
+def _has_session(calendar, start, end):
+    # 달력이 없으면 주말만 휴장으로 본다
+    if calendar is None:
+        return bool(np.busday_count(start, end + timedelta(days=1)))
+    return calendar.has_session(start, end)
+
+
+def missing_ranges(index, start, end, max_gap_days=MAX_GAP_DAYS, calendar=None):
+    """Date ranges inside [start, end] that the index has no bars for.
+
+    Ranges without a single trading session of calendar (e.g. a holiday
+    weekend after the last bar) are dropped rather than downloaded.
+    """
+    if start > end:
+        return []
+    if not len(index):
+        return [(start, end)] if _has_session(calendar, start, end) else []
+
+    ranges = []
+    first, last = index.first_date, index.last_date
+
+    if start < first:
+        ranges.append((start, min(end, first - timedelta(days=1))))
+
+    window = index.window(start, end)
+    gaps = np.flatnonzero(np.diff(window).astype(np.int64) > max_gap_days)
+    for i in gaps:
+        gap_start = window[i].astype(object) + timedelta(days=1)
+        gap_end = window[i + 1].astype(object) - timedelta(days=1)
+        ranges.append((max(start, gap_start), min(end, gap_end)))
+
+    if end > last:
+        ranges.append((max(start, last + timedelta(days=1)), end))
+
+    return [(s, e) for s, e in ranges if s <= e and _has_session(calendar, s, e)]
+
+
+def merge_ranges(ranges, merge_gap_days=MERGE_GAP_DAYS):
+    """Merge sorted or unsorted ranges whose gap is at most merge_gap_days."""
+    merged = []
+    for s, e in sorted(ranges):
+        if merged and (s - merged[-1][1]).days <= merge_gap_days:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
+
+
+def plan_fetches(index, start, end, skip=None, calendar=None):
+    """Fewest provider calls that fill every gap of the index in [start, end].
+
+    Ranges for which skip(range) is true (e.g. known empty) are left out
+    before merging, so they never widen a planned download.
+    """
+    ranges = missing_ranges(index, start, end, calendar=calendar)
+    if skip is not None:
+        ranges = [r for r in ranges if not skip(r)]
+    return merge_ranges(ranges)
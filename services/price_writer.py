@@ -0,0 +1,144 @@
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from sqlalchemy.orm import Session
+
+from models.tickers import Ticker
+from services.price_ingest import upsert_price_records
+
+PRICE_WRITER_MAX_ROWS = int(os.getenv("PRICE_WRITER_MAX_ROWS", "20000"))
+# 첫 배치가 들어온 뒤 다른 배치를 모아 함께 쓰기 위해 기다리는 시간
+PRICE_WRITER_LINGER = float(os.getenv("PRICE_WRITER_LINGER_MS", "20")) / 1000
+
+
+@dataclass
+class PriceWrite:
+    symbol: str
+    ticker_id: int
+    records: list = field(default_factory=list)  # price_records() 결과
+    synced_at: datetime = None  # 최신 봉까지 받았으면 tickers 동기화 상태도 갱신
+    last_bar_date: date = None
+    bind: object = None  # writer 가 채운다: 이 배치가 커밋된 엔진 (콜백용)
+
+
+class PriceWriter:
+    """Single background thread that owns every write to the prices table.
+
+    Request threads submit() and return immediately; the writer drains the
+    queue, merges what piled up into one upsert transaction per database
+    and calls on_durable(write) for each batch after the commit, or
+    on_failed(write, error) when it could not be written. write.bind is
+    the engine it went to, for callbacks that need a session.
+    """
+
+    def __init__(self, on_durable=None, on_failed=None, max_rows=PRICE_WRITER_MAX_ROWS):
+        self.on_durable = on_durable
+        self.on_failed = on_failed
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.transactions = 0
+        self.rows = 0
+
+    def submit(self, db, write):
+        """Queue a write for the database db is bound to."""
+        self._ensure_started()
+        self._queue.put((db.get_bind(), write))
+
+    def flush(self):
+        """Block until everything submitted so far is durable (or failed)."""
+        self._queue.join()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name="price-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _drain(self):
+        items = [self._queue.get()]
+        rows = len(items[0][1].records)
+        deadline = time.monotonic() + PRICE_WRITER_LINGER
+        while rows < self.max_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    # 대기 시간이 지나도 이미 쌓여 있는 것은 같이 쓴다
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            rows += len(item[1].records)
+        return items
+
+    def _loop(self):
+        while True:
+            items = self._drain()
+            try:
+                by_bind = {}
+                for bind, write in items:
+                    by_bind.setdefault(bind, []).append(write)
+                for bind, writes in by_bind.items():
+                    self._write(bind, writes)
+            except Exception as e:
+                print(f"[price_writer] batch of {len(items)} writes aborted: {e}")
+            finally:
+                # flush() 가 멈추지 않도록 무슨 일이 있어도 완료 처리한다
+                for _ in items:
+                    self._queue.task_done()
+
+    def _write(self, bind, writes):
+        # 같은 (ticker_id, date)가 여러 번 들어왔으면 나중 것만 쓴다
+        merged = {}
+        for write in writes:
+            write.bind = bind
+            for record in write.records:
+                merged[(record["ticker_id"], record["date"])] = record
+        try:
+            with Session(bind=bind) as db:
+                for write in writes:
+                    if write.synced_at is not None:
+                        db.query(Ticker).filter(Ticker.id == write.ticker_id).update(
+                            {
+                                "last_synced_at": write.synced_at,
+                                "last_bar_date": write.last_bar_date,
+                            }
+                        )
+                upsert_price_records(db, list(merged.values()))
+        except Exception as e:
+            print(f"[price_writer] failed to write {len(writes)} batches: {e}")
+            for write in writes:
+                self._notify(self.on_failed, write, e)
+            return
+        self.batches += len(writes)
+        self.transactions += 1
+        self.rows += len(merged)
+        for write in writes:
+            self._notify(self.on_durable, write)
+
+    def _notify(self, callback, write, *args):
+        # 콜백 하나가 실패해도 나머지 콜백과 writer 스레드는 계속 간다
+        if callback is None:
+            return
+        try:
+            callback(write, *args)
+        except Exception as e:
+            print(f"[price_writer] callback failed for {write.symbol}: {e}")
+
+    def stats(self):
+        return {
+            "pending": self._queue.unfinished_tasks,
+            "batches": self.batches,
+            "transactions": self.transactions,
+            "rows": self.rows,
+        }
@@ -0,0 +1,51 @@
+from services.instrument_registry import get_instrument, update_instrument
+from services.market_data_provider import BOND_MODEL, FDR, YFINANCE, get_override
+from services.trading_calendar import KRX_EXCHANGES, is_krx_symbol
+
+PROVIDERS = {p.name: p for p in (FDR, YFINANCE, BOND_MODEL)}
+
+
+def _is_krx(symbol, exchange):
+    if exchange:
+        return exchange.upper() in KRX_EXCHANGES
+    return is_krx_symbol(symbol)
+
+
+def _yahoo_symbol(symbol, exchange):
+    # 야후는 한국 종목에 거래소 접미사가 필요하다 (코스피 .KS, 코스닥 .KQ)
+    if "." in symbol or not _is_krx(symbol, exchange):
+        return symbol
+    if exchange and exchange.upper() == "KOSDAQ":
+        return f"{symbol}.KQ"
+    return f"{symbol}.KS"
+
+
+def candidates(symbol: str):
+    """Every (provider, provider_symbol) pair that can serve symbol."""
+    instrument = get_instrument(symbol)
+    if instrument.pricing_model == BOND_MODEL.name:
+        return [(BOND_MODEL, symbol)]
+    return [(FDR, symbol), (YFINANCE, _yahoo_symbol(symbol, instrument.exchange))]
+
+
+def route(symbol: str):
+    """Ordered (provider, provider_symbol) pairs for bars and latest closes.
+
+    The provider that last answered for this symbol (tickers.provider_hint)
+    goes first, so a symbol FDR cannot serve stops paying for a failed
+    FDR round-trip before every fallback.
+    """
+    override = get_override()
+    if override is not None:
+        return [(override, symbol)]
+    pairs = candidates(symbol)
+    hint = get_instrument(symbol).provider_hint
+    return sorted(pairs, key=lambda pair: pair[0].name != hint)
+
+
+def record_success(db, symbol: str, provider):
+    """Remember the provider that answered so the next lookup starts there."""
+    if db is None or get_override() is not None or provider.name not in PROVIDERS:
+        return
+    if get_instrument(symbol).provider_hint != provider.name:
+        update_instrument(db, symbol, provider_hint=provider.name)
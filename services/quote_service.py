@@ -0,0 +1,76 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+from models.price import RealTimePrice
+from services.negative_cache import is_known_miss, record_miss
+from services.provider_router import record_success, route
+from services.resilience import TRANSIENT_ERRORS, CircuitOpenError
+from services.ticker_service import get_or_create_ticker
+
+QUOTE_TTL = timedelta(seconds=int(os.getenv("QUOTE_TTL_SECONDS", "300")))
+
+_quotes = {}  # symbol -> (price, fetched_at)
+_lock = threading.Lock()
+
+
+def fetch_last_bar(db, symbol: str):
+    """Latest close from the providers, or None if nobody has it."""
+    for provider, provider_symbol in route(symbol):
+        if is_known_miss(db, provider.name, provider_symbol):
+            continue
+        try:
+            price = provider.last_close(provider_symbol)
+        except (CircuitOpenError, *TRANSIENT_ERRORS) as e:
+            # 일시적인 장애는 negative cache에 남기지 않는다
+            print(f"[WARN] {provider.name} unavailable for {provider_symbol}: {e}")
+            continue
+        except Exception as e:
+            print(f"[WARN] {provider.name} failed for {provider_symbol}: {e}")
+            record_miss(db, provider.name, provider_symbol, reason=str(e))
+            continue
+        if price is not None:
+            print("price found, ", symbol, ":", price)
+            record_success(db, symbol, provider)
+            return price
+        record_miss(db, provider.name, provider_symbol, reason="empty")
+
+    print(f"[ERROR] Failed to fetch price for {symbol}")
+    return None
+
+
+def get_latest_quote(db, symbol: str, ttl: timedelta = QUOTE_TTL):
+    """Latest price served from memory, then realtime_prices, then providers."""
+    now = datetime.utcnow()
+    with _lock:
+        cached = _quotes.get(symbol)
+    if cached and now - cached[1] < ttl:
+        return cached[0]
+
+    ticker_id = None
+    if db is not None:
+        ticker_id = get_or_create_ticker(db, symbol).id
+        row = (
+            db.query(RealTimePrice)
+            .filter(
+                RealTimePrice.ticker_id == ticker_id,
+                RealTimePrice.timestamp >= now - ttl,
+            )
+            .order_by(RealTimePrice.timestamp.desc())
+            .first()
+        )
+        if row and row.price is not None:
+            with _lock:
+                _quotes[symbol] = (float(row.price), row.timestamp)
+            return float(row.price)
+
+    price = fetch_last_bar(db, symbol)
+    if price is None:
+        return None
+
+    with _lock:
+        _quotes[symbol] = (price, now)
+    if ticker_id is not None:
+        db.add(RealTimePrice(ticker_id=ticker_id, timestamp=now, price=price))
+        db.commit()
+    return price
@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from services.account_checkpoints import (
+    checkpoint_holdings,
+    day_digests,
+    load_checkpoint,
+    restore_portfolio,
+    save_checkpoint,
+    snapshot,
+)
+from services.instrument_registry import ensure_loaded
+from services.market_data_service import load_price_index, not_searchable_symbol
+from services.money import QUANTITY_SCALE, money, to_float
+from services.portfolio_service import Portfolio
+from services.price_overrides import override_series
+
+
+@dataclass
+class Replay:
+    """Daily account series on trading sessions, plus the final ledger."""
+
+    timestamps: list
+    cash: np.ndarray
+    invest: np.ndarray
+    valuation: np.ndarray
+    returns: np.ndarray
+    capital_gain: np.ndarray
+    interest_income: np.ndarray
+    dividend_income: np.ndarray
+    total_income: np.ndarray
+    portfolio: Portfolio
+
+
+@dataclass
+class Ledger:
+    """Account state after each transaction day (one row per distinct date)."""
+
+    days: np.ndarray  # datetime64[D]
+    symbols: list
+    quantities: np.ndarray  # days x symbols, QUANTITY_SCALE units
+    costs: np.ndarray  # days x symbols, 보유분의 총 매입원가 (AMOUNT_SCALE units)
+    cash: np.ndarray
+    invest: np.ndarray
+    capital_gain: np.ndarray
+    interest: np.ndarray
+    dividend: np.ndarray
+    portfolio: Portfolio
+
+
+def build_ledger(db, transactions, account_id=None, start=None):
+    """Run the ledger once per transaction and keep a row per transaction day.
+
+    transactions are LedgerTransaction rows (see
+    services.transaction_service.ledger_transactions), so everything stays
+    in the ledger's fixed-point ints. The transaction loop
+    only does int arithmetic; at the end of each day the cash/income totals
+    and the quantity and cost basis of the symbols it touched are written
+    to the day's row, and untouched cells are forward-filled afterwards.
+
+    With an account_id the state after the last day is checkpointed. When
+    only sessions on or after start are needed and the checkpoint is still
+    valid and no later than start, the ledger starts from it: its day is
+    the first row and only later transactions are applied.
+    """
+    symbols = list(dict.fromkeys(tx.symbol for tx in transactions if tx.symbol))
+    column = {symbol: j for j, symbol in enumerate(symbols)}
+    days = list(dict.fromkeys(tx.date for tx in transactions))
+
+    checkpoint = None
+    if account_id is not None:
+        digests = day_digests(transactions)
+        checkpoint = load_checkpoint(db, account_id, days, digests)
+    stored = checkpoint
+    # 체크포인트보다 이른 세션을 평가하려면 처음부터 다시 돌려야 한다
+    if checkpoint is not None and (start is None or start < checkpoint.date):
+        checkpoint = None
+    skip = days.index(checkpoint.date) if checkpoint is not None else 0
+    days = days[skip:]
+
+    n, m = len(days), len(symbols)
+    held = np.zeros((n, m), dtype=np.int64)
+    costs = np.zeros((n, m), dtype=np.int64)
+    touched = np.zeros((n, m), dtype=bool)
+    scalars = np.zeros((n, 5), dtype=np.int64)
+
+    portfolio = Portfolio(db)
+    if checkpoint is not None:
+        scalars[0] = [
+            money(checkpoint.cash),
+            money(checkpoint.invest),
+            money(checkpoint.capital_gain),
+            money(checkpoint.interest),
+            money(checkpoint.dividend),
+        ]
+        for symbol, h in checkpoint_holdings(checkpoint).items():
+            held[0, column[symbol]] = h.quantity
+            costs[0, column[symbol]] = h.cost
+            touched[0, column[symbol]] = True
+        portfolio = restore_portfolio(db, checkpoint)
+    resumed = skip + (checkpoint is not None)
+
+    today = set()
+    holdings = portfolio.holdings
+    for i, (row, tx) in enumerate(_rows(transactions)):
+        if row < resumed:
+            continue
+        portfolio.apply(tx)
+        if tx.symbol:
+            today.add(tx.symbol)
+        if i + 1 < len(transactions) and transactions[i + 1].date == tx.date:
+            continue
+        # 하루의 마지막 거래 후 상태만 기록한다
+        row -= skip
+        scalars[row] = [
+            portfolio.cash,
+            portfolio.invest,
+            portfolio.capital_gain,
+            portfolio.interest,
+            portfolio.dividend,
+        ]
+        for symbol in today:
+            j = column[symbol]
+            h = holdings[symbol]
+            held[row, j] = h.quantity
+            costs[row, j] = h.cost
+            touched[row, j] = True
+        today.clear()
+    if account_id is not None and days and (stored is None or stored.date != days[-1]):
+        save_checkpoint(db, snapshot(account_id, days[-1], digests[-1], portfolio))
+
+    # 거래가 없던 날은 직전 거래일의 수량과 매입원가를 이어받는다
+    last = np.where(touched, np.arange(n)[:, None], -1)
+    last = np.maximum.accumulate(last, axis=0)
+    filled = last >= 0
+    last = np.maximum(last, 0)
+    held = np.where(filled, np.take_along_axis(held, last, 0), 0)
+    costs = np.where(filled, np.take_along_axis(costs, last, 0), 0)
+
+    return Ledger(
+        days=np.array(days, dtype="datetime64[D]"),
+        symbols=symbols,
+        quantities=held,
+        costs=costs,
+        cash=scalars[:, 0],
+        invest=scalars[:, 1],
+        capital_gain=scalars[:, 2],
+        interest=scalars[:, 3],
+        dividend=scalars[:, 4],
+        portfolio=portfolio,
+    )
+
+
+def _rows(transactions):
+    row = -1
+    current = None
+    for tx in transactions:
+        if tx.date != current:
+            row += 1
+            current = tx.date
+        yield row, tx
+
+
+def close_matrix(db, symbols, days):
+    """(days x symbols) as-of closes, NaN where no price is known.
+
+    Same precedence as price_lookup: a manual override first, then the
+    stored bars. Prices are expected to be prefetched already.
+    """
+    ensure_loaded(db)
+    closes = np.full((len(days), len(symbols)), np.nan)
+    for j, symbol in enumerate(symbols):
+        if not not_searchable_symbol(symbol):
+            _, index = load_price_index(db, symbol)
+            closes[:, j] = index.as_of_many(days)
+        override = override_series(db, symbol, days)
+        closes[:, j] = np.where(np.isnan(override), closes[:, j], override)
+    return closes
+
+
+def replay_account(db, transactions, end_date, calendar, account_id=None, start=None):
+    """Replay transactions (sorted by date, id) over every session to end_date.
+
+    With start, only sessions on or after it are evaluated, and the ledger
+    may resume from the account's checkpoint instead of the first transaction.
+    """
+    ledger = build_ledger(db, transactions, account_id, start)
+    first = transactions[0].date if start is None else max(start, transactions[0].date)
+    sessions = calendar.sessions(first, end_date)
+
+    # 각 거래일의 상태를 그 이후 세션까지 앞으로 채운다
+    rows = np.searchsorted(ledger.days, sessions, side="right") - 1
+    # 구간 안에서 보유한 적이 없는 (이미 정리한) 종목은 시세를 읽지 않는다
+    quantities = ledger.quantities[rows]
+    costs = ledger.costs[rows]
+    live = (quantities != 0).any(axis=0) | (costs != 0).any(axis=0)
+    symbols = [s for s, keep in zip(ledger.symbols, live) if keep]
+    # 시장가(float)와 곱하는 여기서부터가 표시 단위다
+    quantities = to_float(quantities[:, live], QUANTITY_SCALE)
+    closes = close_matrix(db, symbols, sessions)
+    # 가격을 모르는 날은 매입원가로 평가한다
+    held_values = np.where(
+        np.isnan(closes), to_float(costs[:, live]), quantities * closes
+    )
+    valuation = held_values.sum(axis=1)
+
+    invest = to_float(ledger.invest[rows])
+    safe = np.where(invest == 0, 1.0, invest)
+    returns = np.where(invest == 0, 0.0, (valuation - invest) / safe * 100)
+
+    capital_gain = to_float(ledger.capital_gain[rows])
+    interest = to_float(ledger.interest[rows])
+    dividend = to_float(ledger.dividend[rows])
+    return Replay(
+        timestamps=np.datetime_as_string(sessions, unit="D").tolist(),
+        cash=to_float(ledger.cash[rows]),
+        invest=invest,
+        valuation=valuation,
+        returns=returns,
+        capital_gain=capital_gain,
+        interest_income=interest,
+        dividend_income=dividend,
+        total_income=capital_gain + interest + dividend,
+        portfolio=ledger.portfolio,
+    )
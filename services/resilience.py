@@ -0,0 +1,209 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from http.client import HTTPException
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling out while a provider's circuit is open."""
+
+
+@dataclass
+class ProviderPolicy:
+    timeout: float = 15.0  # 초
+    retries: int = 1
+    backoff_base: float = 0.5
+    backoff_max: float = 4.0
+    failure_threshold: int = 5
+    reset_after: float = 60.0
+
+
+PROVIDER_POLICIES = {
+    "fdr": ProviderPolicy(timeout=float(os.getenv("FDR_TIMEOUT_SECONDS", "20"))),
+    "yfinance": ProviderPolicy(
+        timeout=float(os.getenv("YFINANCE_TIMEOUT_SECONDS", "10"))
+    ),
+    "fx_api": ProviderPolicy(timeout=8.0, retries=2),
+}
+DEFAULT_POLICY = ProviderPolicy()
+# 제공처 장애로 보는 예외 (requests 의 연결/HTTP 오류도 OSError 다). 종목 없음,
+# 데이터 없음 같은 나머지 예외는 종목 문제라 재시도하지도, 차단기에 세지도 않는다
+TRANSIENT_ERRORS = (TimeoutError, OSError, HTTPException)
+# 타임아웃을 걸기 위해 외부 호출은 이 풀에서 실행한다
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PROVIDER_MAX_CONCURRENCY", "16")),
+    thread_name_prefix="provider",
+)
+
+
+def policy_for(name):
+    return PROVIDER_POLICIES.get(name, DEFAULT_POLICY)
+
+
+class CircuitBreaker:
+    """Opens after N consecutive failures; lets one trial call through later.
+
+    closed -> open after failure_threshold failures in a row; once
+    reset_after seconds pass, a single half-open trial decides whether it
+    closes again or stays open for another period.
+    """
+
+    def __init__(self, failure_threshold, reset_after):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_after:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_after or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def release(self):
+        """End a half-open trial that neither proved nor disproved the provider."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution and its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> [Event, result, exception]
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = [threading.Event(), None, None]
+        if not leader:
+            call[0].wait()
+            if call[2] is not None:
+                raise call[2]
+            return call[1]
+
+        try:
+            call[1] = fn()
+        except BaseException as e:
+            call[2] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call[0].set()
+        return call[1]
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_inflight = SingleFlight()
+
+
+def breaker_for(name):
+    with _breakers_lock:
+        if name not in _breakers:
+            policy = policy_for(name)
+            _breakers[name] = CircuitBreaker(
+                policy.failure_threshold, policy.reset_after
+            )
+        return _breakers[name]
+
+
+def call_with_timeout(fn, timeout):
+    """Run fn on the provider pool, raising TimeoutError after timeout seconds.
+
+    The worker thread cannot be killed, so a hung call keeps its pool slot
+    until the library gives up; the caller just stops waiting for it.
+    """
+    future = _executor.submit(fn)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise TimeoutError(f"no response within {timeout}s")
+
+
+def _backoff(policy, attempt):
+    # full jitter: 동시에 실패한 요청들이 같은 순간에 재시도하지 않도록
+    return random.uniform(0, min(policy.backoff_max, policy.backoff_base * 2**attempt))
+
+
+def _attempt(name, fn):
+    policy = policy_for(name)
+    breaker = breaker_for(name)
+    for attempt in range(policy.retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"{name} circuit is open")
+        try:
+            result = call_with_timeout(fn, policy.timeout)
+        except TRANSIENT_ERRORS:
+            breaker.record_failure()
+            if attempt == policy.retries:
+                raise
+            time.sleep(_backoff(policy, attempt))
+        except Exception:
+            breaker.release()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+def resilient_call(name, key, fn):
+    """Call fn() for provider name with timeout, retries and circuit breaking.
+
+    Only TRANSIENT_ERRORS are retried and counted toward the circuit; any
+    other exception (e.g. an unknown or delisted symbol) propagates at once.
+
+    Callers passing an equal key while a call is in flight wait for it and
+    share its result (or exception) instead of calling out again.
+    """
+    return _inflight.do((name, key), lambda: _attempt(name, fn))
+
+
+def provider_status():
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {
+        name: {"state": b.state, "consecutive_failures": b.failures}
+        for name, b in breakers.items()
+    }
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
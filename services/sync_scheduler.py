@@ -0,0 +1,306 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from datetime import time as dtime
+from zoneinfo import ZoneInfo
+
+from db import SessionLocal
+from models.account import Account, AccountType
+from models.synclog import SyncLog
+from models.transactions import Transaction
+from services import market_data_service
+from services.account_daily_values import refresh_daily_values
+from services.columnar_price_store import export_price_store, store_exists
+from services.instrument_registry import ensure_loaded
+from services.market_data_service import (
+    ensure_price_coverage,
+    load_price_index,
+    not_searchable_symbol,
+)
+from services.price_prefetch import PREFETCH_WORKERS
+from services.trading_calendar import KRX, NYSE
+from services.transaction_service import annotate_with_quantities_by_symbol
+
+# 거래소별 동기화 시각 (현지 시각). 장 마감 후 제공처에 종가가 반영될 시간을 둔다
+SYNC_SCHEDULE = {
+    "KRX": (KRX, ZoneInfo("Asia/Seoul"), dtime(16, 30)),
+    "NYSE": (NYSE, ZoneInfo("America/New_York"), dtime(17, 0)),
+}
+SYNC_ENABLED = os.getenv("PRICE_SYNC_SCHEDULER", "on") != "off"
+SYNC_POLL_SECONDS = 60
+# 실패한 실행은 이 시간이 지나면 다시 시도한다
+FAILED_RETRY = timedelta(minutes=30)
+
+_run_lock = threading.Lock()  # 한 번에 하나의 동기화만 실행
+_current = None  # 진행 중인 실행 정보
+
+
+def _to_utc(day, local_time, tz):
+    local = datetime.combine(day, local_time, tzinfo=tz)
+    return local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+def last_sync_due(exchange, now):
+    """UTC time of the most recent scheduled sync slot at or before now."""
+    calendar, tz, at = SYNC_SCHEDULE[exchange]
+    local = now.replace(tzinfo=ZoneInfo("UTC")).astimezone(tz)
+    day = local.date()
+    if not calendar.is_session(day) or local.time() < at:
+        day = calendar.previous_session(day - timedelta(days=1))
+    return _to_utc(day, at, tz)
+
+
+def next_sync_due(exchange, now):
+    """UTC time of the next scheduled sync slot after now."""
+    calendar, tz, at = SYNC_SCHEDULE[exchange]
+    local = now.replace(tzinfo=ZoneInfo("UTC")).astimezone(tz)
+    day = local.date()
+    if not calendar.is_session(day) or local.time() >= at:
+        day = calendar.next_session(day + timedelta(days=1))
+    return _to_utc(day, at, tz)
+
+
+def exchange_of(symbol):
+    return market_data_service.symbol_calendar(symbol).name
+
+
+def held_symbols(db):
+    """{symbol: first transaction date} for every position currently held."""
+    held = {}
+    accounts = db.query(Account).filter(Account.account_type == AccountType.STOCK)
+    for account in accounts.all():
+        transactions = (
+            db.query(Transaction).filter(Transaction.account_id == account.id).all()
+        )
+        first_dates = {}
+        for tx in transactions:
+            if tx.symbol:
+                first_dates[tx.symbol] = min(
+                    first_dates.get(tx.symbol, tx.date), tx.date
+                )
+        positions = annotate_with_quantities_by_symbol(transactions, account)
+        for symbol, info in positions.items():
+            if abs(info["quantity"]) < 1e-6 or not_searchable_symbol(symbol):
+                continue
+            first = first_dates[symbol]
+            held[symbol] = min(held.get(symbol, first), first)
+    return held
+
+
+def _sync_symbol(session_factory, symbol, start, end):
+    db = session_factory()
+    try:
+        ensure_price_coverage(db, symbol, start, end, refresh=True)
+        _, index = load_price_index(db, symbol)
+        if not len(index):
+            return False
+        market_data_service.scheduled_symbols.add(symbol)
+        return True
+    except Exception as e:
+        print(f"[sync_scheduler] {symbol} failed: {e}")
+        return False
+    finally:
+        db.close()
+
+
+def refresh_price_store(session_factory, symbols):
+    """Re-export synced symbols to the columnar store, if one is set up.
+
+    Cached indexes are dropped so the next lookup maps the new files
+    instead of keeping the downloaded bars in a private overlay.
+    """
+    if not symbols or not store_exists():
+        return 0
+    market_data_service.price_writer.flush()
+    db = session_factory()
+    try:
+        exported = export_price_store(db, symbols=symbols)
+    finally:
+        db.close()
+    for symbol in symbols:
+        market_data_service.price_cache.invalidate(symbol)
+    return exported
+
+
+def _run(exchange, session_factory):
+    global _current
+    db = session_factory()
+    log = SyncLog(exchange=exchange, status="running")
+    db.add(log)
+    db.commit()
+    started = time.monotonic()
+    try:
+        ensure_loaded(db)
+        held = {
+            symbol: first
+            for symbol, first in held_symbols(db).items()
+            if exchange is None or exchange_of(symbol) == exchange
+        }
+        _current = {
+            "exchange": exchange,
+            "symbols": len(held),
+            "started_at": log.timestamp,
+        }
+        today = datetime.today().date()
+        with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+            results = dict(
+                zip(
+                    held,
+                    pool.map(
+                        lambda item: _sync_symbol(
+                            session_factory, item[0], item[1], today
+                        ),
+                        held.items(),
+                    ),
+                )
+            )
+        failed = sorted(symbol for symbol, ok in results.items() if not ok)
+        try:
+            refresh_price_store(
+                session_factory, [symbol for symbol, ok in results.items() if ok]
+            )
+        except Exception as e:
+            print(f"[sync_scheduler] price store export failed: {e}")
+        log.symbols_total = len(held)
+        log.symbols_failed = len(failed)
+        if not failed:
+            log.status = "success"
+        else:
+            log.status = "failed" if len(failed) == len(held) else "partial"
+            log.error = ", ".join(failed)[:1000]
+    except Exception as e:
+        log.status = "failed"
+        log.error = str(e)[:1000]
+    finally:
+        _current = None
+        log.finished_at = datetime.utcnow()
+        log.duration_seconds = time.monotonic() - started
+        db.commit()
+        log_id, summary = log.id, (
+            f"[sync_scheduler] {exchange or 'ALL'} {log.status} "
+            f"{log.symbols_total} symbols in {log.duration_seconds:.1f}s"
+        )
+        db.close()
+    print(summary)
+    return log_id
+
+
+def run_sync(exchange=None, session_factory=None):
+    """Sync held symbols of one exchange (or all); returns the sync_log id.
+
+    Returns None without doing anything while another run is in progress,
+    so scheduled and manual runs never overlap.
+    """
+    if not _run_lock.acquire(blocking=False):
+        return None
+    session_factory = session_factory or SessionLocal
+    try:
+        log_id = _run(exchange, session_factory)
+        # 새 종가로 최근 일별 평가액을 다시 계산한다
+        refresh_daily_values(session_factory)
+        return log_id
+    finally:
+        _run_lock.release()
+
+
+def is_due(db, exchange, now):
+    last = (
+        db.query(SyncLog)
+        .filter(SyncLog.exchange == exchange, SyncLog.status != "running")
+        .order_by(SyncLog.timestamp.desc())
+        .first()
+    )
+    if last is None or last.timestamp < last_sync_due(exchange, now):
+        return True
+    return last.status == "failed" and now - last.timestamp >= FAILED_RETRY
+
+
+class SyncScheduler:
+    """In-process thread that syncs each exchange once after its close.
+
+    A missed slot (e.g. the app was down) is caught up on the next poll.
+    """
+
+    def __init__(self, session_factory=None, poll_seconds=SYNC_POLL_SECONDS):
+        self.session_factory = session_factory or SessionLocal
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._mark_synced_symbols()
+        self._thread = threading.Thread(
+            target=self._loop, name="price-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _mark_synced_symbols(self):
+        # 이미 한 번 이상 동기화된 보유 종목은 재시작 직후부터 요청 경로에서 받지 않는다
+        db = self.session_factory()
+        try:
+            ensure_loaded(db)
+            for symbol in held_symbols(db):
+                _, index = load_price_index(db, symbol)
+                if len(index) and symbol in market_data_service.last_synced:
+                    market_data_service.scheduled_symbols.add(symbol)
+        except Exception as e:
+            print(f"[sync_scheduler] could not restore synced symbols: {e}")
+        finally:
+            db.close()
+
+    def run_due(self, now=None):
+        """Run every exchange whose sync slot has passed; returns their names."""
+        now = now or datetime.utcnow()
+        db = self.session_factory()
+        try:
+            due = [ex for ex in SYNC_SCHEDULE if is_due(db, ex, now)]
+        finally:
+            db.close()
+        for exchange in due:
+            run_sync(exchange, self.session_factory)
+        return due
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                print(f"[sync_scheduler] poll failed: {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def status(self, db):
+        now = datetime.utcnow()
+        recent = db.query(SyncLog).order_by(SyncLog.timestamp.desc()).limit(10).all()
+        return {
+            "enabled": self._thread is not None and self._thread.is_alive(),
+            "running": _current,
+            "scheduled_symbols": len(market_data_service.scheduled_symbols),
+            "next_runs": {ex: next_sync_due(ex, now) for ex in SYNC_SCHEDULE},
+            "recent_runs": [
+                {
+                    "id": r.id,
+                    "exchange": r.exchange,
+                    "started_at": r.timestamp,
+                    "finished_at": r.finished_at,
+                    "duration_seconds": r.duration_seconds,
+                    "status": r.status,
+                    "symbols_total": r.symbols_total,
+                    "symbols_failed": r.symbols_failed,
+                    "error": r.error,
+                }
+                for r in recent
+            ],
+        }
+
+
+scheduler = SyncScheduler()
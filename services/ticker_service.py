@@ -0,0 +1,13 @@
+from models.tickers import Ticker
+from services.instrument_registry import refresh_instrument
+
+
+def get_or_create_ticker(db, symbol: str) -> Ticker:
+    ticker = db.query(Ticker).filter_by(symbol=symbol).first()
+    if not ticker:
+        ticker = Ticker(symbol=symbol)
+        db.add(ticker)
+        db.commit()
+        db.refresh(ticker)
+        refresh_instrument(ticker)
+    return ticker
@@ -0,0 +1,279 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+KRX_EXCHANGES = {"KRX", "KSE", "KOSPI", "KOSDAQ", "KONEX"}
+CALENDAR_YEARS = range(2000, 2031)
+
+# 설/추석/부처님오신날, 대체공휴일, 선거일, 제헌절(2026~) 등 (2015~2030년분).
+# 2030년 대선/지방선거일은 확정되면 추가한다
+KRX_LUNAR_AND_SPECIAL = [
+    # 2015
+    "2015-02-18", "2015-02-19", "2015-02-20", "2015-05-25", "2015-08-14",
+    "2015-09-28", "2015-09-29",
+    # 2016
+    "2016-02-08", "2016-02-09", "2016-02-10", "2016-04-13", "2016-05-06",
+    "2016-09-14", "2016-09-15", "2016-09-16",
+    # 2017
+    "2017-01-27", "2017-01-30", "2017-05-03", "2017-05-09", "2017-10-02",
+    "2017-10-04", "2017-10-05", "2017-10-06",
+    # 2018
+    "2018-02-15", "2018-02-16", "2018-05-07", "2018-05-22", "2018-06-13",
+    "2018-09-24", "2018-09-25", "2018-09-26",
+    # 2019
+    "2019-02-04", "2019-02-05", "2019-02-06", "2019-05-06", "2019-09-12",
+    "2019-09-13",
+    # 2020
+    "2020-01-24", "2020-01-27", "2020-04-15", "2020-04-30", "2020-08-17",
+    "2020-09-30", "2020-10-01", "2020-10-02",
+    # 2021
+    "2021-02-11", "2021-02-12", "2021-05-19", "2021-08-16", "2021-09-20",
+    "2021-09-21", "2021-09-22", "2021-10-04", "2021-10-11",
+    # 2022
+    "2022-01-31", "2022-02-01", "2022-02-02", "2022-03-09", "2022-06-01",
+    "2022-09-09", "2022-09-12", "2022-10-10",
+    # 2023
+    "2023-01-23", "2023-01-24", "2023-05-29", "2023-09-28", "2023-09-29",
+    "2023-10-02",
+    # 2024
+    "2024-02-09", "2024-02-12", "2024-04-10", "2024-05-06", "2024-05-15",
+    "2024-09-16", "2024-09-17", "2024-09-18", "2024-10-01",
+    # 2025
+    "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03",
+    "2025-05-06", "2025-06-03", "2025-10-06", "2025-10-07", "2025-10-08",
+    # 2026
+    "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-25",
+    "2026-06-03", "2026-07-17", "2026-08-17", "2026-09-24", "2026-09-25",
+    "2026-10-05",
+    # 2027
+    "2027-02-08", "2027-02-09", "2027-05-03", "2027-05-13", "2027-07-19",
+    "2027-08-16", "2027-09-14", "2027-09-15", "2027-09-16", "2027-10-04",
+    "2027-10-11", "2027-12-27",
+    # 2028
+    "2028-01-26", "2028-01-27", "2028-01-28", "2028-04-12", "2028-05-02",
+    "2028-07-17", "2028-10-02", "2028-10-04", "2028-10-05",
+    # 2029
+    "2029-02-12", "2029-02-13", "2029-02-14", "2029-05-07", "2029-05-21",
+    "2029-07-17", "2029-09-21", "2029-09-24",
+    # 2030
+    "2030-02-04", "2030-02-05", "2030-05-06", "2030-05-09", "2030-07-17",
+    "2030-09-11", "2030-09-12", "2030-09-13",
+]  # fmt: skip
+# 위 표가 채워진 첫 해와 마지막 해. 범위 밖 날짜는 음력 휴장일 없이 평일로만 계산된다
+# (2015년 이전은 식목일/제헌절/한글날 등 고정 휴장일도 지금과 달라 표를 두지 않는다)
+KRX_LISTED_FROM = min(int(d[:4]) for d in KRX_LUNAR_AND_SPECIAL)
+KRX_LISTED_THROUGH = max(int(d[:4]) for d in KRX_LUNAR_AND_SPECIAL)
+# 양력 고정 휴장일: 신정, 삼일절, 근로자의 날, 어린이날, 현충일, 광복절, 개천절, 한글날, 성탄절
+KRX_FIXED = [
+    (1, 1),
+    (3, 1),
+    (5, 1),
+    (5, 5),
+    (6, 6),
+    (8, 15),
+    (10, 3),
+    (10, 9),
+    (12, 25),
+]
+# 규칙으로 표현되지 않는 NYSE 임시 휴장 (9/11, 국장, 허리케인 샌디)
+NYSE_SPECIAL = [
+    "2001-09-11",
+    "2001-09-12",
+    "2001-09-13",
+    "2001-09-14",
+    "2004-06-11",
+    "2007-01-02",
+    "2012-10-29",
+    "2012-10-30",
+    "2018-12-05",
+    "2025-01-09",
+]
+
+
+def _nth_weekday(year, month, weekday, n):
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year, month, weekday):
+    last = (
+        date(year, month + 1, 1) - timedelta(days=1)
+        if month < 12
+        else date(year, 12, 31)
+    )
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(day):
+    # 토요일이면 금요일, 일요일이면 월요일에 쉰다
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year):
+    days = [
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _last_weekday(year, 5, 0),  # Memorial Day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    ]
+    # 신정이 토요일이면 전년도 12/31을 쉬지 않는다
+    if date(year, 1, 1).weekday() != 5:
+        days.append(_observed(date(year, 1, 1)))
+    if year >= 2022:
+        days.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return days
+
+
+def krx_holidays(year):
+    days = [date(year, m, d) for m, d in KRX_FIXED]
+    # 연말 휴장일: 12월 마지막 평일
+    year_end = date(year, 12, 31)
+    days.append(year_end - timedelta(days=max(0, year_end.weekday() - 4)))
+    return days
+
+
+class TradingCalendar:
+    """Offline session calendar: weekdays minus an exchange's holidays.
+
+    Built on numpy's busday machinery, so counting or listing sessions in a
+    range is vectorized rather than a per-day Python loop. Years outside
+    listed_from..listed_through have no holiday data; the first query there
+    logs a warning, since holidays there would be reported as sessions.
+    """
+
+    def __init__(
+        self,
+        name,
+        holidays,
+        listed_through=None,
+        timezone="UTC",
+        close=time(16),
+        listed_from=None,
+    ):
+        self.name = name
+        self.listed_from = listed_from
+        self.listed_through = listed_through
+        self.timezone = ZoneInfo(timezone)
+        self.close = close  # 정규장 마감 (현지 시각)
+        self._warned = False
+        self._busdays = np.busdaycalendar(
+            holidays=np.array(sorted(set(holidays)), dtype="datetime64[D]")
+        )
+
+    def _check_listed(self, day):
+        if self._warned:
+            return
+        year = np.datetime64(day, "Y").astype(int) + 1970
+        if self.listed_through is not None and year > self.listed_through:
+            self._warned = True
+            print(
+                f"[WARN] {self.name} calendar has no holiday data after "
+                f"{self.listed_through}; update services/trading_calendar.py"
+            )
+        elif self.listed_from is not None and year < self.listed_from:
+            self._warned = True
+            print(
+                f"[WARN] {self.name} calendar has no holiday data before "
+                f"{self.listed_from}; update services/trading_calendar.py"
+            )
+
+    def is_session(self, day):
+        self._check_listed(day)
+        return bool(np.is_busday(np.datetime64(day, "D"), busdaycal=self._busdays))
+
+    def has_session(self, start, end):
+        """True when at least one session falls in [start, end]."""
+        if start > end:
+            return False
+        self._check_listed(start)
+        self._check_listed(end)
+        return bool(
+            np.busday_count(start, end + timedelta(days=1), busdaycal=self._busdays)
+        )
+
+    def sessions(self, start, end):
+        """Session dates in [start, end] as a datetime64[D] array."""
+        self._check_listed(start)
+        self._check_listed(end)
+        days = np.arange(
+            np.datetime64(start, "D"),
+            np.datetime64(end, "D") + np.timedelta64(1, "D"),
+            dtype="datetime64[D]",
+        )
+        return days[np.is_busday(days, busdaycal=self._busdays)]
+
+    def next_session(self, day):
+        """Earliest session on or after day."""
+        return np.busday_offset(
+            np.datetime64(day, "D"), 0, roll="forward", busdaycal=self._busdays
+        ).astype(object)
+
+    def previous_session(self, day):
+        """Latest session on or before day."""
+        return np.busday_offset(
+            np.datetime64(day, "D"), 0, roll="backward", busdaycal=self._busdays
+        ).astype(object)
+
+    def session_close(self, day):
+        """UTC time (naive, like datetime.utcnow()) the session on day closes."""
+        local = datetime.combine(day, self.close, tzinfo=self.timezone)
+        return local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+NYSE = TradingCalendar(
+    "NYSE",
+    [d for y in CALENDAR_YEARS for d in nyse_holidays(y)]
+    + [date.fromisoformat(d) for d in NYSE_SPECIAL],
+    listed_through=CALENDAR_YEARS[-1],
+    timezone="America/New_York",
+    close=time(16),
+    listed_from=CALENDAR_YEARS[0],
+)
+KRX = TradingCalendar(
+    "KRX",
+    [d for y in CALENDAR_YEARS if y >= KRX_LISTED_FROM for d in krx_holidays(y)]
+    + [date.fromisoformat(d) for d in KRX_LUNAR_AND_SPECIAL],
+    listed_through=min(CALENDAR_YEARS[-1], KRX_LISTED_THROUGH),
+    timezone="Asia/Seoul",
+    close=time(15, 30),
+    listed_from=max(CALENDAR_YEARS[0], KRX_LISTED_FROM),
+)
+
+
+def is_krx_symbol(symbol):
+    # 한국 종목코드: 숫자로 시작하는 6자리 (예: 069500, 0080G0)
+    return len(symbol) == 6 and symbol[0].isdigit() and symbol.isalnum()
+
+
+def calendar_for_symbol(symbol, exchange=None):
+    """KRX for Korean listings (by exchange or code shape), NYSE otherwise."""
+    if exchange:
+        return KRX if exchange.upper() in KRX_EXCHANGES else NYSE
+    return KRX if symbol and is_krx_symbol(symbol) else NYSE
+
+
+def calendar_for_country(account_country):
+    country = getattr(account_country, "value", account_country)
+    return KRX if country == "KOR" else NYSE
@@ -1,5 +1,70 @@
+from datetime import date
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Integer, cast, func
+
 from models.account import AccountCategory, AccountType
 from models.transactions import Transaction, TransactionType
+from services.money import (
+    AMOUNT_SCALE,
+    QUANTITY_SCALE,
+    cost_of,
+    money,
+    pro_rata,
+    quantity,
+    to_float,
+)
+
+
+class LedgerTransaction(NamedTuple):
+    """Transaction as the ledger reads it: amount/price in AMOUNT_SCALE units,
+    quantity in QUANTITY_SCALE units."""
+
+    id: int
+    date: date
+    type: TransactionType
+    symbol: Optional[str]
+    amount: int
+    quantity: int
+    price: int
+
+
+def to_ledger_transaction(tx):
+    return LedgerTransaction(
+        tx.id,
+        tx.date,
+        tx.type,
+        tx.symbol,
+        money(tx.amount),
+        quantity(tx.quantity),
+        money(tx.price),
+    )
+
+
+def _scaled(column, scale):
+    return cast(func.round(func.coalesce(column, 0) * 10**scale), Integer)
+
+
+def ledger_transactions(db, account_id):
+    """Account transactions in (date, id) order, already in fixed point.
+
+    SQLite does the scaling, so no Decimal is built per row.
+    """
+    rows = (
+        db.query(
+            Transaction.id,
+            Transaction.date,
+            Transaction.type,
+            Transaction.symbol,
+            _scaled(Transaction.amount, AMOUNT_SCALE),
+            _scaled(Transaction.quantity, QUANTITY_SCALE),
+            _scaled(Transaction.price, AMOUNT_SCALE),
+        )
+        .filter(Transaction.account_id == account_id)
+        .order_by(Transaction.date.asc(), Transaction.id.asc())
+        .all()
+    )
+    return [LedgerTransaction._make(row) for row in rows]
 
 
 def annotate_with_balances(transactions, account):
@@ -7,22 +72,20 @@ def annotate_with_balances(transactions, account):
         running_balance = 0
         for tx in sorted(transactions, key=lambda t: (t.date, t.id)):
             if tx.type in [TransactionType.DEPOSIT, TransactionType.INTEREST]:
-                running_balance += tx.amount
+                running_balance += money(tx.amount)
             elif tx.type == TransactionType.WITHDRAWAL:
-                running_balance -= tx.amount
-            tx.balance = running_balance
-        return running_balance if transactions else 0
+                running_balance -= money(tx.amount)
+            tx.balance = to_float(running_balance)
+        return to_float(running_balance)
 
     if account.account_type == AccountType.STOCK:
         if account.account_category == AccountCategory.RSU:
             running_quantity = 0
             for tx in sorted(transactions, key=lambda t: (t.date, t.id)):
-                qty = tx.quantity or 0
-
                 if tx.type in [TransactionType.VESTING]:
-                    running_quantity += qty
+                    running_quantity += quantity(tx.quantity)
 
-                tx.balance = running_quantity
+                tx.balance = to_float(running_quantity, QUANTITY_SCALE)
             return 0
         running_balance = 0
         for tx in sorted(transactions, key=lambda t: (t.date, t.id)):
@@ -33,23 +96,24 @@ def annotate_with_balances(transactions, account):
                 TransactionType.DIVIDEND,
                 TransactionType.SELL,
             ]:
-                running_balance += tx.amount
+                running_balance += money(tx.amount)
             elif tx.type in [
                 TransactionType.WITHDRAWAL,
                 TransactionType.FX_WITHDRAWAL,
                 TransactionType.BUY,
                 TransactionType.TAX_FEE,
             ]:
-                running_balance -= tx.amount
-            tx.balance = running_balance
-        return running_balance if transactions else 0
+                running_balance -= money(tx.amount)
+            tx.balance = to_float(running_balance)
+        return to_float(running_balance)
 
 
 def annotate_with_quantities_by_symbol(transactions, account):
     if account.account_type != AccountType.STOCK:
         return {}
 
-    symbol_info_map = {}
+    # symbol -> [quantity, cost_basis] (고정소수점), 반환할 때 float 로 바꾼다
+    positions = {}
 
     if account.account_category == AccountCategory.RSU:
         for tx in sorted(transactions, key=lambda t: (t.date, t.id)):
@@ -57,14 +121,12 @@ def annotate_with_quantities_by_symbol(transactions, account):
             if not symbol:
                 continue
 
-            if symbol not in symbol_info_map:
-                symbol_info_map[symbol] = {"quantity": 0, "cost_basis": 0.0}
+            position = positions.setdefault(symbol, [0, 0])
 
-            qty = float(tx.quantity or 0)
             if tx.type == TransactionType.VESTING:
-                vest_price = float(tx.price or 0)
-                symbol_info_map[symbol]["quantity"] += qty
-                symbol_info_map[symbol]["cost_basis"] += vest_price * qty
+                qty = quantity(tx.quantity)
+                position[0] += qty
+                position[1] += cost_of(qty, money(tx.price))
 
     else:
         for tx in sorted(transactions, key=lambda t: (t.date, t.id)):
@@ -73,24 +135,23 @@ def annotate_with_quantities_by_symbol(transactions, account):
                 tx.quantity_balance = None
                 continue
 
-            if symbol not in symbol_info_map:
-                symbol_info_map[symbol] = {"quantity": 0, "cost_basis": 0.0}
-
-            qty = float(tx.quantity or 0)
-            price = float(tx.price or 0.0)
+            position = positions.setdefault(symbol, [0, 0])
+            qty = quantity(tx.quantity)
 
             if tx.type == TransactionType.BUY:
-                symbol_info_map[symbol]["quantity"] += qty
-                symbol_info_map[symbol]["cost_basis"] += price * qty
+                position[0] += qty
+                position[1] += cost_of(qty, money(tx.price))
             elif tx.type == TransactionType.SELL:
-                if symbol_info_map[symbol]["quantity"] > 0:
-                    avg_price = (
-                        symbol_info_map[symbol]["cost_basis"]
-                        / symbol_info_map[symbol]["quantity"]
-                    )
-                    symbol_info_map[symbol]["cost_basis"] -= avg_price * qty
-                symbol_info_map[symbol]["quantity"] -= qty
-
-            tx.quantity_balance = symbol_info_map[symbol]["quantity"]
-
-    return symbol_info_map
+                if position[0] > 0:
+                    position[1] -= pro_rata(position[1], qty, position[0])
+                position[0] -= qty
+
+            tx.quantity_balance = to_float(position[0], QUANTITY_SCALE)
+
+    return {
+        symbol: {
+            "quantity": to_float(qty, QUANTITY_SCALE),
+            "cost_basis": to_float(cost),
+        }
+        for symbol, (qty, cost) in positions.items()
+    }
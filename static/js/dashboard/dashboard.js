@@ -38,8 +38,15 @@ async function load() {
 
   // 환율
   document.getElementById("rate").textContent = s.rate?.toLocaleString("ko-KR");
-  document.getElementById("rate_asof").textContent = s.as_of
-    ? `${s.as_of}`
+  // 표시 문구는 템플릿이 현재 언어로 넣어 둔 data 속성에서 읽는다
+  const rateAsof = document.getElementById("rate_asof");
+  const rateFlag = s.rate_default
+    ? rateAsof.dataset.defaultLabel
+    : s.rate_stale
+    ? rateAsof.dataset.staleLabel
+    : "";
+  rateAsof.textContent = s.as_of
+    ? `${s.as_of}${rateFlag ? ` (${rateFlag})` : ""}`
     : "";
 
   // 총 자산 (USD / KRW 함께 표시)
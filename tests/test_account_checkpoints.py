@@ -0,0 +1,165 @@
+"""
+Unit tests for persisted account checkpoints and incremental replay.
+"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from models.account_checkpoint import AccountCheckpoint
+from models.transactions import TransactionType
+from services import market_data_service, price_overrides
+from services.account_checkpoints import (
+    invalidate_checkpoints,
+    save_checkpoint,
+    snapshot,
+)
+from services.money import money
+from services.portfolio_service import Portfolio
+from services.replay_engine import replay_account
+from services.trading_calendar import TradingCalendar
+from services.transaction_service import to_ledger_transaction
+
+WEEKDAYS = TradingCalendar("weekdays", [])
+END = date(2024, 1, 19)
+
+
+@pytest.fixture(autouse=True)
+def reset_price_state(monkeypatch):
+    monkeypatch.setattr(market_data_service, "load_symbol_closes", lambda s: None)
+    monkeypatch.setattr(price_overrides, "_overrides", {})
+    monkeypatch.setattr(price_overrides, "_loaded", True)
+    market_data_service.price_cache.invalidate()
+    yield
+    market_data_service.price_cache.invalidate()
+
+
+@pytest.fixture
+def applied(monkeypatch):
+    """Ids of transactions run through the ledger."""
+    ids = []
+    apply = Portfolio.apply
+
+    def counting(self, tx):
+        ids.append(tx.id)
+        apply(self, tx)
+
+    monkeypatch.setattr(Portfolio, "apply", counting)
+    return ids
+
+
+def tx(id, d, type, amount, symbol=None, quantity=None, price=None):
+    return to_ledger_transaction(
+        SimpleNamespace(
+            id=id,
+            date=d,
+            type=type,
+            amount=Decimal(amount),
+            symbol=symbol,
+            quantity=Decimal(quantity) if quantity is not None else None,
+            price=Decimal(price) if price is not None else None,
+        )
+    )
+
+
+def history():
+    return [
+        tx(1, date(2024, 1, 2), TransactionType.DEPOSIT, "1000"),
+        tx(2, date(2024, 1, 2), TransactionType.BUY, "300", "AAA", "3", "100"),
+        tx(3, date(2024, 1, 5), TransactionType.BUY, "110", "AAA", "1", "110"),
+        tx(4, date(2024, 1, 9), TransactionType.SELL, "240", "AAA", "2", "120"),
+        tx(5, date(2024, 1, 12), TransactionType.DIVIDEND, "4", "AAA"),
+    ]
+
+
+def series(replay):
+    return np.column_stack(
+        [replay.cash, replay.invest, replay.valuation, replay.capital_gain]
+    )
+
+
+class TestAccountCheckpoints:
+    """Test that replays resume from the account's checkpoint while it is valid."""
+
+    def test_only_the_last_transaction_day_is_kept(self, db_session):
+        """Test that one checkpoint row per account holds the latest state."""
+        replay_account(db_session, history()[:3], END, WEEKDAYS, account_id=1)
+        replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        rows = db_session.query(AccountCheckpoint).all()
+        assert [r.date for r in rows] == [date(2024, 1, 12)]
+        assert rows[0].capital_gain == Decimal("35")
+
+    def test_unchanged_account_resumes_without_replaying(self, db_session, applied):
+        """Test that later sessions are valued from the checkpoint alone."""
+        full = replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        applied.clear()
+        tail = replay_account(
+            db_session, history(), END, WEEKDAYS, account_id=1, start=date(2024, 1, 15)
+        )
+
+        assert applied == []
+        assert tail.timestamps == full.timestamps[-5:]
+        np.testing.assert_allclose(series(tail), series(full)[-5:])
+        h = tail.portfolio.position("AAA")
+        assert (h["quantity"], h["avg_cost"], h["dividend_total"]) == (2, 102.5, 4)
+
+    def test_new_transaction_replays_only_its_day(self, db_session, applied):
+        """Test that appending a transaction costs one ledger step."""
+        replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        applied.clear()
+        transactions = history() + [
+            tx(6, date(2024, 1, 16), TransactionType.BUY, "125", "AAA", "1", "125")
+        ]
+        start = date(2024, 1, 16)
+        resumed = replay_account(
+            db_session, transactions, END, WEEKDAYS, account_id=1, start=start
+        )
+        assert applied == [6]
+        full = replay_account(db_session, transactions, END, WEEKDAYS)
+        np.testing.assert_allclose(series(resumed), series(full)[-4:])
+
+    def test_earlier_start_replays_from_the_beginning(self, db_session, applied):
+        """Test that sessions before the checkpoint are not valued from it."""
+        replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        applied.clear()
+        replay_account(
+            db_session, history(), END, WEEKDAYS, account_id=1, start=date(2024, 1, 8)
+        )
+        assert applied == [1, 2, 3, 4, 5]
+        assert db_session.query(AccountCheckpoint).count() == 1
+
+    def test_edited_transaction_invalidates_the_checkpoint(self, db_session, applied):
+        """Test that a changed transaction is detected from the digest."""
+        replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        applied.clear()
+        transactions = history()
+        transactions[2] = transactions[2]._replace(price=money("130"))
+
+        resumed = replay_account(
+            db_session, transactions, END, WEEKDAYS, account_id=1, start=END
+        )
+        assert applied == [1, 2, 3, 4, 5]
+        full = replay_account(db_session, transactions, END, WEEKDAYS)
+        np.testing.assert_allclose(series(resumed), series(full)[-1:])
+        row = db_session.query(AccountCheckpoint).one()
+        assert row.capital_gain == Decimal("25")
+
+    def test_invalidate_from_date(self, db_session):
+        """Test that invalidation drops a checkpoint on or after the date."""
+        replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        assert invalidate_checkpoints(db_session, 1, date(2024, 1, 13)) == 0
+        assert invalidate_checkpoints(db_session, 1, date(2024, 1, 9)) == 1
+        assert db_session.query(AccountCheckpoint).count() == 0
+
+    def test_concurrent_save_upserts(self, db_session):
+        """Test that saving a day another replay already stored does not fail."""
+        replay_account(db_session, history(), END, WEEKDAYS, account_id=1)
+        portfolio = Portfolio(db_session)
+        portfolio.deposit(money("1000"))
+        save_checkpoint(db_session, snapshot(1, date(2024, 1, 12), "other", portfolio))
+        db_session.expire_all()
+        row = db_session.query(AccountCheckpoint).one()
+        assert (row.digest, row.cash) == ("other", Decimal("1000"))
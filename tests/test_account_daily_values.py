@@ -0,0 +1,226 @@
+"""
+Unit tests for the materialized account_daily_values table.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models.account import (
+    Account,
+    AccountCategory,
+    AccountCurrencyType,
+    AccountType,
+    BankName,
+    Owner,
+)
+from models.account_daily_value import AccountDailyValue
+from models.price import Price
+from models.tickers import Ticker
+from models.transactions import Transaction, TransactionType
+from services import account_daily_values, market_data_service, price_overrides
+from services.account_daily_values import (
+    build_daily_values,
+    ensure_daily_values,
+    read_daily_values,
+    refresh_daily_values,
+    prices_changed,
+    transactions_changed,
+)
+from services.price_writer import PriceWrite
+
+START = date(2024, 1, 2)
+END = date(2024, 1, 31)
+
+
+@pytest.fixture(autouse=True)
+def reset_price_state(monkeypatch):
+    monkeypatch.setattr(market_data_service, "load_symbol_closes", lambda s: None)
+    monkeypatch.setattr(price_overrides, "_overrides", {})
+    monkeypatch.setattr(price_overrides, "_loaded", True)
+    # 가격은 테스트 DB에 미리 넣어 둔다
+    monkeypatch.setattr(
+        account_daily_values, "prefetch_account_prices", lambda *a, **k: None
+    )
+    market_data_service.price_cache.invalidate()
+    yield
+    market_data_service.price_cache.invalidate()
+
+
+@pytest.fixture
+def account(db_session):
+    account = Account(
+        owner=Owner.HUN,
+        bank_name=BankName.CHARLES_SCHWAB,
+        account_name="brokerage",
+        account_currency_type=AccountCurrencyType.USD,
+        account_type=AccountType.STOCK,
+        account_category=AccountCategory.PERSONAL,
+    )
+    ticker = Ticker(symbol="VOO")
+    db_session.add_all([account, ticker])
+    db_session.flush()
+    for i in range((END - START).days + 1):
+        db_session.add(
+            Price(ticker_id=ticker.id, date=START + timedelta(days=i), close=100.0 + i)
+        )
+    for day, tx_type, amount, quantity in [
+        (START, TransactionType.DEPOSIT, 1000, None),
+        (START, TransactionType.BUY, 500, 5),
+        (date(2024, 1, 10), TransactionType.SELL, 110, 1),
+    ]:
+        db_session.add(
+            Transaction(
+                account_id=account.id,
+                date=day,
+                type=tx_type,
+                symbol="VOO" if quantity else None,
+                amount=amount,
+                price=amount / quantity if quantity else None,
+                quantity=quantity,
+            )
+        )
+    db_session.commit()
+    return account
+
+
+class TestAccountDailyValues:
+    """Test building, reading and keeping the daily rows current."""
+
+    def test_build_stores_one_row_per_session(self, db_session, account):
+        """Test that rows follow the NYSE calendar and match the replay."""
+        replay = build_daily_values(db_session, account, end_date=END)
+        values = read_daily_values(db_session, account.id)
+
+        assert values["timestamps"] == replay.timestamps
+        # 1/15 (MLK Day) 휴장
+        assert "2024-01-15" not in values["timestamps"]
+        assert values["valuation"] == replay.valuation.tolist()
+        assert values["invest"][-1] == 400.0
+
+    def test_range_read(self, db_session, account):
+        """Test that a date range is served from the stored rows."""
+        build_daily_values(db_session, account, end_date=END)
+        values = read_daily_values(
+            db_session, account.id, date(2024, 1, 8), date(2024, 1, 12)
+        )
+        assert values["timestamps"] == [f"2024-01-{d:02d}" for d in range(8, 13)]
+        assert values["valuation"][0] == 5 * 106.0
+
+    def test_current_table_is_read_without_replay(
+        self, db_session, account, monkeypatch
+    ):
+        """Test that a current table costs a range scan and a checkpoint read."""
+        build_daily_values(db_session, account, end_date=END)
+        monkeypatch.setattr(
+            account_daily_values,
+            "replay_account",
+            lambda *a, **k: pytest.fail("replayed"),
+        )
+        values, portfolio = ensure_daily_values(db_session, account, END)
+        assert values["timestamps"][-1] == "2024-01-31"
+        assert portfolio.position("VOO")["quantity"] == 4.0
+
+    def test_row_computed_before_close_is_rewritten(self, db_session, account):
+        """Test that only a last row written before its session closed is redone."""
+        build_daily_values(db_session, account, end_date=END)
+        rows = (
+            db_session.query(AccountDailyValue).order_by(AccountDailyValue.date).all()
+        )
+        kept = [(r.id, r.computed_at) for r in rows][:-1]
+        # 1/31 장중 (뉴욕 오후 3시) 에 계산된 행처럼 둔다
+        rows[-1].valuation = 0.0
+        rows[-1].computed_at = datetime(2024, 1, 31, 20, 0)
+        db_session.commit()
+
+        values, _ = ensure_daily_values(db_session, account, END)
+        db_session.expire_all()
+        rows = (
+            db_session.query(AccountDailyValue).order_by(AccountDailyValue.date).all()
+        )
+        assert [(r.id, r.computed_at) for r in rows][:-1] == kept
+        assert rows[-1].computed_at > datetime(2024, 2, 1)
+        assert values["valuation"][-1] == 4 * 129.0
+
+    def test_missing_sessions_are_appended(self, db_session, account):
+        """Test that only sessions after the last stored row are written."""
+        build_daily_values(db_session, account, end_date=date(2024, 1, 19))
+        first_ids = [r.id for r in db_session.query(AccountDailyValue)]
+
+        values, _ = ensure_daily_values(db_session, account, END)
+        rows = db_session.query(AccountDailyValue).order_by(AccountDailyValue.date)
+        assert [r.id for r in rows][: len(first_ids)] == first_ids
+        assert values["timestamps"][-1] == "2024-01-31"
+
+    def test_transaction_write_drops_rows_from_its_date(self, db_session, account):
+        """Test that the write hook makes the next read rebuild the tail."""
+        build_daily_values(db_session, account, end_date=END)
+        db_session.add(
+            Transaction(
+                account_id=account.id,
+                date=date(2024, 1, 22),
+                type=TransactionType.BUY,
+                symbol="VOO",
+                amount=120,
+                price=120,
+                quantity=1,
+            )
+        )
+        db_session.commit()
+        transactions_changed(db_session, account.id, date(2024, 1, 22))
+        assert read_daily_values(db_session, account.id)["timestamps"][-1] == (
+            "2024-01-19"
+        )
+
+        values, _ = ensure_daily_values(db_session, account, END)
+        assert values["invest"][-1] == 520.0
+        assert values["valuation"][-1] == 5 * 129.0
+
+    def test_nightly_refresh_recomputes_recent_rows(self, db_session, account):
+        """Test that a revised close is picked up for the recent window only."""
+        build_daily_values(db_session, account)
+        db_session.query(Price).update({Price.close: Price.close + 1})
+        db_session.commit()
+        market_data_service.price_cache.invalidate()
+
+        assert refresh_daily_values(sessionmaker(bind=db_session.bind), days=3) == 1
+        db_session.expire_all()
+        values = read_daily_values(db_session, account.id)
+        assert values["valuation"][-1] == 4 * 130.0
+        assert values["valuation"][0] == 5 * 100.0
+
+    def test_price_change_drops_rows_of_holders(self, db_session, account):
+        """Test that an override clears the holder's rows from its start date."""
+        build_daily_values(db_session, account, end_date=END)
+        price_overrides.set_override(
+            db_session, "VOO", 200.0, effective_from=date(2024, 1, 22)
+        )
+        assert read_daily_values(db_session, account.id)["timestamps"][-1] == (
+            "2024-01-19"
+        )
+
+        values, _ = ensure_daily_values(db_session, account, END)
+        assert values["valuation"][-1] == 4 * 200.0
+
+    def test_price_change_ignores_other_symbols(self, db_session, account):
+        """Test that accounts that never traded the symbol keep their rows."""
+        build_daily_values(db_session, account, end_date=END)
+        assert prices_changed(db_session, "AAPL", date(2024, 1, 2)) == 0
+        # 보유 전 날짜로 들어와도 첫 거래일부터만 지운다
+        assert prices_changed(db_session, "VOO", date(2023, 6, 1)) == 21
+        assert read_daily_values(db_session, account.id)["timestamps"] == []
+
+    def test_durable_bars_drop_rows(self, db_session, account):
+        """Test that the price writer's durable callback clears from the bar date."""
+        build_daily_values(db_session, account, end_date=END)
+        write = PriceWrite(
+            "VOO",
+            None,
+            [{"date": date(2024, 1, 30), "close": 150.0}],
+            bind=db_session.get_bind(),
+        )
+        market_data_service._prices_durable(write)
+        assert read_daily_values(db_session, account.id)["timestamps"][-1] == (
+            "2024-01-29"
+        )
@@ -0,0 +1,171 @@
+"""
+Unit tests for the offline Treasury pricing engine.
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from models.price_override import PriceOverride
+from models.tickers import Ticker
+from models.yield_curve import YieldCurvePoint
+from services import (
+    bond_pricing,
+    instrument_registry,
+    market_data_service,
+    price_overrides,
+)
+from services.bond_pricing import BondTerms, YieldCurve, coupon_schedule, price_series
+from services.instrument_registry import get_instrument, load_registry
+from services.market_data_provider import BOND_MODEL, YFINANCE, BondModelProvider
+from services.price_overrides import override_price, set_override
+from services.provider_router import record_success, route
+
+
+def flat_curve(pct, day=date(2020, 1, 2)):
+    return YieldCurve([day], [1, 12, 120, 360], [[pct, pct, pct, pct]])
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    bond_pricing._curve = None
+    instrument_registry._instruments = {}
+    instrument_registry._loaded = False
+    price_overrides._overrides = {}
+    price_overrides._loaded = False
+    yield
+    bond_pricing._curve = None
+    instrument_registry._instruments = {}
+    instrument_registry._loaded = False
+
+
+class TestPriceSeries:
+    """Test clean/dirty pricing against textbook identities."""
+
+    def test_end_of_month_schedule(self):
+        """Test that an end-of-month maturity keeps paying on month ends."""
+        terms = BondTerms(0.005, date(2026, 2, 28))
+        schedule = coupon_schedule(terms, date(2025, 1, 1))
+        assert [d.astype(object) for d in schedule] == [
+            date(2024, 8, 31),
+            date(2025, 2, 28),
+            date(2025, 8, 31),
+            date(2026, 2, 28),
+        ]
+
+    def test_par_bond_on_coupon_date(self):
+        """Test that yield equal to coupon prices at par with no accrual."""
+        terms = BondTerms(0.04, date(2030, 5, 15))
+        out = price_series(terms, ["2024-05-15"], flat_curve(4.0))
+        np.testing.assert_allclose(out["clean"], [1000.0], rtol=1e-9)
+        np.testing.assert_allclose(out["accrued"], [0.0])
+
+    def test_accrued_and_dirty_between_coupons(self):
+        """Test that accrued interest grows linearly and dirty = clean + accrued."""
+        terms = BondTerms(0.04, date(2030, 5, 15))
+        days = ["2024-08-14", "2024-11-14"]
+        out = price_series(terms, days, flat_curve(5.0))
+        assert out["accrued"][0] == pytest.approx(20.0 * 91 / 184)
+        np.testing.assert_allclose(out["dirty"], out["clean"] + out["accrued"])
+        assert (out["clean"] < 1000).all()
+
+    def test_matured_and_pre_curve_days(self):
+        """Test face value after maturity and NaN before any curve."""
+        terms = BondTerms(0.0025, date(2025, 8, 31))
+        out = price_series(terms, ["2019-12-31", "2025-09-02"], flat_curve(4.0))
+        assert np.isnan(out["dirty"][0])
+        assert out["dirty"][1] == 1000.0
+
+
+class TestBondModelProvider:
+    """Test that bonds with terms are routed to local pricing."""
+
+    def test_history_route_and_bars(self, db_session):
+        """Test that a bond ticker gets session bars from the stored curve."""
+        db_session.add(
+            Ticker(
+                symbol="US912810SN90",
+                coupon_rate=0.0125,
+                maturity_date=date(2050, 5, 15),
+                face_value=1000,
+                pricing_model="bond_model",
+            )
+        )
+        for tenor in (12, 360):
+            db_session.add(
+                YieldCurvePoint(
+                    date=date(2024, 1, 2), tenor_months=tenor, yield_pct=4.5
+                )
+            )
+        db_session.commit()
+        load_registry(db_session)
+        bond_pricing.load_yield_curve(db_session)
+
+        assert route("US912810SN90") == [(BOND_MODEL, "US912810SN90")]
+        df = BondModelProvider().history(
+            "US912810SN90", date(2024, 1, 5), date(2024, 1, 12)
+        )
+        assert list(df.index.date) == [
+            date(2024, 1, 5),
+            date(2024, 1, 8),
+            date(2024, 1, 9),
+            date(2024, 1, 10),
+            date(2024, 1, 11),
+            date(2024, 1, 12),
+        ]
+        assert 400 < df["Close"].iloc[0] < 600
+
+    def test_learned_provider_keeps_bond_pricing(self, db_session):
+        """Test that recording a provider answer does not unroute a model bond."""
+        db_session.add(Ticker(symbol="US91282CAJ09", pricing_model="bond_model"))
+        db_session.commit()
+        load_registry(db_session)
+
+        record_success(db_session, "US91282CAJ09", YFINANCE)
+        assert get_instrument("US91282CAJ09").provider_hint == "yfinance"
+        assert route("US91282CAJ09") == [(BOND_MODEL, "US91282CAJ09")]
+
+
+class TestBondOverrides:
+    """Test that fixed bond prices survive until the curve can replace them."""
+
+    def add_bond(self, db_session):
+        db_session.add(
+            Ticker(
+                symbol="US912810SN90",
+                coupon_rate=0.0125,
+                maturity_date=date(2050, 5, 15),
+                face_value=1000,
+                pricing_model="bond_model",
+            )
+        )
+        db_session.commit()
+        set_override(
+            db_session, "US912810SN90", 478.106, effective_from=date(2026, 10, 17)
+        )
+
+    def test_override_kept_without_curve(self, db_session):
+        """Test that repricing with an empty curve leaves the override priced."""
+        self.add_bond(db_session)
+
+        assert market_data_service.reprice_model_bonds(db_session) == 1
+        assert db_session.query(PriceOverride).count() == 1
+        assert override_price(db_session, "US912810SN90", date(2026, 10, 20)) == (
+            pytest.approx(478.106)
+        )
+
+    def test_override_retired_once_curve_loaded(self, db_session):
+        """Test that a stored curve retires the overrides it covers."""
+        self.add_bond(db_session)
+        for tenor in (12, 360):
+            db_session.add(
+                YieldCurvePoint(
+                    date=date(2026, 10, 16), tenor_months=tenor, yield_pct=4.5
+                )
+            )
+        db_session.commit()
+
+        market_data_service.reprice_model_bonds(db_session)
+        assert db_session.query(PriceOverride).count() == 0
+        assert override_price(db_session, "US912810SN90", date(2026, 10, 20)) is None
@@ -0,0 +1,190 @@
+"""
+Unit tests for the memory-mapped columnar price store.
+"""
+
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+from models.price import Price
+from models.tickers import Ticker
+from services import columnar_price_store, market_data_service
+from services.price_cache import PriceCache
+from services.price_writer import PriceWrite
+from services.columnar_price_store import (
+    drop_symbol_columns,
+    export_price_store,
+    load_symbol_closes,
+    load_symbol_columns,
+)
+
+
+def add_bars(db, symbol, start, closes):
+    ticker = db.query(Ticker).filter_by(symbol=symbol).first()
+    if not ticker:
+        ticker = Ticker(symbol=symbol)
+        db.add(ticker)
+        db.commit()
+    for i, close in enumerate(closes):
+        db.add(Price(ticker_id=ticker.id, date=start + timedelta(days=i), close=close))
+    db.commit()
+
+
+class TestColumnarPriceStore:
+    """Test export, memory-mapped reads and use by the price index."""
+
+    def test_export_and_mmap_read(self, db_session, tmp_path):
+        """Test that exported arrays come back as read-only memory maps."""
+        add_bars(db_session, "AAPL", date(2024, 1, 2), [1.0, 2.0, 3.0])
+        assert export_price_store(db_session, str(tmp_path)) == 1
+
+        dates, ohlcv = load_symbol_columns("AAPL", str(tmp_path))
+        assert isinstance(dates, np.memmap)
+        assert ohlcv.shape == (5, 3)
+        assert list(ohlcv[0]) == [1.0, 2.0, 3.0]
+        assert np.isnan(ohlcv[1]).all()
+        assert dates[0] == np.datetime64("2024-01-02")
+
+    def test_missing_symbol(self, tmp_path):
+        """Test that a symbol without files is reported as absent."""
+        assert load_symbol_closes("NOPE", str(tmp_path)) is None
+
+    def test_price_index_reads_store_and_newer_bars(
+        self, db_session, tmp_path, monkeypatch
+    ):
+        """Test that the index maps the store and patches in newer DB bars."""
+        add_bars(db_session, "AAPL", date(2024, 1, 2), [1.0, 2.0])
+        export_price_store(db_session, str(tmp_path))
+        add_bars(db_session, "AAPL", date(2024, 1, 4), [4.0])
+
+        monkeypatch.setattr(
+            market_data_service,
+            "load_symbol_closes",
+            lambda symbol: load_symbol_closes(symbol, str(tmp_path)),
+        )
+        monkeypatch.setattr(market_data_service, "price_cache", PriceCache())
+
+        _, index = market_data_service.load_price_index(db_session, "AAPL")
+        assert index.as_of(date(2024, 1, 3)) == 2.0
+        assert index.as_of(date(2024, 1, 4)) == 4.0
+        # 스토어 이후의 봉은 overlay 에 두고 메모리맵은 복사하지 않는다
+        assert index.overlay_size == 1
+        assert isinstance(index._arrays[0], np.memmap)
+
+    def use_store(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+            market_data_service,
+            "load_symbol_closes",
+            lambda symbol: load_symbol_closes(symbol, str(tmp_path)),
+        )
+        monkeypatch.setattr(
+            market_data_service,
+            "drop_symbol_columns",
+            lambda symbol: drop_symbol_columns(symbol, str(tmp_path)),
+        )
+        cache = PriceCache()
+        monkeypatch.setattr(market_data_service, "price_cache", cache)
+        return cache
+
+    def test_correction_inside_store_drops_it(self, db_session, tmp_path, monkeypatch):
+        """Test that a rewritten bar at or before the store's end is not masked."""
+        add_bars(db_session, "AAPL", date(2024, 1, 2), [1.0, 2.0])
+        export_price_store(db_session, str(tmp_path))
+        cache = self.use_store(monkeypatch, tmp_path)
+        market_data_service.load_price_index(db_session, "AAPL")
+
+        db_session.query(Price).filter_by(date=date(2024, 1, 3)).update({"close": 2.5})
+        db_session.commit()
+        market_data_service._prices_durable(
+            PriceWrite(
+                symbol="AAPL",
+                ticker_id=1,
+                records=[{"date": date(2024, 1, 3), "close": 2.5}],
+                bind=db_session.bind,
+            )
+        )
+
+        assert "AAPL" not in cache
+        assert load_symbol_closes("AAPL", str(tmp_path)) is None
+        _, index = market_data_service.load_price_index(db_session, "AAPL")
+        assert index.as_of(date(2024, 1, 3)) == 2.5
+
+    def test_newer_bars_keep_the_store(self, db_session, tmp_path, monkeypatch):
+        """Test that bars after the store's end are patched into the cache."""
+        add_bars(db_session, "AAPL", date(2024, 1, 2), [1.0])
+        export_price_store(db_session, str(tmp_path))
+        cache = self.use_store(monkeypatch, tmp_path)
+        market_data_service.load_price_index(db_session, "AAPL")
+
+        add_bars(db_session, "AAPL", date(2024, 1, 3), [2.0])
+        market_data_service._prices_durable(
+            PriceWrite(
+                symbol="AAPL",
+                ticker_id=1,
+                records=[{"date": date(2024, 1, 3), "close": 2.0}],
+                bind=db_session.bind,
+            )
+        )
+
+        assert "AAPL" in cache
+        assert load_symbol_closes("AAPL", str(tmp_path)) is not None
+
+    def test_reprice_drops_bond_store(self, db_session, tmp_path, monkeypatch):
+        """Test that repriced bonds are not served from the old store files."""
+        add_bars(db_session, "US912810SN90", date(2024, 1, 2), [95.0])
+        db_session.query(Ticker).filter_by(symbol="US912810SN90").update(
+            {"pricing_model": "bond_model"}
+        )
+        db_session.commit()
+        export_price_store(db_session, str(tmp_path))
+        self.use_store(monkeypatch, tmp_path)
+
+        assert market_data_service.reprice_model_bonds(db_session) == 1
+        assert load_symbol_closes("US912810SN90", str(tmp_path)) is None
+
+    def test_scheduler_regenerates_synced_symbols(
+        self, db_session, tmp_path, monkeypatch
+    ):
+        """Test that a sync re-exports its symbols and drops their overlay."""
+        from sqlalchemy.orm import sessionmaker
+
+        from services import sync_scheduler
+
+        add_bars(db_session, "AAPL", date(2024, 1, 2), [1.0])
+        export_price_store(db_session, str(tmp_path))
+        add_bars(db_session, "AAPL", date(2024, 1, 3), [2.0])
+        monkeypatch.setattr(columnar_price_store, "PRICE_STORE_DIR", str(tmp_path))
+        monkeypatch.setattr(
+            sync_scheduler,
+            "export_price_store",
+            lambda db, symbols: export_price_store(db, str(tmp_path), symbols),
+        )
+        monkeypatch.setattr(
+            sync_scheduler, "store_exists", lambda: os.path.isdir(tmp_path)
+        )
+        cache = PriceCache()
+        cache.put("AAPL", (1, None))
+        monkeypatch.setattr(market_data_service, "price_cache", cache)
+
+        factory = sessionmaker(bind=db_session.bind)
+        assert sync_scheduler.refresh_price_store(factory, ["AAPL"]) == 1
+        assert "AAPL" not in cache
+        dates, closes = load_symbol_closes("AAPL", str(tmp_path))
+        assert list(closes) == [1.0, 2.0]
+
+    def test_drop_missing_symbol(self, tmp_path):
+        """Test that dropping a symbol without files is a no-op."""
+        drop_symbol_columns("NOPE", str(tmp_path))
+        assert load_symbol_closes("NOPE", str(tmp_path)) is None
+
+    def test_atomic_writes_use_unique_temp_names(self, tmp_path, monkeypatch):
+        """Test that concurrent writers in one process never share a temp file."""
+        seen = []
+        replace = os.replace
+        monkeypatch.setattr(
+            os, "replace", lambda src, dst: (seen.append(src), replace(src, dst))
+        )
+        for _ in range(2):
+            columnar_price_store._save_atomic(str(tmp_path / "a.npy"), np.zeros(1))
+        assert len(set(seen)) == 2
@@ -0,0 +1,173 @@
+"""
+Unit tests for the daily FX series store and vectorized conversion.
+"""
+
+from datetime import date
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.account import (
+    Account,
+    AccountCategory,
+    AccountCurrencyType,
+    AccountType,
+    BankName,
+    Owner,
+)
+from models.fx_rate import FxDailyRate
+from services import fx_history
+
+
+def usd_krw_frame(rows):
+    index = pd.to_datetime([d for d, _ in rows])
+    return pd.DataFrame({"Close": [c for _, c in rows]}, index=index)
+
+
+@pytest.fixture(autouse=True)
+def reset_fx_indexes():
+    fx_history._indexes.clear()
+    yield
+    fx_history._indexes.clear()
+
+
+@pytest.fixture
+def stored_rates(db_session):
+    frame = usd_krw_frame(
+        [
+            (date(2024, 1, 2), 1300.0),
+            (date(2024, 1, 3), 1310.0),
+            (date(2024, 1, 5), 1320.0),
+        ]
+    )
+    with patch.object(fx_history.FDR, "history", return_value=frame):
+        fx_history.backfill_fx(db_session, date(2024, 1, 1), date(2024, 1, 5))
+    return db_session
+
+
+class TestBackfill:
+    """Test bulk backfill of the daily series."""
+
+    def test_backfill_upserts_by_pair_and_date(self, stored_rates):
+        """Test that re-running a backfill replaces rather than duplicates."""
+        frame = usd_krw_frame([(date(2024, 1, 5), 1325.0)])
+        with patch.object(fx_history.FDR, "history", return_value=frame):
+            fx_history.backfill_fx(stored_rates, date(2024, 1, 5))
+        assert stored_rates.query(FxDailyRate).count() == 3
+        assert fx_history.fx_rate_as_of(stored_rates, date(2024, 1, 5)) == 1325.0
+
+    def test_as_of_carries_last_close_over_gaps(self, stored_rates):
+        """Test that a day without a close uses the previous one."""
+        assert fx_history.fx_rate_as_of(stored_rates, date(2024, 1, 4)) == 1310.0
+        assert fx_history.fx_rate_as_of(stored_rates, date(2024, 1, 1)) is None
+
+    def test_ensure_only_fetches_missing_tail(self, stored_rates):
+        """Test that a covered range does not go to the provider again."""
+        with patch.object(fx_history.FDR, "history") as history:
+            fx_history.ensure_fx_history(
+                stored_rates, date(2024, 1, 2), date(2024, 1, 8)
+            )
+        history.assert_not_called()
+
+
+class TestConvertSeries:
+    """Test day-by-day conversion into a reporting currency."""
+
+    def test_usd_series_converted_with_daily_rates(self, stored_rates):
+        """Test that each day is multiplied by its own as-of rate."""
+        days = ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+        with patch.object(fx_history.FDR, "history") as history:
+            krw = fx_history.convert_series(
+                stored_rates,
+                days,
+                [1.0, 2.0, 3.0, 4.0],
+                AccountCurrencyType.USD,
+                AccountCurrencyType.KRW,
+            )
+        history.assert_not_called()
+        np.testing.assert_allclose(krw, [1300.0, 2620.0, 3930.0, 5280.0])
+
+    def test_many_series_and_inverse_direction(self, stored_rates):
+        """Test that 2-D input converts every row and KRW->USD divides."""
+        usd = fx_history.convert_series(
+            stored_rates,
+            ["2024-01-02", "2024-01-05"],
+            [[1300.0, 1320.0], [2600.0, 2640.0]],
+            "KRW",
+            "USD",
+        )
+        np.testing.assert_allclose(usd, [[1.0, 1.0], [2.0, 2.0]])
+
+    def test_dates_before_history_use_first_close(self, stored_rates):
+        """Test that early days fall back to the oldest stored rate."""
+        with patch.object(fx_history.FDR, "history", return_value=pd.DataFrame()):
+            krw = fx_history.convert_series(
+                stored_rates, ["2023-12-29"], [1.0], "USD", "KRW"
+            )
+        np.testing.assert_allclose(krw, [1300.0])
+
+    def test_same_currency_is_identity(self, db_session):
+        """Test that no rates are needed when currencies match."""
+        out = fx_history.convert_series(db_session, ["2024-01-02"], [5.0], "KRW", "KRW")
+        np.testing.assert_allclose(out, [5.0])
+
+    def test_backfill_writes_in_chunks(self, db_session, monkeypatch):
+        """Test that a long backfill is split under the bind-variable limit."""
+        monkeypatch.setattr(fx_history, "UPSERT_CHUNK_ROWS", 2)
+        frame = usd_krw_frame([(date(2024, 1, d), 1300.0 + d) for d in range(1, 6)])
+        with patch.object(fx_history.FDR, "history", return_value=frame):
+            assert fx_history.backfill_fx(db_session, date(2024, 1, 1)) == 5
+        assert db_session.query(FxDailyRate).count() == 5
+
+
+class TestDashboardConversion:
+    """Test the account dashboard when no FX history can be found."""
+
+    def test_missing_history_falls_back_to_account_currency(
+        self, db_session, monkeypatch
+    ):
+        """Test that the page renders in the account currency with a notice."""
+        from routers import account_dashboard
+        from services.portfolio_service import Portfolio
+
+        account = Account(
+            owner=Owner.HUN,
+            bank_name=BankName.CHARLES_SCHWAB,
+            account_name="brokerage",
+            account_currency_type=AccountCurrencyType.USD,
+            account_type=AccountType.STOCK,
+            account_category=AccountCategory.PERSONAL,
+        )
+        db_session.add(account)
+        db_session.commit()
+        values = {"timestamps": ["2024-01-02"], "returns": [0.0]}
+        for field in ("cash", "invest", "valuation", "capital_gain"):
+            values[field] = [1.0]
+        for field in ("interest_income", "dividend_income", "total_income"):
+            values[field] = [0.0]
+        monkeypatch.setattr(
+            account_dashboard,
+            "ensure_daily_values",
+            lambda db, account, end: (values, Portfolio(db)),
+        )
+
+        def no_history(*args):
+            raise LookupError("no USD/KRW history available")
+
+        monkeypatch.setattr(account_dashboard, "convert_series", no_history)
+        graphs = Mock(return_value=[Mock() for _ in range(4)])
+        monkeypatch.setattr(account_dashboard, "graphs", graphs)
+        templates = Mock()
+        monkeypatch.setattr(
+            account_dashboard, "get_templates_with_i18n", lambda r: templates
+        )
+
+        account_dashboard.view_transactions(
+            Mock(), account.id, AccountCurrencyType.KRW, db_session
+        )
+
+        assert graphs.call_args[0][0] == AccountCurrencyType.USD
+        context = templates.TemplateResponse.call_args[0][1]
+        assert context["notice"] == "fx_unavailable"
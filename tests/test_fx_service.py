@@ -0,0 +1,116 @@
+"""
+Unit tests for the cached, persisted USD/KRW rate service.
+"""
+
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import requests
+from sqlalchemy.orm import sessionmaker
+
+from models.fx_rate import FxRate
+from services import fx_service, resilience
+from services.resilience import ProviderPolicy
+
+
+@pytest.fixture(autouse=True)
+def reset_fx_state():
+    fx_service._current = None
+    fx_service._refreshing = False
+    yield
+    fx_service._current = None
+    fx_service._refreshing = False
+
+
+def wait_for_refresh():
+    for t in threading.enumerate():
+        if t.name != threading.current_thread().name and t.daemon:
+            t.join(timeout=2)
+
+
+class TestUsdKrw:
+    """Test memory, table and upstream tiers of the FX rate lookup."""
+
+    def test_cold_start_fetches_and_persists(self, db_session):
+        """Test that the first call fetches once and stores the rate."""
+        with patch.object(fx_service, "fetch_usd_krw", return_value=(1350.0, "t1")):
+            fx = fx_service.get_usd_krw(db_session)
+        assert (fx.rate, fx.as_of, fx.stale) == (1350.0, "t1", False)
+        assert db_session.query(FxRate).count() == 1
+
+    def test_fresh_rate_is_served_from_memory(self, db_session):
+        """Test that a fresh rate never waits on the upstream."""
+        with patch.object(
+            fx_service, "fetch_usd_krw", return_value=(1350.0, "t1")
+        ) as fetch:
+            fx_service.get_usd_krw(db_session)
+            fx_service.get_usd_krw(db_session)
+        assert fetch.call_count == 1
+
+    def test_stale_rate_refreshes_in_background(self, db_session):
+        """Test that an old rate is served flagged and refreshed behind it."""
+        with patch.object(fx_service, "fetch_usd_krw", return_value=(1350.0, "t1")):
+            fx_service.get_usd_krw(db_session)
+        fx_service._current.fetched_at -= fx_service.FX_TTL + timedelta(seconds=1)
+
+        factory = sessionmaker(bind=db_session.bind)
+        with patch.object(fx_service, "fetch_usd_krw", return_value=(1400.0, "t2")):
+            fx = fx_service.get_usd_krw(db_session, session_factory=factory)
+            assert (fx.rate, fx.stale) == (1350.0, True)
+            wait_for_refresh()
+        assert fx_service.get_usd_krw(db_session).rate == 1400.0
+
+    def test_upstream_down_falls_back_to_last_known(self, db_session):
+        """Test that a restart with the API down still serves the stored rate."""
+        db_session.add(FxRate(base="USD", quote="KRW", rate=1300, as_of="t0"))
+        db_session.commit()
+        factory = sessionmaker(bind=db_session.bind)
+        with patch.object(
+            fx_service, "fetch_usd_krw", side_effect=RuntimeError("down")
+        ):
+            fx_service._current = None
+            fx_service._load_last_known(db_session)
+            fx_service._current.fetched_at -= fx_service.FX_TTL
+            fx = fx_service.get_usd_krw(db_session, session_factory=factory)
+            wait_for_refresh()
+        assert (fx.rate, fx.stale) == (1300.0, True)
+
+    def test_cold_start_with_upstream_down_uses_flagged_default(self, db_session):
+        """Test that no stored rate and no API still yields a usable rate."""
+        with patch.object(
+            fx_service, "fetch_usd_krw", side_effect=RuntimeError("down")
+        ):
+            fx = fx_service.get_usd_krw(db_session)
+        assert (fx.rate, fx.default, fx.stale) == (
+            fx_service.FX_DEFAULT_USD_KRW,
+            True,
+            True,
+        )
+        assert fx_service._current is None
+
+    def test_server_error_is_retried_and_counted(self):
+        """Test that an HTTP 5xx goes through the fx_api retry and circuit."""
+        policy = ProviderPolicy(
+            timeout=1,
+            retries=1,
+            backoff_base=0,
+            backoff_max=0,
+            failure_threshold=2,
+            reset_after=60,
+        )
+        error = requests.Response()
+        error.status_code = 503
+        resilience.reset_breakers()
+        try:
+            with patch.dict(resilience.PROVIDER_POLICIES, {"fx_api": policy}):
+                with patch.object(
+                    fx_service.requests, "get", return_value=error
+                ) as get:
+                    with pytest.raises(requests.HTTPError):
+                        fx_service.fetch_usd_krw()
+                    assert get.call_count == 2
+                    assert resilience.provider_status()["fx_api"]["state"] == "open"
+        finally:
+            resilience.reset_breakers()
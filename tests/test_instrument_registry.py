@@ -0,0 +1,58 @@
+"""
+Unit tests for the DB-backed instrument registry.
+"""
+
+import pytest
+
+from models.account import AssetType
+from models.tickers import Ticker
+from services import instrument_registry
+from services.instrument_registry import (
+    get_instrument,
+    load_registry,
+    update_instrument,
+)
+from services.market_data_service import get_current_symbol_type, not_searchable_symbol
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    instrument_registry._instruments = {}
+    instrument_registry._loaded = False
+    yield
+    instrument_registry._instruments = {}
+    instrument_registry._loaded = False
+
+
+class TestInstrumentRegistry:
+    """Test classification from the tickers table instead of code lists."""
+
+    def test_loaded_rows_drive_classification(self, db_session):
+        """Test that asset type and searchability come from tickers rows."""
+        db_session.add_all(
+            [
+                Ticker(symbol="BIL", asset_type=AssetType.BOND),
+                Ticker(symbol="SPAXX", searchable=False),
+                Ticker(symbol="VOO"),
+            ]
+        )
+        db_session.commit()
+        assert load_registry(db_session) == 3
+
+        assert get_current_symbol_type("BIL") == AssetType.BOND
+        assert get_current_symbol_type("VOO") == AssetType.STOCK
+        assert not_searchable_symbol("SPAXX")
+        assert not not_searchable_symbol("VOO")
+
+    def test_unknown_symbol_defaults_to_searchable_stock(self):
+        """Test that symbols without a row keep the old default behaviour."""
+        instrument = get_instrument("NEW1")
+        assert instrument.asset_type == AssetType.STOCK
+        assert instrument.searchable
+
+    def test_update_refreshes_without_reload(self, db_session):
+        """Test that changing an instrument is visible immediately."""
+        load_registry(db_session)
+        update_instrument(db_session, "K55101DN7441", searchable=False)
+        assert not_searchable_symbol("K55101DN7441")
+        assert db_session.query(Ticker).filter_by(symbol="K55101DN7441").one()
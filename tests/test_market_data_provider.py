@@ -0,0 +1,67 @@
+"""
+Unit tests for market data providers and the offline replay provider.
+"""
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from services.market_data_provider import (
+    MarketDataProvider,
+    ReplayProvider,
+    record_fixture,
+)
+
+
+class FrameProvider(MarketDataProvider):
+    name = "frame"
+
+    def history(self, symbol, start, end):
+        index = pd.bdate_range(start, end)
+        return pd.DataFrame(
+            {c: range(len(index)) for c in ["Open", "High", "Low", "Close", "Volume"]},
+            index=index,
+        )
+
+
+class TestMarketDataProvider:
+    """Test the provider interface itself."""
+
+    def test_provider_without_history_cannot_be_created(self):
+        """Test that a provider missing history() fails at construction."""
+
+        class CloseOnly(MarketDataProvider):
+            def last_close(self, symbol):
+                return 1.0
+
+        with pytest.raises(TypeError):
+            CloseOnly()
+
+
+class TestReplayProvider:
+    """Test recorded fixtures, range filtering and artificial latency."""
+
+    def test_record_and_replay(self, tmp_path):
+        """Test that recorded bars are served back for the requested range."""
+        record_fixture(
+            FrameProvider(), "AAPL", date(2024, 1, 1), date(2024, 1, 31), tmp_path
+        )
+        replay = ReplayProvider(str(tmp_path))
+        df = replay.history("AAPL", date(2024, 1, 8), date(2024, 1, 12))
+        assert len(df) == 5
+        assert df.index[0] == pd.Timestamp("2024-01-08")
+        assert replay.last_close("AAPL") == 22.0
+
+    def test_unknown_symbol_is_empty(self, tmp_path):
+        """Test that a symbol without a fixture behaves like an empty provider."""
+        replay = ReplayProvider(str(tmp_path))
+        assert replay.history("NOPE", date(2024, 1, 1), date(2024, 1, 31)).empty
+
+    def test_artificial_latency(self, tmp_path):
+        """Test that each call pays the configured latency."""
+        replay = ReplayProvider(str(tmp_path), latency_ms=50)
+        started = time.perf_counter()
+        replay.history("NOPE", date(2024, 1, 1), date(2024, 1, 31))
+        assert time.perf_counter() - started >= 0.05
+
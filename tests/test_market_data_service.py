@@ -0,0 +1,103 @@
+"""
+Unit tests for historical price resolution in the market data service.
+"""
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from models.price import Price
+from models.tickers import Ticker
+from services import market_data_service, negative_cache
+from services.market_data_provider import MarketDataProvider, set_provider
+
+
+@pytest.fixture(autouse=True)
+def reset_market_data_state(monkeypatch):
+    monkeypatch.setattr(market_data_service, "load_symbol_closes", lambda s: None)
+
+    def reset():
+        market_data_service.price_cache.invalidate()
+        market_data_service.last_synced.clear()
+        negative_cache._misses.clear()
+        negative_cache._loaded = False
+
+    reset()
+    yield
+    reset()
+
+
+class StubProvider(MarketDataProvider):
+    """Provider whose newest bar is a week old, recording every call."""
+
+    name = "stub"
+
+    def __init__(self):
+        self.calls = []
+        self.newest = datetime.today().date() - timedelta(days=7)
+
+    def history(self, symbol, start, end):
+        self.calls.append((symbol, start, end))
+        index = pd.bdate_range(start, min(end, self.newest))
+        return pd.DataFrame({"Close": [100.0] * len(index)}, index=index)
+
+
+@pytest.fixture
+def fake_reader():
+    provider = StubProvider()
+    set_provider(provider)
+    yield provider.calls
+    set_provider(None)
+
+
+class TestPriceLookup:
+    """Test as-of lookups, downloads and freshness of recent dates."""
+
+    def test_bracketed_lookup_uses_stored_bars(self, db_session, fake_reader):
+        """Test that a date between stored bars never hits the provider."""
+        ticker = Ticker(symbol="AAPL")
+        db_session.add(ticker)
+        db_session.commit()
+        day = datetime(2024, 1, 2).date()
+        for i, close in enumerate([10.0, 11.0, 12.0]):
+            db_session.add(
+                Price(ticker_id=ticker.id, date=day + timedelta(days=i), close=close)
+            )
+        db_session.commit()
+
+        assert market_data_service.price_lookup(db_session, "AAPL", day) == 10.0
+        assert (
+            market_data_service.price_lookup(db_session, "AAPL", day + timedelta(1))
+            == 11.0
+        )
+        assert fake_reader == []
+
+    def test_recent_dates_are_fresh_after_sync(self, db_session, fake_reader):
+        """Test that repeat lookups of today make no further provider calls."""
+        today = datetime.today().date()
+        market_data_service.price_lookup(db_session, "AAPL", today)
+        calls = len(fake_reader)
+        assert calls >= 1
+
+        market_data_service.price_lookup(db_session, "AAPL", today)
+        assert len(fake_reader) == calls
+
+        # 동기화 상태는 writer 스레드가 기록한다
+        market_data_service.price_writer.flush()
+        db_session.expire_all()
+        ticker = db_session.query(Ticker).filter_by(symbol="AAPL").one()
+        assert ticker.last_synced_at is not None
+        assert ticker.last_bar_date is not None
+
+    def test_stale_sync_refreshes_recent_dates(self, db_session, fake_reader):
+        """Test that a sync older than the staleness threshold is redone."""
+        today = datetime.today().date()
+        market_data_service.price_lookup(db_session, "AAPL", today)
+        calls = len(fake_reader)
+
+        market_data_service.last_synced[
+            "AAPL"
+        ] -= market_data_service.PRICE_STALENESS + timedelta(minutes=1)
+        negative_cache._misses.clear()
+        market_data_service.price_lookup(db_session, "AAPL", today)
+        assert len(fake_reader) > calls
@@ -0,0 +1,154 @@
+"""
+Unit tests for fixed-point money arithmetic and its use in the ledger.
+"""
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from models.transactions import Transaction, TransactionType
+from services.money import cost_of, div_round, money, pro_rata, quantity, to_float
+from services.portfolio_service import Portfolio
+from services.transaction_service import ledger_transactions, to_ledger_transaction
+
+
+def tx(type, amount, symbol=None, qty=None, price=None):
+    return to_ledger_transaction(
+        SimpleNamespace(
+            id=0,
+            date=date(2024, 1, 2),
+            type=type,
+            amount=amount,
+            symbol=symbol,
+            quantity=qty,
+            price=price,
+        )
+    )
+
+
+class TestMoney:
+    """Test conversion into scaled ints and rounding."""
+
+    @pytest.mark.parametrize(
+        "value, units",
+        [
+            (Decimal("12.34"), 1234),
+            (0.1, 10),
+            ("1.005", 100),  # half-even
+            ("1.015", 102),
+            (7, 700),
+            (None, 0),
+            (Decimal("-2.50"), -250),
+        ],
+    )
+    def test_money_units(self, value, units):
+        """Test that amounts become exact cents."""
+        assert money(value) == units
+
+    def test_quantity_units(self):
+        """Test that quantities keep the column's four decimals."""
+        assert quantity(Decimal("1.2345")) == 12345
+        assert to_float(quantity("0.5"), 4) == 0.5
+
+    def test_div_round_is_half_even(self):
+        """Test rounding of exact halves, including negative values."""
+        assert [div_round(n, 2) for n in (1, 3, 5, -1, -3)] == [0, 2, 2, 0, -2]
+
+    def test_cost_of_fractional_shares(self):
+        """Test that quantity x price is rounded to cents once."""
+        assert cost_of(quantity("0.3333"), money("100.01")) == 3333
+
+    def test_pro_rata_sells_leave_no_residue(self):
+        """Test that selling a position in thirds releases its whole cost."""
+        cost, held = 1000, 3
+        released = 0
+        for _ in range(3):
+            part = pro_rata(cost, 1, held)
+            cost -= part
+            held -= 1
+            released += part
+        assert (cost, released) == (0, 1000)
+
+
+class TestFixedPointPortfolio:
+    """Test that the ledger runs on ints and converts only for display."""
+
+    def test_round_trip_leaves_no_drift(self):
+        """Test that buying and selling out in pieces returns invest to zero."""
+        portfolio = Portfolio(None)
+        portfolio.apply(tx(TransactionType.DEPOSIT, Decimal("1000.00")))
+        portfolio.apply(
+            tx(
+                TransactionType.BUY,
+                Decimal("100.00"),
+                "A",
+                Decimal("3"),
+                Decimal("33.33"),
+            )
+        )
+        for _ in range(3):
+            portfolio.apply(
+                tx(
+                    TransactionType.SELL,
+                    Decimal("40"),
+                    "A",
+                    Decimal("1"),
+                    Decimal("40"),
+                )
+            )
+
+        assert portfolio.invest == 0
+        assert portfolio.holdings["A"].cost == 0
+        assert portfolio.capital_gain == 12000 - 9999
+        assert isinstance(portfolio.cash, int)
+        assert to_float(portfolio.cash) == 1000 - 100 + 120
+
+    def test_position_is_a_float_view(self):
+        """Test the display conversion of one holding."""
+        portfolio = Portfolio(None)
+        portfolio.apply(
+            tx(TransactionType.BUY, 0.0, "A", Decimal("1.5"), Decimal("10.00"))
+        )
+        portfolio.apply(tx(TransactionType.DIVIDEND, Decimal("0.25"), "A"))
+        assert portfolio.position("A") == {
+            "quantity": 1.5,
+            "avg_cost": 10.0,
+            "cost": 15.0,
+            "dividend_total": 0.25,
+            "realized_gain": 0.0,
+        }
+
+
+class TestLedgerTransactions:
+    """Test loading transactions for the ledger already in fixed point."""
+
+    def test_sql_scaling_matches_python(self, db_session):
+        """Test that SQLite's scaling agrees with money()/quantity()."""
+        for i, (tx_type, amount, qty, price) in enumerate(
+            [
+                (TransactionType.DEPOSIT, Decimal("1000.10"), None, None),
+                (TransactionType.BUY, Decimal("99.99"), Decimal("0.3333"), "300.01"),
+                (TransactionType.SELL, Decimal("0.07"), Decimal("1"), "0.07"),
+            ]
+        ):
+            db_session.add(
+                Transaction(
+                    account_id=1,
+                    date=date(2024, 1, 2 + i),
+                    type=tx_type,
+                    symbol="A" if qty else None,
+                    amount=amount,
+                    quantity=qty,
+                    price=Decimal(price) if price else None,
+                )
+            )
+        db_session.commit()
+
+        loaded = ledger_transactions(db_session, 1)
+        orm = db_session.query(Transaction).order_by(Transaction.date).all()
+        assert loaded == [to_ledger_transaction(t) for t in orm]
+        assert [t.amount for t in loaded] == [100010, 9999, 7]
+        assert loaded[1].quantity == 3333 and loaded[0].quantity == 0
+        assert all(type(v) is int for t in loaded for v in t[4:])
@@ -0,0 +1,81 @@
+"""
+Unit tests for the persisted negative cache of market data lookups.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models.fetch_miss import FetchMiss
+from services import negative_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_negative_cache():
+    negative_cache._misses.clear()
+    negative_cache._loaded = False
+    yield
+    negative_cache._misses.clear()
+    negative_cache._loaded = False
+
+
+class TestNegativeCache:
+    """Test recording and short-circuiting of dead lookups."""
+
+    def test_current_quote_miss(self, db_session):
+        """Test that a failed current quote is remembered per provider."""
+        assert not negative_cache.is_known_miss(db_session, "fdr", "DEAD")
+        negative_cache.record_miss(db_session, "fdr", "DEAD", reason="empty")
+        assert negative_cache.is_known_miss(db_session, "fdr", "DEAD")
+        assert not negative_cache.is_known_miss(db_session, "yfinance", "DEAD")
+
+    def test_range_miss_covers_sub_ranges_only(self, db_session):
+        """Test that a miss covers narrower ranges but not wider ones."""
+        start, end = date(2020, 1, 1), date(2020, 3, 1)
+        negative_cache.record_miss(db_session, "fdr", "OLD", start, end)
+        assert negative_cache.is_known_miss(
+            db_session, "fdr", "OLD", date(2020, 2, 1), date(2020, 2, 10)
+        )
+        assert not negative_cache.is_known_miss(
+            db_session, "fdr", "OLD", date(2019, 12, 1), end
+        )
+        assert not negative_cache.is_known_miss(db_session, "fdr", "OLD")
+
+    def test_misses_are_persisted(self, db_session):
+        """Test that misses survive a process restart through the table."""
+        negative_cache.record_miss(
+            db_session, "fdr", "OLD", date(2020, 1, 1), date(2020, 3, 1)
+        )
+        assert db_session.query(FetchMiss).count() == 1
+
+        negative_cache._misses.clear()
+        negative_cache._loaded = False
+        assert negative_cache.is_known_miss(
+            db_session, "fdr", "OLD", date(2020, 1, 1), date(2020, 3, 1)
+        )
+
+    def test_expired_misses_are_dropped(self, db_session):
+        """Test that misses older than the TTL are purged on load."""
+        db_session.add(
+            FetchMiss(
+                provider="fdr",
+                symbol="OLD",
+                start_date=date(2020, 1, 1),
+                end_date=date(2020, 3, 1),
+                attempted_at=datetime.utcnow()
+                - negative_cache.NEGATIVE_CACHE_TTL
+                - timedelta(minutes=1),
+            )
+        )
+        db_session.commit()
+        assert not negative_cache.is_known_miss(
+            db_session, "fdr", "OLD", date(2020, 1, 1), date(2020, 3, 1)
+        )
+        assert db_session.query(FetchMiss).count() == 0
+
+    def test_clear_misses(self, db_session):
+        """Test that clearing a symbol forgets it in memory and on disk."""
+        negative_cache.record_miss(db_session, "fdr", "DEAD")
+        negative_cache.clear_misses(db_session, "DEAD")
+        assert not negative_cache.is_known_miss(db_session, "fdr", "DEAD")
+        assert db_session.query(FetchMiss).count() == 0
@@ -0,0 +1,69 @@
+"""
+Unit tests for Portfolio's holding records and dividend log.
+"""
+
+from datetime import date
+
+import pytest
+
+from models.transactions import TransactionType
+from services.portfolio_service import DividendLog, Holding, Portfolio
+from services.transaction_service import LedgerTransaction
+
+
+def tx(type, symbol=None, amount=0, qty=0, price=0, day=date(2024, 1, 2)):
+    return LedgerTransaction(0, day, type, symbol, amount, qty, price)
+
+
+class TestHoldings:
+    """Test the slot-based holdings and the active view."""
+
+    def test_holding_has_no_instance_dict(self):
+        """Test that holdings are compact slot records."""
+        h = Holding(quantity=10)
+        assert not hasattr(h, "__dict__")
+        with pytest.raises(AttributeError):
+            h.avg_cost = 1
+
+    def test_active_holdings_skip_closed_positions(self):
+        """Test that a sold-out symbol stays in holdings but not in the view."""
+        portfolio = Portfolio(None)
+        portfolio.apply(tx(TransactionType.BUY, "A", 10000, 10000, 10000))
+        portfolio.apply(tx(TransactionType.BUY, "B", 5000, 20000, 2500))
+        portfolio.apply(tx(TransactionType.SELL, "A", 12000, 10000, 12000))
+
+        assert [s for s, _ in portfolio.active_holdings()] == ["B"]
+        assert portfolio.holdings["A"] == Holding(realized_gain=2000)
+
+
+class TestDividendLog:
+    """Test the flat dividend log."""
+
+    def test_dividends_are_logged_per_symbol(self):
+        """Test that dividends keep their order and can be read per symbol."""
+        portfolio = Portfolio(None)
+        for day, symbol, amount in [
+            (date(2024, 3, 1), "A", 25),
+            (date(2024, 3, 5), "B", 40),
+            (date(2024, 6, 1), "A", 30),
+        ]:
+            portfolio.apply(tx(TransactionType.DIVIDEND, symbol, amount, day=day))
+
+        log = portfolio.dividends
+        assert len(log) == 3
+        assert list(log.entries("A")) == [
+            (date(2024, 3, 1), "A", 25),
+            (date(2024, 6, 1), "A", 30),
+        ]
+        assert list(log.entries("C")) == []
+        assert portfolio.holdings["A"].dividend_total == 55
+        assert portfolio.dividend == 95
+
+    def test_log_stores_flat_arrays(self):
+        """Test that the log holds ints in arrays, not tuples."""
+        log = DividendLog()
+        log.append(date(2024, 1, 2), "A", 10)
+        log.append(date(2024, 1, 3), "A", 11)
+        assert log.symbols == ["A"]
+        assert list(log.symbol_ids) == [0, 0]
+        assert list(log.amounts) == [10, 11]
@@ -0,0 +1,80 @@
+"""
+Unit tests for the bounded, thread-safe price cache.
+"""
+
+import threading
+import time
+from datetime import date
+
+from services.price_cache import PriceCache
+from services.price_index import PriceIndex
+
+
+def entry(n=1, ticker_id=1):
+    rows = [(date(2024, 1, 1 + i), float(i)) for i in range(n)]
+    return ticker_id, PriceIndex.from_rows(rows)
+
+
+class TestPriceCache:
+    """Test LRU eviction, populate protocol, invalidation and stats."""
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used ticker is evicted first."""
+        cache = PriceCache(max_entries=2)
+        cache.put("A", entry())
+        cache.put("B", entry())
+        cache.get("A")
+        cache.put("C", entry())
+        assert "A" in cache and "C" in cache and "B" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self):
+        """Test that the memory budget bounds the cache."""
+        one = entry(10)[1].nbytes
+        cache = PriceCache(max_entries=100, max_bytes=one * 2)
+        for symbol in "ABC":
+            cache.put(symbol, entry(10))
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] <= one * 2
+
+    def test_concurrent_misses_load_once(self):
+        """Test that concurrent threads share a single populate call."""
+        cache = PriceCache()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            time.sleep(0.05)
+            return entry()
+
+        threads = [
+            threading.Thread(target=cache.get_or_load, args=("A", loader))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(loads) == 1
+
+    def test_patch_and_invalidate(self):
+        """Test that ingest patches cached indexes and invalidation drops them."""
+        cache = PriceCache()
+        assert not cache.patch("A", [(date(2024, 2, 1), 5.0)])
+        cache.put("A", entry())
+        assert cache.patch("A", [(date(2024, 2, 1), 5.0)])
+        assert cache.get("A")[1].as_of(date(2024, 2, 2)) == 5.0
+
+        cache.invalidate("A")
+        assert "A" not in cache
+        assert cache.stats()["invalidations"] == 1
+
+    def test_hit_rate(self):
+        """Test that hits and misses are counted."""
+        cache = PriceCache()
+        cache.get_or_load("A", entry)
+        cache.get_or_load("A", entry)
+        cache.get_or_load("A", entry)
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        assert abs(stats["hit_rate"] - 2 / 3) < 1e-9
@@ -0,0 +1,85 @@
+"""
+Unit tests for the per-ticker as-of price index.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from services.price_index import PriceIndex
+
+
+class TestPriceIndex:
+    """Test as-of lookups and in-place patching."""
+
+    def test_exact_and_as_of_lookup(self):
+        """Test that a missing date resolves to the last close before it."""
+        index = PriceIndex.from_rows(
+            [(date(2024, 1, 5), 10.0), (date(2024, 1, 2), 8.0)]
+        )
+        assert index.as_of(date(2024, 1, 2)) == 8.0
+        assert index.as_of(date(2024, 1, 4)) == 8.0
+        assert index.as_of(date(2024, 1, 5)) == 10.0
+        assert index.as_of(date(2024, 2, 1)) == 10.0
+
+    def test_before_first_bar(self):
+        """Test that dates before the first bar have no price."""
+        index = PriceIndex.from_rows([(date(2024, 1, 2), 8.0)])
+        assert index.as_of(date(2024, 1, 1)) is None
+
+    def test_as_of_many_matches_as_of(self):
+        """Test that the vectorized lookup agrees with as_of, NaN before bars."""
+        index = PriceIndex.from_rows(
+            [(date(2024, 1, 2), 8.0), (date(2024, 1, 5), 10.0)]
+        )
+        out = index.as_of_many(["2024-01-01", "2024-01-03", "2024-01-05"])
+        assert np.isnan(out[0])
+        assert out[1:].tolist() == [8.0, 10.0]
+
+    def test_brackets(self):
+        """Test that brackets covers only the span between first and last bar."""
+        index = PriceIndex.from_rows([(date(2024, 1, 2), 8.0), (date(2024, 1, 9), 9.0)])
+        assert index.brackets(date(2024, 1, 2))
+        assert index.brackets(date(2024, 1, 6))
+        assert not index.brackets(date(2024, 1, 1))
+        assert not index.brackets(date(2024, 1, 10))
+        assert not PriceIndex().brackets(date(2024, 1, 1))
+
+    def test_insert_merges_and_replaces(self):
+        """Test that patched bars are merged in order and overwrite duplicates."""
+        index = PriceIndex.from_rows([(date(2024, 1, 2), 8.0)])
+        index.insert([(date(2024, 1, 3), 9.0), (date(2024, 1, 2), 8.5)])
+        assert len(index) == 2
+        assert index.first_date == date(2024, 1, 2)
+        assert index.last_date == date(2024, 1, 3)
+        assert index.as_of(date(2024, 1, 2)) == 8.5
+
+    def test_skips_empty_closes(self):
+        """Test that rows without a close are ignored."""
+        index = PriceIndex.from_rows(
+            [(date(2024, 1, 2), None), (date(2024, 1, 3), float("nan"))]
+        )
+        assert len(index) == 0
+
+    def test_read_only_base_keeps_an_overlay(self):
+        """Test that inserts next to a read-only base never copy it."""
+        dates = np.array(["2024-01-02", "2024-01-04"], dtype="datetime64[D]")
+        closes = np.array([8.0, 10.0])
+        dates.flags.writeable = False
+        closes.flags.writeable = False
+        index = PriceIndex.from_sorted(dates, closes)
+        index.insert([(date(2024, 1, 3), 9.0), (date(2024, 1, 4), 10.5)])
+
+        assert index._arrays[0] is dates
+        assert index.overlay_size == 2
+        assert len(index) == 3
+        assert index.last_date == date(2024, 1, 4)
+        assert index.as_of(date(2024, 1, 3)) == 9.0
+        assert index.as_of(date(2024, 1, 5)) == 10.5
+        days = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+        out = index.as_of_many(days)
+        assert np.isnan(out[0]) and out[1:].tolist() == [8.0, 9.0, 10.5]
+        assert index.dates.tolist() == [date(2024, 1, d) for d in (2, 3, 4)]
+        assert index.window(date(2024, 1, 3), date(2024, 1, 3)).tolist() == [
+            date(2024, 1, d) for d in (2, 3, 4)
+        ]
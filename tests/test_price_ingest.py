@@ -0,0 +1,62 @@
+"""
+Unit tests for bulk price ingestion into the prices table.
+"""
+
+from datetime import date
+
+import pandas as pd
+
+from models.price import Price
+from models.tickers import Ticker
+from services.price_ingest import price_records, upsert_prices
+
+
+def frame(closes, start="2024-01-02"):
+    index = pd.bdate_range(start, periods=len(closes))
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": closes,
+            "Low": closes,
+            "Close": closes,
+            "Volume": [1000] * len(closes),
+        },
+        index=index,
+    )
+
+
+class TestPriceIngest:
+    """Test frame conversion and ON CONFLICT upserts."""
+
+    def test_records_skip_missing_closes(self):
+        """Test that bars without a close are not ingested."""
+        records = price_records(1, frame([1.0, float("nan"), 3.0]))
+        assert [r["date"] for r in records] == [date(2024, 1, 2), date(2024, 1, 4)]
+        assert records[0]["ticker_id"] == 1
+        assert records[0]["volume"] == 1000
+
+    def test_records_tolerate_missing_columns(self):
+        """Test that a close-only frame fills the other columns with None."""
+        df = pd.DataFrame(
+            {"Close": [5.0]}, index=pd.bdate_range("2024-01-02", periods=1)
+        )
+        assert price_records(1, df)[0]["open"] is None
+        assert price_records(1, pd.DataFrame()) == []
+
+    def test_overlapping_windows_do_not_duplicate(self, db_session):
+        """Test that re-ingesting a window updates rows instead of adding."""
+        ticker = Ticker(symbol="AAPL")
+        db_session.add(ticker)
+        db_session.commit()
+
+        upsert_prices(db_session, ticker.id, frame([1.0, 2.0, 3.0]))
+        upsert_prices(db_session, ticker.id, frame([20.0, 30.0, 40.0], "2024-01-03"))
+
+        rows = db_session.query(Price).order_by(Price.date).all()
+        assert [r.date for r in rows] == [
+            date(2024, 1, 2),
+            date(2024, 1, 3),
+            date(2024, 1, 4),
+            date(2024, 1, 5),
+        ]
+        assert [float(r.close) for r in rows] == [1.0, 20.0, 30.0, 40.0]
@@ -0,0 +1,65 @@
+"""
+Unit tests for effective-dated manual price overrides.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from services import market_data_service, price_overrides
+from services.price_overrides import override_price, set_override
+
+
+@pytest.fixture(autouse=True)
+def reset_overrides():
+    price_overrides._overrides = {}
+    price_overrides._loaded = False
+    yield
+    price_overrides._overrides = {}
+    price_overrides._loaded = False
+
+
+class TestOverridePrice:
+    """Test as-of resolution of override periods."""
+
+    def test_periods_resolve_by_date(self, db_session):
+        """Test closed and open-ended periods, and dates outside both."""
+        set_override(db_session, "Conviva", 1.0, date(2023, 1, 1), date(2023, 12, 31))
+        set_override(db_session, "Conviva", 1.23, date(2024, 6, 1))
+        assert override_price(db_session, "Conviva", date(2022, 12, 31)) is None
+        assert override_price(db_session, "Conviva", date(2023, 7, 1)) == 1.0
+        assert override_price(db_session, "Conviva", date(2024, 3, 1)) is None
+        assert override_price(db_session, "Conviva", date(2025, 1, 1)) == 1.23
+
+    def test_latest_start_wins_on_overlap(self, db_session):
+        """Test that a newer period shadows an open-ended older one."""
+        set_override(db_session, "VFFSX", 300.0)
+        set_override(db_session, "VFFSX", 316.72, date(2025, 1, 1))
+        assert override_price(db_session, "VFFSX", date(2020, 1, 1)) == 300.0
+        assert override_price(db_session, "VFFSX", date(2025, 2, 1)) == 316.72
+
+
+class TestResolution:
+    """Test that overrides short-circuit current and historical lookups."""
+
+    def test_current_and_historical_skip_providers(self, db_session):
+        """Test that covered symbols never reach quotes or downloads."""
+        set_override(db_session, "US912810SN90", 478.106, date(2024, 1, 1))
+        with patch.object(
+            market_data_service, "get_latest_quote"
+        ) as quote, patch.object(
+            market_data_service, "ensure_price_coverage"
+        ) as coverage:
+            assert (
+                market_data_service.get_current_symbol_price("US912810SN90", db_session)
+                == 478.106
+            )
+            assert (
+                market_data_service.price_lookup(
+                    db_session, "US912810SN90", date(2024, 5, 1)
+                )
+                == 478.106
+            )
+        quote.assert_not_called()
+        coverage.assert_not_called()
@@ -0,0 +1,78 @@
+"""
+Unit tests for the parallel price prefetch stage.
+"""
+
+import threading
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from models.transactions import TransactionType
+from services.price_prefetch import prefetch_prices, symbol_date_ranges
+
+
+def tx(id, d, symbol, type=TransactionType.BUY, quantity=1):
+    return SimpleNamespace(id=id, date=d, symbol=symbol, type=type, quantity=quantity)
+
+
+class TestPricePrefetch:
+    """Test derivation of fetch ranges and concurrent warm-up."""
+
+    def test_ranges_start_at_first_transaction(self):
+        """Test that each symbol is warmed from its first transaction."""
+        transactions = [
+            tx(3, date(2024, 3, 1), "AAPL"),
+            tx(1, date(2024, 1, 1), None, TransactionType.DEPOSIT, None),
+            tx(2, date(2024, 2, 1), "AAPL"),
+            tx(4, date(2024, 4, 1), "005930"),
+        ]
+        assert symbol_date_ranges(transactions, date(2024, 5, 1)) == {
+            "AAPL": (date(2024, 2, 1), date(2024, 5, 1)),
+            "005930": (date(2024, 4, 1), date(2024, 5, 1)),
+        }
+
+    def test_closed_position_ends_when_sold_out(self):
+        """Test that a sold-out symbol is not warmed past its closing sale."""
+        sell = TransactionType.SELL
+        transactions = [
+            tx(1, date(2020, 1, 2), "AAPL", quantity=10),
+            tx(2, date(2020, 6, 1), "AAPL", sell, 4),
+            tx(3, date(2021, 3, 1), "AAPL", sell, 6),
+            tx(4, date(2021, 4, 1), "AAPL", TransactionType.DIVIDEND, None),
+            tx(5, date(2020, 1, 2), "MSFT", quantity=5),
+            tx(6, date(2020, 2, 3), "MSFT", sell, 5),
+            tx(7, date(2022, 1, 3), "MSFT", quantity=1),
+        ]
+        assert symbol_date_ranges(transactions, date(2024, 5, 1)) == {
+            "AAPL": (date(2020, 1, 2), date(2021, 3, 1)),
+            "MSFT": (date(2020, 1, 2), date(2024, 5, 1)),
+        }
+
+    def test_symbols_are_fetched_concurrently(self):
+        """Test that every symbol's fetch is in flight at the same time."""
+        # 6개가 동시에 들어와야 통과하는 barrier. 순차 실행이면 timeout 으로 깨진다
+        barrier = threading.Barrier(6, timeout=5)
+        passed = []
+
+        def fetch(db, symbol, start, end):
+            barrier.wait()
+            passed.append(symbol)
+
+        ranges = {f"S{i}": (date(2024, 1, 1), date(2024, 2, 1)) for i in range(6)}
+        with patch("services.price_prefetch.ensure_price_coverage", side_effect=fetch):
+            prefetch_prices(ranges, max_workers=6, session_factory=Mock)
+        assert sorted(passed) == sorted(ranges)
+
+    def test_one_failing_symbol_does_not_stop_others(self):
+        """Test that a provider error for one symbol is contained."""
+        warmed = []
+
+        def flaky(db, symbol, start, end):
+            if symbol == "BAD":
+                raise RuntimeError("boom")
+            warmed.append(symbol)
+
+        ranges = {s: (date(2024, 1, 1), date(2024, 2, 1)) for s in ["BAD", "OK"]}
+        with patch("services.price_prefetch.ensure_price_coverage", side_effect=flaky):
+            prefetch_prices(ranges, session_factory=Mock)
+        assert warmed == ["OK"]
@@ -0,0 +1,81 @@
+"""
+Unit tests for the gap-aware price download planner.
+"""
+
+from datetime import date, timedelta
+
+from services.price_index import PriceIndex
+from services.price_range_planner import merge_ranges, missing_ranges, plan_fetches
+from services.trading_calendar import KRX
+
+
+def weekday_index(start, end):
+    days = (end - start).days + 1
+    rows = []
+    for i in range(days):
+        d = start + timedelta(days=i)
+        if d.weekday() < 5:
+            rows.append((d, 1.0))
+    return PriceIndex.from_rows(rows)
+
+
+class TestMissingRanges:
+    """Test detection of uncovered stretches."""
+
+    def test_empty_index_needs_whole_span(self):
+        """Test that an empty index plans the full requested span."""
+        assert missing_ranges(PriceIndex(), date(2024, 1, 1), date(2024, 3, 1)) == [
+            (date(2024, 1, 1), date(2024, 3, 1))
+        ]
+
+    def test_weekends_are_not_gaps(self):
+        """Test that ordinary weekends inside coverage are not reported."""
+        index = weekday_index(date(2024, 1, 1), date(2024, 3, 29))
+        assert missing_ranges(index, date(2024, 1, 1), date(2024, 3, 29)) == []
+
+    def test_holiday_tail_is_not_a_gap(self):
+        """Test that a trailing range of exchange holidays is not fetched."""
+        index = PriceIndex.from_rows([(date(2025, 10, 2), 1.0)])
+        start, end = date(2025, 10, 2), date(2025, 10, 9)
+        assert missing_ranges(index, start, end) == [(date(2025, 10, 3), end)]
+        assert missing_ranges(index, start, end, calendar=KRX) == []
+
+    def test_leading_trailing_and_internal_gaps(self):
+        """Test that gaps before, inside and after coverage are all found."""
+        index = PriceIndex.from_rows([(date(2024, 2, 1), 1.0), (date(2024, 3, 1), 1.0)])
+        ranges = missing_ranges(index, date(2024, 1, 1), date(2024, 3, 15))
+        assert ranges == [
+            (date(2024, 1, 1), date(2024, 1, 31)),
+            (date(2024, 2, 2), date(2024, 2, 29)),
+            (date(2024, 3, 2), date(2024, 3, 15)),
+        ]
+
+    def test_weekend_only_stretch_is_skipped(self):
+        """Test that a stretch with no weekdays is not worth a download."""
+        index = PriceIndex.from_rows([(date(2024, 1, 8), 1.0)])
+        assert missing_ranges(index, date(2024, 1, 6), date(2024, 1, 8)) == []
+
+
+class TestMergeRanges:
+    """Test coalescing of planned downloads."""
+
+    def test_close_ranges_are_merged(self):
+        """Test that nearby ranges become a single provider call."""
+        ranges = [
+            (date(2024, 3, 1), date(2024, 3, 10)),
+            (date(2024, 1, 1), date(2024, 1, 31)),
+            (date(2024, 2, 10), date(2024, 2, 20)),
+        ]
+        assert merge_ranges(ranges) == [(date(2024, 1, 1), date(2024, 3, 10))]
+
+    def test_far_ranges_stay_separate(self):
+        """Test that distant ranges are fetched separately."""
+        ranges = [
+            (date(2020, 1, 1), date(2020, 1, 31)),
+            (date(2024, 1, 1), date(2024, 1, 31)),
+        ]
+        assert merge_ranges(ranges) == ranges
+
+    def test_plan_for_cold_multi_year_span_is_one_fetch(self):
+        """Test that a cold replay span needs a single download."""
+        assert len(plan_fetches(PriceIndex(), date(2015, 1, 1), date(2024, 1, 1))) == 1
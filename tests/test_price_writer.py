@@ -0,0 +1,121 @@
+"""
+Unit tests for the write-behind price writer.
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from models.price import Price
+from models.tickers import Ticker
+from services.price_writer import PriceWrite, PriceWriter
+
+
+def bars(ticker_id, start, days, close=1.0):
+    return [
+        {
+            "ticker_id": ticker_id,
+            "date": start + timedelta(days=i),
+            "close": close,
+            "open": None,
+            "high": None,
+            "low": None,
+            "volume": None,
+        }
+        for i in range(days)
+    ]
+
+
+class TestPriceWriter:
+    """Test coalescing, durability callbacks and failures."""
+
+    def test_batches_are_coalesced_and_deduplicated(self, db_session):
+        """Test that queued batches share a transaction and later bars win."""
+        ticker = Ticker(symbol="VOO")
+        db_session.add(ticker)
+        db_session.commit()
+        writer = PriceWriter()
+        start = date(2024, 1, 1)
+        writer._queue.put(
+            (
+                db_session.get_bind(),
+                PriceWrite("VOO", ticker.id, bars(ticker.id, start, 5)),
+            )
+        )
+        writer._queue.put(
+            (
+                db_session.get_bind(),
+                PriceWrite("VOO", ticker.id, bars(ticker.id, start, 3, 2.0)),
+            )
+        )
+        writer._ensure_started()
+        writer.flush()
+
+        assert writer.transactions == 1
+        assert writer.batches == 2
+        closes = dict(db_session.query(Price.date, Price.close).all())
+        assert len(closes) == 5
+        assert closes[start] == 2.0 and closes[start + timedelta(days=4)] == 1.0
+
+    def test_durable_callback_sees_committed_rows(self, db_session):
+        """Test that on_durable fires only once rows and sync state are stored."""
+        ticker = Ticker(symbol="VOO")
+        db_session.add(ticker)
+        db_session.commit()
+        seen = []
+
+        def on_durable(write):
+            with Session(bind=db_session.get_bind()) as check:
+                row = check.get(Ticker, write.ticker_id)
+                seen.append((check.query(Price).count(), row.last_bar_date))
+
+        writer = PriceWriter(on_durable=on_durable)
+        write = PriceWrite(
+            "VOO",
+            ticker.id,
+            bars(ticker.id, date(2024, 1, 1), 2),
+            synced_at=datetime.utcnow(),
+            last_bar_date=date(2024, 1, 2),
+        )
+        writer.submit(db_session, write)
+        writer.flush()
+        assert seen == [(2, date(2024, 1, 2))]
+
+    def test_failed_write_is_reported(self, db_session):
+        """Test that a batch that cannot be written calls on_failed."""
+        failed = []
+        writer = PriceWriter(on_failed=lambda write, error: failed.append(write.symbol))
+        # ticker_id가 NULL인 행은 NOT NULL 제약에 걸린다
+        writer.submit(
+            db_session, PriceWrite("BAD", None, bars(None, date(2024, 1, 1), 1))
+        )
+        writer.flush()
+        assert failed == ["BAD"]
+
+    def test_raising_callback_does_not_stop_writer(self, db_session):
+        """Test that a failing on_durable is logged and later writes still land."""
+        ticker = Ticker(symbol="VOO")
+        db_session.add(ticker)
+        db_session.commit()
+        seen = []
+
+        def on_durable(write):
+            seen.append(write.symbol)
+            if len(seen) == 1:
+                raise RuntimeError("cache gone")
+
+        writer = PriceWriter(on_durable=on_durable)
+        writer.submit(
+            db_session,
+            PriceWrite("VOO", ticker.id, bars(ticker.id, date(2024, 1, 1), 1)),
+        )
+        writer.flush()
+        writer.submit(
+            db_session,
+            PriceWrite("VOO", ticker.id, bars(ticker.id, date(2024, 1, 2), 1)),
+        )
+        writer.flush()
+        assert seen == ["VOO", "VOO"]
+        assert writer._thread.is_alive()
+        assert writer.stats()["pending"] == 0
+        assert db_session.query(Price).count() == 2
@@ -0,0 +1,60 @@
+"""
+Unit tests for symbol-to-provider routing.
+"""
+
+import pytest
+
+from models.tickers import Ticker
+from services import instrument_registry
+from services.instrument_registry import get_instrument, load_registry
+from services.market_data_provider import (
+    FDR,
+    YFINANCE,
+    ReplayProvider,
+    set_provider,
+)
+from services.provider_router import record_success, route
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    instrument_registry._instruments = {}
+    instrument_registry._loaded = False
+    yield
+    instrument_registry._instruments = {}
+    instrument_registry._loaded = False
+
+
+class TestRoute:
+    """Test symbol transforms and ordering of the provider list."""
+
+    def test_krx_codes_and_us_symbols(self):
+        """Test that only Korean codes get a Yahoo exchange suffix."""
+        assert route("005930") == [(FDR, "005930"), (YFINANCE, "005930.KS")]
+        assert route("VOO") == [(FDR, "VOO"), (YFINANCE, "VOO")]
+
+    def test_exchange_from_ticker(self, db_session):
+        """Test that a KOSDAQ ticker is routed to the .KQ Yahoo symbol."""
+        db_session.add(Ticker(symbol="091990", exchange="KOSDAQ"))
+        db_session.commit()
+        load_registry(db_session)
+        assert route("091990")[1] == (YFINANCE, "091990.KQ")
+
+    def test_learned_provider_goes_first(self, db_session):
+        """Test that the provider that last answered is tried first."""
+        load_registry(db_session)
+        record_success(db_session, "0P0000RRID", YFINANCE)
+        assert get_instrument("0P0000RRID").provider_hint == "yfinance"
+        assert route("0P0000RRID")[0] == (YFINANCE, "0P0000RRID")
+        assert db_session.query(Ticker).filter_by(symbol="0P0000RRID").one()
+
+    def test_override_routes_everything(self, tmp_path, db_session):
+        """Test that an override provider serves every symbol and learns nothing."""
+        replay = ReplayProvider(str(tmp_path))
+        set_provider(replay)
+        try:
+            assert route("AAPL") == [(replay, "AAPL")]
+            record_success(db_session, "AAPL", replay)
+            assert get_instrument("AAPL").provider_hint is None
+        finally:
+            set_provider(None)
@@ -0,0 +1,82 @@
+"""
+Unit tests for the TTL latest-quote cache backed by realtime_prices.
+"""
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from models.price import RealTimePrice
+from services import negative_cache, quote_service
+from services.market_data_provider import MarketDataProvider, set_provider
+from services.ticker_service import get_or_create_ticker
+
+
+class StubProvider(MarketDataProvider):
+    name = "stub"
+
+    def __init__(self, price):
+        self.price = price
+        self.calls = 0
+
+    def history(self, symbol, start, end):
+        return pd.DataFrame()
+
+    def last_close(self, symbol):
+        self.calls += 1
+        return self.price
+
+
+@pytest.fixture(autouse=True)
+def reset_caches():
+    quote_service._quotes.clear()
+    negative_cache._misses.clear()
+    negative_cache._loaded = False
+    yield
+    quote_service._quotes.clear()
+    set_provider(None)
+
+
+class TestLatestQuote:
+    """Test memory, table and provider tiers of the quote lookup."""
+
+    def test_fetch_persists_quote(self, db_session):
+        """Test that a fetched quote is written to realtime_prices."""
+        set_provider(StubProvider(10.0))
+        assert quote_service.get_latest_quote(db_session, "AAPL") == 10.0
+        row = db_session.query(RealTimePrice).one()
+        assert float(row.price) == 10.0
+
+    def test_memory_hit_skips_provider(self, db_session):
+        """Test that a fresh quote is served without another download."""
+        provider = StubProvider(10.0)
+        set_provider(provider)
+        quote_service.get_latest_quote(db_session, "AAPL")
+        quote_service.get_latest_quote(db_session, "AAPL")
+        assert provider.calls == 1
+
+    def test_table_hit_after_restart(self, db_session):
+        """Test that a fresh row in realtime_prices is reused."""
+        ticker = get_or_create_ticker(db_session, "AAPL")
+        db_session.add(
+            RealTimePrice(ticker_id=ticker.id, timestamp=datetime.utcnow(), price=12)
+        )
+        db_session.commit()
+        provider = StubProvider(99.0)
+        set_provider(provider)
+        assert quote_service.get_latest_quote(db_session, "AAPL") == 12.0
+        assert provider.calls == 0
+
+    def test_stale_row_is_refreshed(self, db_session):
+        """Test that a row older than the freshness window is not used."""
+        ticker = get_or_create_ticker(db_session, "AAPL")
+        db_session.add(
+            RealTimePrice(
+                ticker_id=ticker.id,
+                timestamp=datetime.utcnow() - timedelta(days=1),
+                price=12,
+            )
+        )
+        db_session.commit()
+        set_provider(StubProvider(15.0))
+        assert quote_service.get_latest_quote(db_session, "AAPL") == 15.0
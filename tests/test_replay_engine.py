@@ -0,0 +1,176 @@
+"""
+Unit tests for the vectorized account replay engine.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from models.price import Price
+from models.tickers import Ticker
+from models.transactions import TransactionType
+from services import market_data_service, price_overrides
+from services.money import to_float
+from services.portfolio_service import Portfolio
+from services.price_index import PriceIndex
+from services.replay_engine import replay_account
+from services.trading_calendar import TradingCalendar
+from services.transaction_service import to_ledger_transaction
+
+WEEKDAYS = TradingCalendar("weekdays", [])
+
+
+@pytest.fixture(autouse=True)
+def reset_price_state(monkeypatch):
+    monkeypatch.setattr(market_data_service, "load_symbol_closes", lambda s: None)
+    monkeypatch.setattr(price_overrides, "_overrides", {})
+    monkeypatch.setattr(price_overrides, "_loaded", True)
+    market_data_service.price_cache.invalidate()
+    yield
+    market_data_service.price_cache.invalidate()
+
+
+def tx(id, d, type, amount, symbol=None, quantity=None, price=None):
+    return to_ledger_transaction(
+        SimpleNamespace(
+            id=id,
+            date=d,
+            type=type,
+            amount=Decimal(amount),
+            symbol=symbol,
+            quantity=Decimal(quantity) if quantity is not None else None,
+            price=Decimal(price) if price is not None else None,
+        )
+    )
+
+
+def store_bars(db, symbol, start, closes):
+    ticker = Ticker(symbol=symbol)
+    db.add(ticker)
+    db.commit()
+    for i, close in enumerate(closes):
+        db.add(Price(ticker_id=ticker.id, date=start + timedelta(days=i), close=close))
+    db.commit()
+
+
+def reference_replay(db, transactions, end_date, calendar):
+    """The original day-by-day loop the engine replaces."""
+    portfolio = Portfolio(db)
+    rows = []
+    tx_idx = 0
+    day = transactions[0].date
+    while day <= end_date:
+        while tx_idx < len(transactions) and transactions[tx_idx].date == day:
+            portfolio.apply(transactions[tx_idx])
+            tx_idx += 1
+        if calendar.is_session(day):
+            inv = to_float(portfolio.invest)
+            val = portfolio.process_valuation(day)
+            rows.append(
+                (
+                    to_float(portfolio.cash),
+                    inv,
+                    val,
+                    (val - inv) / inv * 100 if inv else 0,
+                    to_float(portfolio.capital_gain),
+                    to_float(portfolio.dividend),
+                )
+            )
+        day += timedelta(days=1)
+    return np.array(rows)
+
+
+class TestReplayEngine:
+    """Test that the vectorized replay matches the per-day ledger walk."""
+
+    def test_matches_day_by_day_replay(self, db_session):
+        """Test every series against the original per-day loop."""
+        start = date(2024, 1, 1)
+        store_bars(db_session, "AAA", start, [10.0 + i for i in range(30)])
+        store_bars(db_session, "BBB", start, [50.0 - i for i in range(30)])
+        transactions = [
+            tx(1, start, TransactionType.DEPOSIT, "1000"),
+            tx(2, start, TransactionType.BUY, "100", "AAA", "10", "10"),
+            tx(3, date(2024, 1, 3), TransactionType.BUY, "240", "BBB", "5", "48"),
+            # 주말 거래는 다음 세션에 반영된다
+            tx(4, date(2024, 1, 6), TransactionType.BUY, "75", "AAA", "5", "15"),
+            tx(5, date(2024, 1, 10), TransactionType.SELL, "80", "AAA", "4", "20"),
+            tx(6, date(2024, 1, 10), TransactionType.DIVIDEND, "3", "BBB"),
+            tx(7, date(2024, 1, 15), TransactionType.SELL, "200", "BBB", "5", "40"),
+        ]
+        end = date(2024, 1, 26)
+
+        replay = replay_account(db_session, transactions, end, WEEKDAYS)
+        expected = reference_replay(db_session, transactions, end, WEEKDAYS)
+
+        assert replay.timestamps[0] == "2024-01-01"
+        assert "2024-01-06" not in replay.timestamps
+        assert len(replay.timestamps) == len(expected)
+        actual = np.column_stack(
+            [
+                replay.cash,
+                replay.invest,
+                replay.valuation,
+                replay.returns,
+                replay.capital_gain,
+                replay.dividend_income,
+            ]
+        )
+        np.testing.assert_allclose(actual, expected)
+        assert replay.portfolio.position("AAA")["quantity"] == 11.0
+
+    def test_missing_prices_fall_back_to_average_cost(self, db_session):
+        """Test that a symbol without bars is valued at its average cost."""
+        start = date(2024, 1, 1)
+        transactions = [
+            tx(1, start, TransactionType.BUY, "100", "NOBARS", "10", "10"),
+            tx(2, date(2024, 1, 3), TransactionType.BUY, "200", "NOBARS", "10", "20"),
+        ]
+        replay = replay_account(db_session, transactions, date(2024, 1, 4), WEEKDAYS)
+        assert replay.valuation.tolist() == [100.0, 100.0, 300.0, 300.0]
+        assert replay.returns.tolist() == [0.0] * 4
+
+    def test_overrides_take_precedence(self, db_session):
+        """Test that a manual price replaces stored bars where it applies."""
+        start = date(2024, 1, 1)
+        store_bars(db_session, "CCC", start, [10.0] * 5)
+        price_overrides.set_override(
+            db_session, "CCC", 30.0, effective_from=date(2024, 1, 3)
+        )
+        transactions = [tx(1, start, TransactionType.BUY, "10", "CCC", "1", "10")]
+        replay = replay_account(db_session, transactions, date(2024, 1, 5), WEEKDAYS)
+        assert replay.valuation.tolist() == [10.0, 10.0, 30.0, 30.0, 30.0]
+
+    def test_large_account(self, db_session):
+        """Test a 10-year, 50-symbol account replays every session and buy.
+
+        Timing lives in benchmarks/replay_benchmark.py.
+        """
+        start = date(2015, 1, 1)
+        end = date(2024, 12, 31)
+        days = np.arange(
+            np.datetime64(start),
+            np.datetime64(end) + np.timedelta64(1, "D"),
+            dtype="datetime64[D]",
+        )
+        symbols = [f"S{i:02d}" for i in range(50)]
+        for i, symbol in enumerate(symbols):
+            closes = 100.0 + np.arange(len(days)) * 0.01 * (i + 1)
+            market_data_service.price_cache.put(
+                symbol, (i + 1, PriceIndex.from_sorted(days, closes))
+            )
+        transactions = [tx(0, start, TransactionType.DEPOSIT, "10000000")]
+        for k in range(2000):
+            d = start + timedelta(days=k * 365 * 10 // 2000)
+            symbol = symbols[k % 50]
+            transactions.append(
+                tx(k + 1, d, TransactionType.BUY, "100", symbol, "1", "100")
+            )
+
+        replay = replay_account(db_session, transactions, end, WEEKDAYS)
+
+        assert len(replay.timestamps) == np.busday_count(start, end + timedelta(1))
+        assert replay.invest[-1] == 200000.0
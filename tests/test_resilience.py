@@ -0,0 +1,141 @@
+"""
+Unit tests for the provider resilience layer.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services import resilience
+from services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderPolicy,
+    SingleFlight,
+    resilient_call,
+)
+
+
+@pytest.fixture
+def fast_policy():
+    policy = ProviderPolicy(
+        timeout=0.2,
+        retries=1,
+        backoff_base=0,
+        backoff_max=0,
+        failure_threshold=2,
+        reset_after=60,
+    )
+    resilience.reset_breakers()
+    with patch.dict(resilience.PROVIDER_POLICIES, {"test": policy}):
+        yield policy
+    resilience.reset_breakers()
+
+
+class TestResilientCall:
+    """Test timeouts, retries and the circuit breaker around provider calls."""
+
+    def test_retries_then_succeeds(self, fast_policy):
+        """Test that one transient failure is retried."""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("reset")
+            return "ok"
+
+        assert resilient_call("test", "k", flaky) == "ok"
+        assert len(calls) == 2
+
+    def test_timeout_raises(self, fast_policy):
+        """Test that a hung call gives up after the policy timeout."""
+        fast_policy.retries = 0
+        with pytest.raises(TimeoutError):
+            resilient_call("test", "k", lambda: time.sleep(1))
+
+    def test_circuit_opens_and_fails_fast(self, fast_policy):
+        """Test that an open circuit rejects calls without calling out."""
+        calls = []
+
+        def down():
+            calls.append(1)
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            resilient_call("test", "k", down)
+        assert resilience.provider_status()["test"]["state"] == "open"
+        with pytest.raises(CircuitOpenError):
+            resilient_call("test", "k", down)
+        assert len(calls) == 2
+
+    def test_data_errors_do_not_trip_the_circuit(self, fast_policy):
+        """Test that a dead symbol is neither retried nor counted as an outage."""
+        calls = []
+
+        def no_data():
+            calls.append(1)
+            raise ValueError("symbol not found")
+
+        for _ in range(fast_policy.failure_threshold + 1):
+            with pytest.raises(ValueError):
+                resilient_call("test", "dead", no_data)
+        assert len(calls) == fast_policy.failure_threshold + 1
+        assert resilience.provider_status()["test"]["state"] == "closed"
+        assert resilient_call("test", "alive", lambda: "ok") == "ok"
+
+
+class TestCircuitBreaker:
+    """Test the half-open trial after the reset period."""
+
+    def test_half_open_trial_closes_on_success(self):
+        """Test that one trial is let through and success closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_after=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_released_trial_lets_another_through(self):
+        """Test that a trial ending in a data error does not wedge the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_after=0)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.allow()
+
+
+class TestSingleFlight:
+    """Test that concurrent identical fetches are coalesced."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that waiters get the leader's result without calling again."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return 42
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait(2)
+        for t in threads[1:]:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join(2)
+        assert results == [42] * 4
+        assert len(calls) == 1
@@ -0,0 +1,162 @@
+"""
+Unit tests for the background price sync scheduler.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models.account import (
+    Account,
+    AccountCategory,
+    AccountCurrencyType,
+    AccountType,
+    BankName,
+    Owner,
+)
+from models.synclog import SyncLog
+from models.transactions import Transaction, TransactionType
+from services import (
+    instrument_registry,
+    market_data_service,
+    negative_cache,
+    sync_scheduler,
+)
+from services.market_data_provider import MarketDataProvider, set_provider
+from services.sync_scheduler import (
+    SyncScheduler,
+    held_symbols,
+    last_sync_due,
+    next_sync_due,
+    run_sync,
+)
+
+
+class StubProvider(MarketDataProvider):
+    name = "stub"
+
+    def __init__(self):
+        self.calls = []
+
+    def history(self, symbol, start, end):
+        self.calls.append((symbol, start, end))
+        index = pd.bdate_range(start, end)
+        return pd.DataFrame({"Close": [10.0] * len(index)}, index=index)
+
+
+@pytest.fixture(autouse=True)
+def reset_state(monkeypatch):
+    monkeypatch.setattr(market_data_service, "load_symbol_closes", lambda s: None)
+
+    def reset():
+        market_data_service.price_cache.invalidate()
+        market_data_service.last_synced.clear()
+        market_data_service.scheduled_symbols.clear()
+        negative_cache._misses.clear()
+        negative_cache._loaded = False
+        instrument_registry._instruments = {}
+        instrument_registry._loaded = False
+
+    reset()
+    yield
+    reset()
+
+
+@pytest.fixture
+def provider():
+    stub = StubProvider()
+    set_provider(stub)
+    yield stub
+    set_provider(None)
+
+
+@pytest.fixture
+def holdings(db_session):
+    account = Account(
+        owner=Owner.HUN,
+        bank_name=BankName.CHARLES_SCHWAB,
+        account_name="brokerage",
+        account_currency_type=AccountCurrencyType.USD,
+        account_type=AccountType.STOCK,
+        account_category=AccountCategory.PERSONAL,
+    )
+    db_session.add(account)
+    db_session.flush()
+    start = datetime.today().date() - timedelta(days=30)
+    for symbol, quantity, tx_type in [
+        ("VOO", 2, TransactionType.BUY),
+        ("SCHD", 5, TransactionType.BUY),
+        ("SCHD", 5, TransactionType.SELL),
+    ]:
+        db_session.add(
+            Transaction(
+                account_id=account.id,
+                date=start,
+                type=tx_type,
+                symbol=symbol,
+                amount=quantity * 10,
+                price=10,
+                quantity=quantity,
+            )
+        )
+    db_session.commit()
+    return db_session
+
+
+class TestSchedule:
+    """Test the per-exchange after-close sync slots."""
+
+    def test_slots_skip_holidays(self):
+        """Test that July 4th has no NYSE slot and KRX runs at 16:30 KST."""
+        # 2024-07-05 (금) 18:00 ET
+        now = datetime(2024, 7, 5, 22, 0)
+        assert last_sync_due("NYSE", now) == datetime(2024, 7, 5, 21, 0)
+        # 2024-07-04 10:00 ET: 직전 슬롯은 7/3, 다음 슬롯은 7/5
+        now = datetime(2024, 7, 4, 14, 0)
+        assert last_sync_due("NYSE", now) == datetime(2024, 7, 3, 21, 0)
+        assert next_sync_due("NYSE", now) == datetime(2024, 7, 5, 21, 0)
+        assert next_sync_due("KRX", datetime(2024, 7, 5, 0, 0)) == datetime(
+            2024, 7, 5, 7, 30
+        )
+
+
+class TestRunSync:
+    """Test sync runs, their log rows and the request path afterwards."""
+
+    def test_held_symbols_skip_closed_positions(self, holdings):
+        """Test that only positions with a quantity left are synced."""
+        assert list(held_symbols(holdings)) == ["VOO"]
+
+    def test_run_logs_and_warms_request_path(self, holdings, provider):
+        """Test that a run is logged and requests then stay local."""
+        factory = sessionmaker(bind=holdings.bind)
+        log_id = run_sync("NYSE", factory)
+
+        log = holdings.get(SyncLog, log_id)
+        assert (log.status, log.symbols_total, log.symbols_failed) == (
+            "success",
+            1,
+            0,
+        )
+        assert log.duration_seconds is not None
+        assert "VOO" in market_data_service.scheduled_symbols
+
+        calls = len(provider.calls)
+        today = datetime.today().date()
+        market_data_service.price_lookup(holdings, "VOO", today - timedelta(days=90))
+        assert market_data_service.get_current_symbol_price("VOO", holdings) == 10.0
+        assert len(provider.calls) == calls
+
+    def test_runs_never_overlap(self, holdings, provider):
+        """Test that a run requested during another one is skipped."""
+        with sync_scheduler._run_lock:
+            assert run_sync("NYSE", sessionmaker(bind=holdings.bind)) is None
+        assert holdings.query(SyncLog).count() == 0
+
+    def test_due_exchanges_run_once(self, holdings, provider):
+        """Test that a slot that already has a run is not run again."""
+        scheduler = SyncScheduler(sessionmaker(bind=holdings.bind))
+        assert scheduler.run_due() == ["KRX", "NYSE"]
+        assert scheduler.run_due() == []
@@ -0,0 +1,131 @@
+"""
+Unit tests for the offline KRX/NYSE trading calendars.
+"""
+
+from datetime import date, datetime
+
+from models.account import AccountCountry
+from services import instrument_registry, market_data_service
+from services.instrument_registry import Instrument
+from services.trading_calendar import (
+    CALENDAR_YEARS,
+    KRX,
+    KRX_LISTED_FROM,
+    KRX_LISTED_THROUGH,
+    NYSE,
+    TradingCalendar,
+    calendar_for_country,
+    calendar_for_symbol,
+)
+
+
+class TestNyse:
+    """Test rule-based NYSE holidays."""
+
+    def test_rule_based_holidays(self):
+        """Test Good Friday, Juneteenth, Thanksgiving and observed Christmas."""
+        for day in [
+            date(2024, 3, 29),
+            date(2024, 6, 19),
+            date(2024, 11, 28),
+            date(2022, 12, 26),
+        ]:
+            assert not NYSE.is_session(day)
+
+    def test_special_closures_before_2015(self):
+        """Test the 9/11 closure and the Reagan and Ford days of mourning."""
+        sessions = NYSE.sessions(date(2001, 9, 10), date(2001, 9, 17))
+        assert [d.astype(object) for d in sessions] == [
+            date(2001, 9, 10),
+            date(2001, 9, 17),
+        ]
+        assert not NYSE.is_session(date(2004, 6, 11))
+        assert not NYSE.is_session(date(2007, 1, 2))
+
+    def test_saturday_new_year_is_not_moved_back(self):
+        """Test that Dec 31 trades when Jan 1 falls on a Saturday."""
+        assert NYSE.is_session(date(2021, 12, 31))
+
+
+class TestKrx:
+    """Test the KRX table of lunar, substitute and year-end closures."""
+
+    def test_chuseok_and_hangul_day(self):
+        """Test that only the sessions around Chuseok 2025 remain."""
+        sessions = KRX.sessions(date(2025, 10, 1), date(2025, 10, 12))
+        assert [d.astype(object) for d in sessions] == [
+            date(2025, 10, 1),
+            date(2025, 10, 2),
+            date(2025, 10, 10),
+        ]
+
+    def test_year_end_closure_is_last_weekday(self):
+        """Test that the year-end closure moves to Friday before a weekend."""
+        assert not KRX.is_session(date(2023, 12, 29))
+        assert KRX.previous_session(date(2024, 1, 1)) == date(2023, 12, 28)
+
+    def test_lunar_table_covers_calendar_years(self):
+        """Test that Seollal and Chuseok are closed through the last year."""
+        assert KRX_LISTED_THROUGH >= CALENDAR_YEARS[-1]
+        for day in [
+            date(2027, 2, 8),
+            date(2027, 9, 15),
+            date(2028, 1, 27),
+            date(2029, 9, 21),
+            date(2030, 2, 5),
+            date(2030, 9, 12),
+        ]:
+            assert not KRX.is_session(day)
+
+    def test_days_before_the_table_warn(self, capsys):
+        """Test that KRX does not claim holiday data before its table starts."""
+        assert KRX.listed_from == KRX_LISTED_FROM
+        calendar = TradingCalendar("TEST", [], listed_from=2015)
+        calendar.sessions(date(2015, 1, 1), date(2015, 1, 31))
+        assert capsys.readouterr().out == ""
+        calendar.has_session(date(2014, 12, 1), date(2015, 1, 31))
+        assert capsys.readouterr().out.count("no holiday data before 2015") == 1
+
+    def test_days_past_the_table_warn_once(self, capsys):
+        """Test that a query beyond the holiday data is logged, not silent."""
+        calendar = TradingCalendar("TEST", [], listed_through=2030)
+        calendar.sessions(date(2030, 12, 1), date(2030, 12, 31))
+        assert capsys.readouterr().out == ""
+        calendar.sessions(date(2031, 1, 1), date(2031, 1, 31))
+        calendar.is_session(date(2031, 2, 1))
+        assert capsys.readouterr().out.count("no holiday data after 2030") == 1
+
+
+class TestSessionClose:
+    """Test the UTC close time of a session."""
+
+    def test_close_follows_local_daylight_saving(self):
+        """Test that NYSE closes at 21:00 UTC in winter and 20:00 UTC in summer."""
+        assert NYSE.session_close(date(2024, 1, 31)) == datetime(2024, 1, 31, 21)
+        assert NYSE.session_close(date(2024, 7, 1)) == datetime(2024, 7, 1, 20)
+        assert KRX.session_close(date(2024, 7, 1)) == datetime(2024, 7, 1, 6, 30)
+
+
+class TestCalendarChoice:
+    """Test picking the calendar from exchange, code or account country."""
+
+    def test_symbol_and_exchange(self):
+        """Test that KRX codes and KRX exchanges map to KRX."""
+        assert calendar_for_symbol("069500") is KRX
+        assert calendar_for_symbol("VOO") is NYSE
+        assert calendar_for_symbol("XYZ", exchange="KOSDAQ") is KRX
+
+    def test_market_data_uses_ticker_exchange(self, monkeypatch):
+        """Test that price lookups pick the calendar from the registered exchange."""
+        monkeypatch.setattr(
+            instrument_registry,
+            "_instruments",
+            {"XYZ": Instrument(symbol="XYZ", exchange="KOSPI")},
+        )
+        assert market_data_service.symbol_calendar("XYZ") is KRX
+        assert market_data_service.symbol_calendar("VOO") is NYSE
+
+    def test_account_country(self):
+        """Test that Korean accounts replay on KRX sessions."""
+        assert calendar_for_country(AccountCountry.KOR) is KRX
+        assert calendar_for_country(AccountCountry.US) is NYSE